@@ -0,0 +1,90 @@
+"""
+Throughput of partitioned hub runs by worker count.
+
+Runs the same basket of instruments with 1, 2, 4, ... worker processes and
+reports submissions per second and the speed-up over a single worker. Every
+instrument has a market maker quoting both sides and takers hitting it.
+
+    python performance/parallel_scaling.py --instruments 256 --ticks 500
+"""
+
+import argparse
+import os
+import time
+from pymicrostructure.markets.hub import MarketHub
+from pymicrostructure.orders.limit import LimitOrder
+from pymicrostructure.orders.market import MarketOrder
+from pymicrostructure.simulation.parallel import PartitionedHub
+from pymicrostructure.traders.base import Trader
+
+
+class Quoter(Trader):
+    """Quotes one lot either side of 100 in every instrument, every tick."""
+
+    def update(self):
+        self.cancel_all_orders()
+        for instrument in self.market.instruments:
+            self.market.submit_order(
+                instrument,
+                [
+                    LimitOrder(self.trader_id, 5, 99),
+                    LimitOrder(self.trader_id, -5, 101),
+                ],
+            )
+
+
+class Taker(Trader):
+    """Sends a market order for one lot to a random instrument, every tick."""
+
+    def update(self):
+        instruments = self.market.instruments
+        instrument = instruments[self.rng.integers(len(instruments))]
+        side = 1 if self.rng.random() < 0.5 else -1
+        self.market.submit_order(instrument, MarketOrder(self.trader_id, side))
+
+
+def build_hub(instruments, seed, takers_per_instrument=2):
+    hub = MarketHub(instruments, seed=seed, recording="none")
+    Quoter(hub)
+    for _ in range(takers_per_instrument * len(instruments)):
+        Taker(hub)
+    return hub
+
+
+def submissions(hub):
+    return hub.last_submission_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--instruments", type=int, default=128)
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--sync-every", type=int, default=1)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    instruments = [f"I{i:04d}" for i in range(args.instruments)]
+    workers = [1]
+    while workers[-1] * 2 <= min(args.max_workers, args.instruments):
+        workers.append(workers[-1] * 2)
+
+    print(f"{'workers':>8} {'seconds':>9} {'subs/s':>12} {'speed-up':>9}")
+    baseline = None
+    for n in workers:
+        runner = PartitionedHub(
+            build_hub,
+            instruments,
+            {"submissions": submissions},
+            workers=n,
+            sync_every=args.sync_every,
+        )
+        start = time.perf_counter()
+        results = runner.run(args.ticks, seed=0, progress=False)
+        elapsed = time.perf_counter() - start
+        rate = sum(result["submissions"] for result in results) / elapsed
+        baseline = baseline or rate
+        print(f"{n:>8} {elapsed:>9.2f} {rate:>12,.0f} {rate / baseline:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
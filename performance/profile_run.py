@@ -0,0 +1,63 @@
+"""
+Phase timings and a flamegraph profile of a market run.
+
+Runs the same seeded market three times: plain, with a PhaseTimer attached,
+and under a StackSampler. Prints the time of each run and the phase report,
+and writes the sampled stacks in collapsed format for flamegraph tools.
+
+    python performance/profile_run.py --ticks 2000 --collapsed run.collapsed
+    flamegraph.pl run.collapsed > run.svg
+"""
+
+import argparse
+import time
+from pymicrostructure.markets.continuous import ContinuousDoubleAuction
+from pymicrostructure.markets.profiling import PhaseTimer, StackSampler
+from pymicrostructure.traders.market_maker import DummyMarketMaker
+from pymicrostructure.traders.noise import NoiseTrader
+
+
+def build_market(traders, recording):
+    market = ContinuousDoubleAuction(seed=0, recording=recording)
+    DummyMarketMaker(market)
+    for _ in range(traders):
+        NoiseTrader(market)
+    return market
+
+
+def timed_run(market, ticks):
+    start = time.perf_counter()
+    market.run(ticks, progress=False)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--traders", type=int, default=20)
+    parser.add_argument("--recording", default="full")
+    parser.add_argument("--interval", type=float, default=0.005)
+    parser.add_argument("--collapsed", default="run.collapsed")
+    args = parser.parse_args()
+
+    plain = timed_run(build_market(args.traders, args.recording), args.ticks)
+    print(f"plain run:      {plain:8.3f} s")
+
+    market = build_market(args.traders, args.recording)
+    timer = PhaseTimer().attach(market)
+    timed = timed_run(market, args.ticks)
+    print(f"phase timers:   {timed:8.3f} s")
+
+    market = build_market(args.traders, args.recording)
+    with StackSampler(args.interval) as sampler:
+        sampled = timed_run(market, args.ticks)
+    sampler.write(args.collapsed)
+    print(f"stack sampling: {sampled:8.3f} s ({sampler.samples} samples)")
+
+    print()
+    print(timer.report().to_string(float_format=lambda x: f"{x:,.2f}"))
+    print(f"\nCollapsed stacks written to {args.collapsed}")
+
+
+if __name__ == "__main__":
+    main()
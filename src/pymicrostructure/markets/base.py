@@ -1,8 +1,11 @@
 """Base module for financial markets."""
 
+from pymicrostructure.markets.tape import TradeRecords, TradeTape
 from pymicrostructure.orders.market import MarketOrder
-from typing import List, Any
-import random
+from pymicrostructure.utils.buffers import History, RecordBuffer
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
 
 
 class Market:
@@ -18,8 +21,25 @@ class Market:
         A list to store all orders submitted to the market.
     participants : list
         A list of all participants in the market.
-    trade_history : list
-        A chronological list of all trades executed in the market.
+    participants_by_id : dict
+        The participant registry, mapping stable trader IDs to traders.
+    deferred_participants : list or None
+        Traders created inside ``deferred_registration()``, waiting to be
+        registered together; None outside such a block.
+    trades : TradeTape
+        The columnar tape of all trades executed in the market.
+    trade_history : TradeRecords
+        A chronological list of all trades as dictionaries, generated from
+        ``trades`` on access.
+    history_window : int or None
+        The number of recent entries each history keeps in memory before older
+        entries are spilled to disk, or None to keep everything in memory.
+    spill_dir : str or None
+        The directory spilled history chunks are written under.
+    seed_sequence : numpy.random.SeedSequence
+        The root of all random streams in the market.
+    rng : numpy.random.Generator
+        The market's own random generator.
     last_submission_time : int or float
         The timestamp of the last order submission.
     completed : bool
@@ -27,24 +47,270 @@ class Market:
 
     Methods:
     --------
+    register_participant(trader)
+        Add a trader to the market and assign it a trader ID.
+    register_participants(traders)
+        Add several traders to the market at once.
+    deferred_registration()
+        Register the traders created inside a block with one bulk call.
+    get_participant(trader_id)
+        Retrieve a market participant by their trader ID.
+    spawn_rng()
+        Create a generator on a new independent stream of the market's seed.
+    create_history(name)
+        Create an empty history that follows the market's memory settings.
+    create_records(dtype, name)
+        Create an empty record buffer that follows the market's memory settings.
+    order_flow(window)
+        Return the signed and total volume of the most recent trades.
     submit_order(order)
         A method to be implemented by subclasses for submitting orders to the market.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        history_window: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+        seed: Optional[int] = None,
+    ):
         """
         Initialize a new Market.
 
         Cretes instance with empty lists for orders, participants,
         and trade history, and set initial values for last submission time and completion
         status.
+
+        Parameters:
+        -----------
+        history_window : int, optional
+            The number of recent entries each history keeps in memory; older
+            entries are spilled to disk in chunks (default is no limit).
+        spill_dir : str, optional
+            The directory spilled chunks are written under (default is the system
+            temporary directory).
+        seed : int, optional
+            The seed of the market's random streams (default is fresh OS
+            entropy).
         """
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.rng: np.random.Generator = np.random.default_rng(self.seed_sequence)
+        self.history_window: Optional[int] = history_window
+        self.spill_dir: Optional[str] = spill_dir
         self.orders: List[Any] = []
         self.participants: List[Any] = []
-        self.trade_history: List[dict] = []
+        self.participants_by_id: Dict[int, Any] = {}
+        self.deferred_participants: Optional[List[Any]] = None
+        self.trades: TradeTape = TradeTape(
+            memory_rows=history_window, spill_dir=spill_dir
+        )
         self.last_submission_time: float = 0
         self.completed: bool = False
 
+    @property
+    def trade_history(self) -> TradeRecords:
+        """The executed trades as a list of dictionaries."""
+        return TradeRecords(self.trades)
+
+    def register_participant(self, trader) -> int:
+        """
+        Add a trader to the market and assign it a trader ID.
+
+        Trader IDs are allocated sequentially and never reused, so they stay valid
+        when the ``participants`` list is reordered.
+
+        Parameters:
+        -----------
+        trader : Trader
+            The trader to register.
+
+        Returns:
+        --------
+        int
+            The trader ID assigned to the trader.
+        """
+        trader_id = len(self.participants_by_id)
+        self.participants_by_id[trader_id] = trader
+        self.participants.append(trader)
+        return trader_id
+
+    def register_participants(self, traders: Iterable[Any]) -> List[int]:
+        """
+        Add several traders to the market at once.
+
+        Each trader's ``trader_id`` attribute is set to its newly assigned ID.
+
+        Parameters:
+        -----------
+        traders : iterable of Trader
+            The traders to register. They must have been created on this market.
+
+        Returns:
+        --------
+        list of int
+            The trader IDs assigned to the traders, in order.
+
+        Raises:
+        -------
+        ValueError
+            If a trader belongs to another market.
+        """
+        traders = list(traders)
+        for trader in traders:
+            if not self._is_own(trader):
+                raise ValueError(
+                    "Cannot register a trader created on another market; its "
+                    "orders, fills and random stream belong to that market."
+                )
+        start = len(self.participants_by_id)
+        trader_ids = list(range(start, start + len(traders)))
+        self.participants_by_id.update(zip(trader_ids, traders))
+        self.participants.extend(traders)
+        for trader, trader_id in zip(traders, trader_ids):
+            trader.trader_id = trader_id
+        return trader_ids
+
+    def _is_own(self, trader) -> bool:
+        """Whether ``trader`` was created on this market."""
+        return trader.market is self
+
+    @contextmanager
+    def deferred_registration(self) -> Iterator[List[Any]]:
+        """
+        Register the traders created inside the block with one bulk call.
+
+        Traders created on the market inside the block are collected instead of
+        being registered one at a time, and are passed to
+        ``register_participants`` in creation order when the block exits. Their
+        ``trader_id`` is None until then. If the block raises, none of them
+        are registered.
+
+        Yields:
+        -------
+        list of Trader
+            The traders collected so far.
+        """
+        if self.deferred_participants is not None:
+            # Nested blocks register with the outermost one.
+            yield self.deferred_participants
+            return
+        self.deferred_participants = deferred = []
+        try:
+            yield deferred
+        finally:
+            self.deferred_participants = None
+        self.register_participants(deferred)
+
+    def get_participant(self, trader_id: int):
+        """
+        Retrieve a market participant by their trader ID.
+
+        Parameters:
+        -----------
+        trader_id : int
+            The unique identifier of the trader.
+
+        Returns:
+        --------
+        Trader
+            The participant object with the matching trader ID.
+
+        Raises:
+        -------
+        ValueError
+            If no participant is registered under ``trader_id``.
+        """
+        try:
+            return self.participants_by_id[trader_id]
+        except KeyError:
+            raise ValueError(f"No trader found with ID {trader_id}")
+
+    def spawn_rng(self) -> np.random.Generator:
+        """
+        Create a generator on a new independent stream of the market's seed.
+
+        Each call spawns the next child of ``seed_sequence``, so participants
+        registered in the same order get the same streams for the same seed.
+
+        Returns:
+        --------
+        numpy.random.Generator
+            A generator independent of the market's and every other child's.
+        """
+        return np.random.default_rng(self.seed_sequence.spawn(1)[0])
+
+    def create_history(self, name: str, items: Optional[List[Any]] = None) -> History:
+        """
+        Create a history that follows the market's memory settings.
+
+        Parameters:
+        -----------
+        name : str
+            A name used as the prefix of the history's spill directory.
+        items : list, optional
+            Initial items.
+
+        Returns:
+        --------
+        History
+            A list-like history bounded by ``history_window`` entries in memory.
+        """
+        return History(
+            items,
+            memory_items=self.history_window,
+            spill_dir=self.spill_dir,
+            name=name,
+        )
+
+    def create_records(
+        self, dtype: Any, name: str, chunk_size: int = 4096
+    ) -> RecordBuffer:
+        """
+        Create a record buffer that follows the market's memory settings.
+
+        Parameters:
+        -----------
+        dtype : numpy dtype-like
+            The structured dtype of a row.
+        name : str
+            A name used as the prefix of the buffer's spill directory.
+        chunk_size : int, optional
+            The initial capacity and growth step of the buffer in rows (default
+            is 4096). Use a small value for buffers that are created in large
+            numbers and usually stay short.
+
+        Returns:
+        --------
+        RecordBuffer
+            A growable record array bounded by ``history_window`` rows in memory.
+        """
+        return RecordBuffer(
+            dtype,
+            chunk_size,
+            memory_rows=self.history_window,
+            spill_dir=self.spill_dir,
+            name=name,
+        )
+
+    def order_flow(self, window: int) -> Tuple[float, float]:
+        """
+        Return the signed and total volume of the most recent trades.
+
+        The aggregates are maintained incrementally as trades execute, so the
+        query takes constant time for any window.
+
+        Parameters:
+        -----------
+        window : int
+            The number of most recent trades to aggregate.
+
+        Returns:
+        --------
+        tuple of float
+            The order flow (sum of ``volume * aggressor_side``) and the total
+            traded volume over the window.
+        """
+        return self.trades.order_flow(window)
+
     def submit_order(self, order):
         """
         Submit an order to the market.
@@ -0,0 +1,448 @@
+"""Frequent batch auction markets with uniform-price clearing."""
+
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from pymicrostructure.markets.continuous import ContinuousDoubleAuction
+from pymicrostructure.markets.events import EventType
+from pymicrostructure.markets.news import NewsProcess
+from pymicrostructure.orders.base import Order, OrderStatus
+from pymicrostructure.orders.market import MarketOrder
+
+ALLOCATIONS = ("pro_rata", "time")
+
+
+def clearing_price(
+    bid_prices: np.ndarray,
+    bid_volumes: np.ndarray,
+    ask_prices: np.ndarray,
+    ask_volumes: np.ndarray,
+    reference: Optional[float] = None,
+) -> Tuple[float, Union[int, float]]:
+    """
+    Find the uniform price that maximizes the executed volume of a batch.
+
+    Demand and supply are evaluated at every limit price of the batch with one
+    sort, one cumulative sum and one binary search per side. Among the prices
+    that execute the most volume, the one with the smallest imbalance between
+    demand and supply wins, then the one closest to ``reference``.
+
+    Parameters:
+    -----------
+    bid_prices : numpy.ndarray
+        The limit price of each buy order, ``inf`` for market orders.
+    bid_volumes : numpy.ndarray
+        The unsigned volume of each buy order.
+    ask_prices : numpy.ndarray
+        The limit price of each sell order, ``-inf`` for market orders.
+    ask_volumes : numpy.ndarray
+        The unsigned volume of each sell order.
+    reference : float, optional
+        The price ties are broken towards, and the price market orders trade
+        at when the batch has no limit prices (default is none; ties then go
+        to the middle candidate).
+
+    Returns:
+    --------
+    tuple
+        The clearing price and the executed volume, or ``(nan, 0)`` if
+        nothing crosses.
+    """
+    bid_prices = np.asarray(bid_prices, dtype=float)
+    ask_prices = np.asarray(ask_prices, dtype=float)
+    bid_volumes = np.asarray(bid_volumes)
+    ask_volumes = np.asarray(ask_volumes)
+    if not len(bid_prices) or not len(ask_prices):
+        return np.nan, 0
+
+    prices = np.concatenate([bid_prices, ask_prices])
+    candidates = np.unique(prices[np.isfinite(prices)])
+    if not len(candidates):
+        if reference is None:
+            return np.nan, 0
+        candidates = np.array([reference], dtype=float)
+
+    bid_order = np.argsort(bid_prices, kind="stable")
+    ask_order = np.argsort(ask_prices, kind="stable")
+    bid_cumulative = np.concatenate([[0], np.cumsum(bid_volumes[bid_order])])
+    ask_cumulative = np.concatenate([[0], np.cumsum(ask_volumes[ask_order])])
+    # Buyers trade at or below their limit, sellers at or above theirs.
+    demand = (
+        bid_cumulative[-1]
+        - bid_cumulative[np.searchsorted(bid_prices[bid_order], candidates, "left")]
+    )
+    supply = ask_cumulative[np.searchsorted(ask_prices[ask_order], candidates, "right")]
+    executed = np.minimum(demand, supply)
+    volume = executed.max()
+    if volume <= 0:
+        return np.nan, 0
+
+    best = executed == volume
+    imbalance = np.abs(demand - supply)
+    best &= imbalance == imbalance[best].min()
+    choices = candidates[best]
+    if reference is None:
+        price = choices[(len(choices) - 1) // 2]
+    else:
+        price = choices[np.argmin(np.abs(choices - reference))]
+    return price.item(), volume.item()
+
+
+def allocate(
+    prices: np.ndarray,
+    volumes: np.ndarray,
+    quantity: Union[int, float],
+    pro_rata: bool = True,
+) -> np.ndarray:
+    """
+    Allocate an executed quantity among the orders of one side.
+
+    Orders at prices better than the marginal (worst executed) price are
+    filled in full. At the marginal price the remainder is shared by time
+    priority, or pro rata to volume. With integer volumes, pro-rata shares are
+    rounded down and the leftover units go one each to the earliest orders
+    that are not yet filled.
+
+    Parameters:
+    -----------
+    prices : numpy.ndarray
+        The order prices, in priority order (best price first, then earliest).
+    volumes : numpy.ndarray
+        The unsigned order volumes, in the same order.
+    quantity : int or float
+        The quantity to allocate, at most ``volumes.sum()``.
+    pro_rata : bool, optional
+        Whether to share the marginal price pro rata (default is True) or by
+        time priority.
+
+    Returns:
+    --------
+    numpy.ndarray
+        The allocated volume of each order.
+    """
+    volumes = np.asarray(volumes)
+    cumulative = np.cumsum(volumes)
+    # Time priority is a running cap on the cumulative volume.
+    allocation = np.clip(quantity - (cumulative - volumes), 0, volumes)
+    if not pro_rata or quantity <= 0:
+        return allocation
+
+    prices = np.asarray(prices)
+    marginal = min(int(np.searchsorted(cumulative, quantity, "left")), len(prices) - 1)
+    at_marginal = prices == prices[marginal]
+    lo = int(np.argmax(at_marginal))
+    hi = lo + int(at_marginal[lo:].sum())
+    remainder = quantity - (cumulative[lo - 1] if lo else 0)
+    level = volumes[lo:hi]
+    shares = remainder * level / level.sum()
+    integral = np.issubdtype(volumes.dtype, np.integer) and float(quantity).is_integer()
+    if integral:
+        shares = np.floor(shares).astype(volumes.dtype)
+        leftover = remainder - shares.sum()
+        open_orders = shares < level
+        shares += open_orders & (np.cumsum(open_orders) <= leftover)
+    allocation = allocation.astype(shares.dtype)
+    allocation[lo:hi] = shares
+    allocation[hi:] = 0
+    return allocation
+
+
+def pair_fills(
+    buy_fills: np.ndarray, sell_fills: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Match the allocated fills of both sides into trades.
+
+    Both sides' cumulative fills are merged, and every segment between
+    consecutive breakpoints becomes one trade between the buy and the sell
+    order whose fills cover it.
+
+    Parameters:
+    -----------
+    buy_fills : numpy.ndarray
+        The allocated volume of each buy order, in priority order.
+    sell_fills : numpy.ndarray
+        The allocated volume of each sell order, in priority order.
+
+    Returns:
+    --------
+    tuple of numpy.ndarray
+        The buy order index, the sell order index and the volume of each trade.
+    """
+    buy_cumulative = np.cumsum(buy_fills)
+    sell_cumulative = np.cumsum(sell_fills)
+    breaks = np.union1d(buy_cumulative, sell_cumulative)
+    breaks = breaks[breaks > 0]
+    volumes = np.diff(breaks, prepend=0)
+    buyers = np.searchsorted(buy_cumulative, breaks, "left")
+    sellers = np.searchsorted(sell_cumulative, breaks, "left")
+    keep = (volumes > 0) & (buyers < len(buy_fills)) & (sellers < len(sell_fills))
+    return buyers[keep], sellers[keep], volumes[keep]
+
+
+class BatchAuction(ContinuousDoubleAuction):
+    """
+    A frequent batch auction market, extending ContinuousDoubleAuction.
+
+    Orders are collected for ``interval`` ticks and cleared together at a
+    single uniform price that maximizes the executed volume (see
+    ``clearing_price``). Resting limit orders that could cross the batch take
+    part in the auction and keep their priority; limit orders of the batch that
+    are not filled rest in the book for the next auction, and unfilled market
+    orders are cancelled. At the marginal price, volume is allocated pro rata
+    or by time priority.
+
+    Traders, orders, histories and metrics work as in a continuous market:
+    order IDs are assigned on submission, the book only changes at clearing
+    times, and every trade of an auction is recorded at the auction's event
+    time and the clearing price. The order submitted later is reported as the
+    aggressor of each trade.
+
+    Attributes:
+    -----------
+    interval : int
+        The number of ticks between auctions.
+    allocation : str
+        How the marginal price is shared, one of ``ALLOCATIONS``.
+    clearing_prices : list
+        The ``(time, price, volume)`` of every auction that traded.
+
+    Methods:
+    --------
+    submit_orders(orders)
+        Queue a batch of orders for the next auction.
+    cancel_order(order)
+        Cancel a queued or resting order.
+    clear()
+        Run the auction for the queued orders now.
+    """
+
+    def __init__(
+        self,
+        initial_fair_price: int = 100,
+        keyframe_interval: int = 100,
+        depth_levels: int = 5,
+        recording: str = "full",
+        record_every: int = 1,
+        history_window: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+        seed: Optional[int] = None,
+        news_process: Optional[NewsProcess] = None,
+        interval: int = 1,
+        allocation: str = "pro_rata",
+    ):
+        """
+        Initialize a new BatchAuction instance.
+
+        Parameters:
+        -----------
+        initial_fair_price, keyframe_interval, depth_levels, recording,
+        record_every, history_window, spill_dir, seed, news_process
+            As for ``ContinuousDoubleAuction``.
+        interval : int, optional
+            The number of ticks between auctions (default is 1).
+        allocation : str, optional
+            How the marginal price is shared, "pro_rata" (default) or "time".
+        """
+        if interval < 1:
+            raise ValueError("interval must be at least 1.")
+        if allocation not in ALLOCATIONS:
+            raise ValueError(
+                f"Unknown allocation {allocation!r}, expected one of {ALLOCATIONS}."
+            )
+        super().__init__(
+            initial_fair_price,
+            keyframe_interval,
+            depth_levels,
+            recording,
+            record_every,
+            history_window,
+            spill_dir,
+            seed,
+            news_process,
+        )
+        self.interval: int = interval
+        self.allocation: str = allocation
+        self.clearing_prices: List[Tuple[int, float, Union[int, float]]] = []
+        self._pending: Dict[int, Order] = {}
+
+    def submit_orders(self, orders: Sequence[Order]) -> None:
+        """
+        Queue a batch of orders for the next auction.
+
+        The orders get their IDs and event time now and are logged as added,
+        but they only reach the book when the auction clears.
+
+        Parameters:
+        -----------
+        orders : sequence of Order
+            The orders to queue, in priority order.
+        """
+        self.last_submission_time += 1
+        time = self.last_submission_time
+        for order in orders:
+            submitting_trader = self.get_participant(order.trader_id)
+            order.id = self._next_order_id
+            self._next_order_id += 1
+            order.time = time
+            if self._record_events:
+                self._log_order(EventType.ADD, order, order.volume)
+            order.status = OrderStatus.ACTIVE
+            self._pending[order.id] = order
+            if not isinstance(order, MarketOrder):
+                submitting_trader.active_orders[order.id] = order
+
+    def cancel_order(self, order: Order) -> None:
+        """
+        Cancel an order, whether it is queued for the auction or resting.
+
+        Parameters:
+        -----------
+        order : Order
+            The order to cancel.
+        """
+        if self._pending.pop(order.id, None) is None:
+            super().cancel_order(order)
+            return
+        order.status = OrderStatus.CANCELED
+        if self._record_events:
+            self._log_order(EventType.CANCEL, order, order.active_volume)
+            self.cancellations.append(order)
+        self._deactivate_order(self.get_participant(order.trader_id), order)
+
+    def clear(self) -> None:
+        """
+        Run the auction for the queued orders now.
+
+        The queued orders and the resting orders that could cross them are
+        cleared at one price, the fills are executed as trades, and the book
+        is recorded once as after a submission.
+        """
+        if not self._pending:
+            return
+        self.last_submission_time += 1
+        pending = list(self._pending.values())
+        self._pending = {}
+
+        bids = [order for order in pending if order.volume > 0]
+        asks = [order for order in pending if order.volume < 0]
+        ask_floor = min((self._limit(order, -1) for order in asks), default=np.inf)
+        bid_cap = max((self._limit(order, 1) for order in bids), default=-np.inf)
+        # Only resting orders that some queued order can cross may trade; the
+        # book itself is never crossed between auctions.
+        bids = self._crossing(self.bid_book, lambda p: p >= ask_floor) + bids
+        asks = self._crossing(self.ask_book, lambda p: p <= bid_cap) + asks
+
+        bid_prices = np.array([self._limit(order, 1) for order in bids], dtype=float)
+        ask_prices = np.array([self._limit(order, -1) for order in asks], dtype=float)
+        bid_volumes = np.array([order.active_volume for order in bids])
+        ask_volumes = np.array([-order.active_volume for order in asks])
+        reference = self.mark_price or self.initial_fair_price
+        price, volume = clearing_price(
+            bid_prices, bid_volumes, ask_prices, ask_volumes, reference
+        )
+
+        if volume > 0:
+            pro_rata = self.allocation == "pro_rata"
+            bid_ids = np.array([order.id for order in bids])
+            ask_ids = np.array([order.id for order in asks])
+            bid_rank = np.lexsort((bid_ids, -bid_prices))
+            ask_rank = np.lexsort((ask_ids, ask_prices))
+            bid_fills = allocate(
+                bid_prices[bid_rank], bid_volumes[bid_rank], volume, pro_rata
+            )
+            ask_fills = allocate(
+                ask_prices[ask_rank], ask_volumes[ask_rank], volume, pro_rata
+            )
+            buyers, sellers, volumes = pair_fills(bid_fills, ask_fills)
+            for b, s, fill_volume in zip(
+                bid_rank[buyers].tolist(),
+                ask_rank[sellers].tolist(),
+                volumes.tolist(),
+            ):
+                bid_order, ask_order = bids[b], asks[s]
+                self.execute_trade(
+                    self.get_participant(bid_order.trader_id),
+                    self.get_participant(ask_order.trader_id),
+                    price,
+                    fill_volume,
+                    1 if bid_order.id > ask_order.id else -1,
+                    bid_order.id,
+                    ask_order.id,
+                )
+            for orders, rank, fills, sign in (
+                (bids, bid_rank, bid_fills, 1),
+                (asks, ask_rank, ask_fills, -1),
+            ):
+                for index, fill_volume in zip(rank.tolist(), fills.tolist()):
+                    if fill_volume:
+                        self._fill(orders[index], sign * fill_volume)
+            self.clearing_prices.append((self.last_submission_time, price, volume))
+
+        self._rest(pending)
+        if volume > 0:
+            self.mark_price = price
+        else:
+            self._update_mark_price()
+        self._record_submission()
+
+    @staticmethod
+    def _limit(order: Order, side: int) -> float:
+        """The order's limit price, or an unbounded one for market orders."""
+        return side * np.inf if order.price is None else order.price
+
+    @staticmethod
+    def _crossing(book, crosses) -> List[Order]:
+        """The resting orders of a book side at prices that pass ``crosses``."""
+        orders = []
+        for level in book.levels():
+            if not crosses(level.price):
+                break
+            orders.extend(level)
+        return orders
+
+    def _fill(self, order: Order, volume: Union[int, float]) -> None:
+        """Apply an auction fill to a resting or queued order."""
+        book = self._order_index.get(order.id)
+        if book is not None:
+            if volume == order.active_volume:
+                book.remove(order)
+                del self._order_index[order.id]
+            else:
+                book.fill(order, volume)
+                self.update_order_status(order)
+                return
+        order.filled += volume
+        self.update_order_status(order)
+        if order.status == OrderStatus.FILLED:
+            self._deactivate_order(self.get_participant(order.trader_id), order)
+
+    def _rest(self, pending: List[Order]) -> None:
+        """Put unfilled limit orders in the book and cancel unfilled market orders."""
+        bids: List[Order] = []
+        asks: List[Order] = []
+        for order in pending:
+            if order.status == OrderStatus.FILLED:
+                continue
+            if isinstance(order, MarketOrder):
+                order.status = OrderStatus.CANCELED
+                if self._record_events:
+                    self._log_order(EventType.CANCEL, order, order.active_volume)
+                    self.cancellations.append(order)
+                self.get_participant(order.trader_id).inactive_orders.append(order)
+            elif order.volume > 0:
+                bids.append(order)
+                self._order_index[order.id] = self.bid_book
+            else:
+                asks.append(order)
+                self._order_index[order.id] = self.ask_book
+        if bids:
+            self.bid_book.add_many(bids)
+        if asks:
+            self.ask_book.add_many(asks)
+
+    def _end_tick(self) -> None:
+        """Clear the auction on its schedule, then finish the tick as usual."""
+        tick = self.current_tick
+        if (tick + 1) % self.interval == 0 or tick + 1 == self.duration:
+            self.clear()
+        super()._end_tick()
@@ -0,0 +1,312 @@
+"""Price-level order book used by continuous markets."""
+
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Iterable, Iterator, List, Optional, Union
+from pymicrostructure.orders.base import Order
+
+
+class PriceLevel:
+    """
+    A FIFO queue of resting orders that share the same price.
+
+    Orders are kept as the keys of an ``OrderedDict``, which gives O(1) access to
+    and removal of the front of the queue, and O(1) removal of any order, while
+    preserving time priority within the level.
+
+    Attributes:
+    -----------
+    price : int or float
+        The price of the level.
+    orders : OrderedDict
+        Resting orders at this price, in time priority.
+    volume : int or float
+        The aggregated active volume of the level (negative for asks).
+    """
+
+    __slots__ = ("price", "orders", "volume")
+
+    def __init__(self, price: Union[int, float]) -> None:
+        """Initialize an empty price level."""
+        self.price = price
+        self.orders: "OrderedDict[Order, None]" = OrderedDict()
+        self.volume = 0
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def __iter__(self) -> Iterator[Order]:
+        return iter(self.orders)
+
+    def __repr__(self) -> str:
+        return (
+            f"PriceLevel(price={self.price}, volume={self.volume}, orders={len(self)})"
+        )
+
+    def append(self, order: Order) -> None:
+        """Add an order to the back of the queue."""
+        self.orders[order] = None
+        self.volume += order.active_volume
+
+    def front(self) -> Order:
+        """Return the order with the highest time priority."""
+        return next(iter(self.orders))
+
+    def popleft(self) -> Order:
+        """Remove and return the order with the highest time priority."""
+        order = self.orders.popitem(last=False)[0]
+        self.volume -= order.active_volume
+        return order
+
+
+class BookSide:
+    """
+    One side of a price-level order book.
+
+    Price levels are kept in a list sorted from worst to best price, so the best
+    level sits at the end of the list and can be read or removed in O(1). New
+    levels are located with a binary search in O(log L), where L is the number of
+    price levels.
+
+    Attributes:
+    -----------
+    side : int
+        1 for the bid side, -1 for the ask side.
+    volume : int or float
+        The aggregated active volume of the whole side (negative for asks).
+    changed_prices : set
+        Prices whose aggregated volume changed since the set was last cleared.
+        Used to maintain depth snapshots incrementally.
+
+    Methods:
+    --------
+    add(order)
+        Add a resting order to the book.
+    add_many(orders)
+        Add several resting orders, merging new price levels in one pass.
+    front()
+        Return the order with the highest price-time priority.
+    fill_front(volume)
+        Fill the order at the front of the book.
+    fill(order, volume)
+        Fill a resting order anywhere in the book.
+    pop_front()
+        Remove the order at the front of the book.
+    remove(order)
+        Remove a resting order from anywhere in the book.
+    levels()
+        Iterate over the price levels from best to worst.
+    volume_at(price)
+        Return the aggregated active volume at a price.
+    """
+
+    def __init__(self, side: int) -> None:
+        """
+        Initialize an empty book side.
+
+        Parameters:
+        -----------
+        side : int
+            1 for the bid side, -1 for the ask side.
+        """
+        if side not in (1, -1):
+            raise ValueError("Book side must be 1 (bid) or -1 (ask).")
+        self.side = side
+        # Sort keys are ``side * price`` so that the best level is always last.
+        self._keys: List[float] = []
+        self._levels: List[PriceLevel] = []
+        self._by_price = {}
+        self._count = 0
+        self.volume = 0
+        self.changed_prices = set()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __bool__(self) -> bool:
+        return self._count > 0
+
+    def __iter__(self) -> Iterator[Order]:
+        """Iterate over resting orders in price-time priority."""
+        for level in reversed(self._levels):
+            yield from level
+
+    @property
+    def best_price(self) -> Optional[Union[int, float]]:
+        """The best price on this side, or None if the side is empty."""
+        return self._levels[-1].price if self._levels else None
+
+    @property
+    def best_level(self) -> Optional[PriceLevel]:
+        """The best price level on this side, or None if the side is empty."""
+        return self._levels[-1] if self._levels else None
+
+    def levels(self) -> Iterator[PriceLevel]:
+        """Iterate over the price levels from best to worst."""
+        return reversed(self._levels)
+
+    def top(self, n: int) -> List[PriceLevel]:
+        """Return up to ``n`` price levels, best first."""
+        return self._levels[: -n - 1 : -1]
+
+    def level(self, price: Union[int, float]) -> Optional[PriceLevel]:
+        """Return the level at ``price``, or None if there is none."""
+        return self._by_price.get(price)
+
+    def volume_at(self, price: Union[int, float]) -> Union[int, float]:
+        """Return the aggregated active volume at ``price`` (0 if no level)."""
+        level = self._by_price.get(price)
+        return level.volume if level is not None else 0
+
+    def add(self, order: Order) -> None:
+        """
+        Add a resting order to the back of its price level.
+
+        Parameters:
+        -----------
+        order : Order
+            The order to add. Its price determines the level it joins.
+        """
+        price = order.price
+        level = self._by_price.get(price)
+        if level is None:
+            level = PriceLevel(price)
+            key = self.side * price
+            index = bisect_left(self._keys, key)
+            self._keys.insert(index, key)
+            self._levels.insert(index, level)
+            self._by_price[price] = level
+        level.append(order)
+        self._count += 1
+        self.volume += order.active_volume
+        self.changed_prices.add(price)
+
+    def add_many(self, orders: Iterable[Order]) -> None:
+        """
+        Add several resting orders to the back of their price levels.
+
+        Orders join their levels in the given order. Levels that do not exist yet
+        are created first and merged into the sorted level list in a single pass,
+        instead of one binary-search insertion per level.
+
+        Parameters:
+        -----------
+        orders : iterable of Order
+            The orders to add, in time priority.
+        """
+        by_price = self._by_price
+        new_levels = []
+        for order in orders:
+            price = order.price
+            level = by_price.get(price)
+            if level is None:
+                level = by_price[price] = PriceLevel(price)
+                new_levels.append(level)
+            level.append(order)
+            self._count += 1
+            self.volume += order.active_volume
+            self.changed_prices.add(price)
+
+        if len(new_levels) == 1:
+            level = new_levels[0]
+            key = self.side * level.price
+            index = bisect_left(self._keys, key)
+            self._keys.insert(index, key)
+            self._levels.insert(index, level)
+        elif new_levels:
+            merged = sorted(
+                [*zip(self._keys, self._levels)]
+                + [(self.side * level.price, level) for level in new_levels],
+                key=lambda pair: pair[0],
+            )
+            self._keys = [key for key, _ in merged]
+            self._levels = [level for _, level in merged]
+
+    def front(self) -> Order:
+        """Return the order with the highest price-time priority."""
+        return self._levels[-1].front()
+
+    def fill_front(self, volume: Union[int, float]) -> Order:
+        """
+        Fill the order at the front of the book.
+
+        Parameters:
+        -----------
+        volume : int or float
+            The filled volume, signed like the order's volume.
+
+        Returns:
+        --------
+        Order
+            The order that was filled.
+        """
+        level = self._levels[-1]
+        order = level.front()
+        order.filled += volume
+        level.volume -= volume
+        self.volume -= volume
+        self.changed_prices.add(level.price)
+        return order
+
+    def fill(self, order: Order, volume: Union[int, float]) -> None:
+        """
+        Fill a resting order anywhere in the book.
+
+        The order stays in the book; remove it with ``remove`` first if the fill
+        completes it.
+
+        Parameters:
+        -----------
+        order : Order
+            The resting order to fill.
+        volume : int or float
+            The filled volume, signed like the order's volume.
+        """
+        level = self._by_price[order.price]
+        order.filled += volume
+        level.volume -= volume
+        self.volume -= volume
+        self.changed_prices.add(level.price)
+
+    def pop_front(self) -> Order:
+        """Remove and return the order with the highest price-time priority."""
+        level = self._levels[-1]
+        order = level.popleft()
+        self._count -= 1
+        self.volume -= order.active_volume
+        self.changed_prices.add(level.price)
+        if not level.orders:
+            self._keys.pop()
+            self._levels.pop()
+            del self._by_price[level.price]
+        return order
+
+    def remove(self, order: Order) -> None:
+        """
+        Remove a resting order from its price level.
+
+        Parameters:
+        -----------
+        order : Order
+            The order to remove.
+
+        Raises:
+        -------
+        KeyError
+            If the order is not resting on this side of the book.
+        """
+        level = self._by_price[order.price]
+        del level.orders[order]
+        level.volume -= order.active_volume
+        self._count -= 1
+        self.volume -= order.active_volume
+        self.changed_prices.add(level.price)
+        if not level.orders:
+            self._drop_level(level)
+
+    def _drop_level(self, level: PriceLevel) -> None:
+        """Remove an empty price level."""
+        index = bisect_left(self._keys, self.side * level.price)
+        del self._keys[index]
+        del self._levels[index]
+        del self._by_price[level.price]
@@ -0,0 +1,429 @@
+"""Versioned on-disk checkpoints of markets."""
+
+import importlib
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from pymicrostructure.markets.base import Market
+from pymicrostructure.markets.news import NewsHistory
+from pymicrostructure.markets.scheduler import ArrivalProcess
+from pymicrostructure.orders.base import Order, OrderStatus
+from pymicrostructure.orders.limit import LimitOrder
+from pymicrostructure.orders.market import MarketOrder
+from pymicrostructure.traders.base import Trader
+
+CHECKPOINT_FORMAT = "pymicrostructure-checkpoint"
+CHECKPOINT_VERSION = 1
+MANIFEST = "manifest.json"
+
+PARTS = (
+    "book",
+    "trades",
+    "events",
+    "top_of_book",
+    "snapshots",
+    "news",
+    "traders",
+    "orders",
+)
+
+ORDER_DTYPE = np.dtype(
+    [
+        ("id", "i8"),
+        ("trader_id", "i8"),
+        ("volume", "f8"),
+        ("filled", "f8"),
+        ("price", "i8"),
+        ("time", "i8"),
+        ("status", "i1"),
+        ("is_limit", "?"),
+    ]
+)
+
+# Scalar market attributes written to the manifest and set back on load.
+MARKET_ATTRIBUTES = (
+    "initial_fair_price",
+    "recording",
+    "record_every",
+    "history_window",
+    "spill_dir",
+    "last_submission_time",
+    "completed",
+    "duration",
+    "current_tick",
+    "mark_price",
+    "news_arrival_rate",
+    "good_news_prob",
+    "_snapshot_time",
+    "_next_order_id",
+)
+
+SCALAR_TYPES = (bool, int, float, str, type(None))
+
+
+def _scalar(value: Any) -> Any:
+    """Return ``value`` as a JSON scalar, or raise TypeError."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if not isinstance(value, SCALAR_TYPES):
+        raise TypeError(f"{type(value).__name__} is not a scalar")
+    return value
+
+
+def _qualified_name(cls: type) -> Dict[str, str]:
+    return {"module": cls.__module__, "class": cls.__qualname__}
+
+
+def _resolve(name: Dict[str, str], base: type) -> type:
+    """Import a class by name, falling back to ``base`` if it is unavailable."""
+    try:
+        cls = importlib.import_module(name["module"])
+        for attribute in name["class"].split("."):
+            cls = getattr(cls, attribute)
+    except (ImportError, AttributeError):
+        return base
+    return cls if isinstance(cls, type) and issubclass(cls, base) else base
+
+
+def _orders_to_array(orders: Iterable[Order]) -> np.ndarray:
+    """Encode orders as rows of ``ORDER_DTYPE``."""
+    return np.array(
+        [
+            (
+                order.id,
+                order.trader_id,
+                order.volume,
+                order.filled,
+                -1 if order.price is None else order.price,
+                -1 if order.time is None else order.time,
+                order.status,
+                order.price is not None,
+            )
+            for order in orders
+        ],
+        dtype=ORDER_DTYPE,
+    )
+
+
+def _orders_from_array(rows: np.ndarray) -> List[Order]:
+    """Rebuild orders from rows of ``ORDER_DTYPE``."""
+    orders = []
+    for (
+        order_id,
+        trader_id,
+        volume,
+        filled,
+        price,
+        time,
+        status,
+        is_limit,
+    ) in rows.tolist():
+        cls = LimitOrder if is_limit else MarketOrder
+        order = cls.__new__(cls)
+        order.id = order_id
+        order.trader_id = trader_id
+        order.volume = int(volume) if volume.is_integer() else volume
+        order.side = 1 if volume > 0 else -1
+        order.price = price if is_limit else None
+        order.time = None if time < 0 else time
+        order.status = OrderStatus(status)
+        order.filled = int(filled) if filled.is_integer() else filled
+        orders.append(order)
+    return orders
+
+
+class _Writer:
+    """Writes named arrays into a checkpoint directory."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.arrays: Dict[str, Dict[str, Any]] = {}
+        self._chunks: Dict[str, List[np.ndarray]] = {}
+        os.makedirs(path, exist_ok=True)
+
+    def write(self, name: str, array: np.ndarray) -> None:
+        """Save ``array`` as ``<name>.npy``."""
+        np.save(os.path.join(self.path, f"{name}.npy"), array)
+        self.arrays[name] = {"file": f"{name}.npy", "rows": len(array)}
+
+    def append(self, name: str, array: np.ndarray) -> Tuple[int, int]:
+        """Queue ``array`` as a section of ``name`` and return its row range."""
+        chunks = self._chunks.setdefault(name, [])
+        start = sum(len(chunk) for chunk in chunks)
+        chunks.append(array)
+        return start, start + len(array)
+
+    def flush(self, name: str, dtype: np.dtype) -> None:
+        """Write the sections queued under ``name`` as one array."""
+        chunks = self._chunks.pop(name, [])
+        self.write(name, np.concatenate(chunks) if chunks else np.empty(0, dtype))
+
+
+def save_checkpoint(market: Market, path: str) -> None:
+    """
+    Write a market to a checkpoint directory.
+
+    Every history is written as a typed ``.npy`` array, and a ``manifest.json``
+    describes the market's scalar settings, its traders and the arrays. Traders
+    are saved as their class name, their scalar attributes (such as
+    ``position``, ``cash`` and ``fair_price``), the state of their random
+    stream, their fills and their orders.
+    Strategy objects, callables and the news process are not saved.
+
+    Parameters:
+    -----------
+    market : ContinuousDoubleAuction
+        The market to save.
+    path : str
+        The checkpoint directory. It is created if needed, and existing files of
+        a previous checkpoint are overwritten.
+    """
+    writer = _Writer(path)
+    writer.write("trades", market.trades.to_numpy())
+    writer.write("events", market.events.to_numpy())
+    writer.write("top_of_book", market.top_of_book.to_numpy())
+    for name, array in market.ob_snapshots.to_arrays().items():
+        writer.write(f"snapshots_{name}", array)
+    writer.write("news", market.news_history.to_numpy())
+    writer.write("book", _orders_to_array([*market.bid_book, *market.ask_book]))
+    writer.write("cancellations", _orders_to_array(market.cancellations))
+
+    traders = []
+    fill_dtype = None
+    for trader in market.participants:
+        attributes = {}
+        for key, value in vars(trader).items():
+            try:
+                attributes[key] = _scalar(value)
+            except TypeError:
+                continue
+        fills = trader.fills.to_numpy()
+        fill_dtype = fills.dtype
+        traders.append(
+            {
+                **_qualified_name(type(trader)),
+                "trader_id": trader.trader_id,
+                "attributes": attributes,
+                "rng_state": trader.rng.bit_generator.state,
+                "fills": writer.append("fills", fills),
+                "orders": writer.append("orders", _orders_to_array(trader.orders)),
+                "inactive_orders": writer.append(
+                    "inactive_orders", _orders_to_array(trader.inactive_orders)
+                ),
+            }
+        )
+    writer.flush("fills", fill_dtype or np.dtype([("trade", "i8"), ("side", "i1")]))
+    writer.flush("orders", ORDER_DTYPE)
+    writer.flush("inactive_orders", ORDER_DTYPE)
+
+    manifest = {
+        "format": CHECKPOINT_FORMAT,
+        "version": CHECKPOINT_VERSION,
+        "market": {
+            **_qualified_name(type(market)),
+            "attributes": {
+                key: _scalar(getattr(market, key)) for key in MARKET_ATTRIBUTES
+            },
+            "keyframe_interval": market.ob_snapshots.keyframe_interval,
+            "depth_levels": market.top_of_book.depth_levels,
+            "seed_entropy": str(market.seed_sequence.entropy),
+            "seed_children": market.seed_sequence.n_children_spawned,
+            "rng_state": market.rng.bit_generator.state,
+        },
+        "traders": traders,
+        "arrays": writer.arrays,
+    }
+    with open(os.path.join(path, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=1)
+
+
+def read_manifest(path: str) -> Dict[str, Any]:
+    """
+    Read and validate the manifest of a checkpoint.
+
+    Parameters:
+    -----------
+    path : str
+        The checkpoint directory.
+
+    Returns:
+    --------
+    dict
+        The manifest.
+
+    Raises:
+    -------
+    ValueError
+        If the directory is not a checkpoint, or was written by a newer version.
+    """
+    with open(os.path.join(path, MANIFEST)) as f:
+        manifest = json.load(f)
+    if manifest.get("format") != CHECKPOINT_FORMAT:
+        raise ValueError(f"{path} is not a market checkpoint.")
+    if manifest["version"] > CHECKPOINT_VERSION:
+        raise ValueError(
+            f"Checkpoint version {manifest['version']} is newer than the "
+            f"supported version {CHECKPOINT_VERSION}."
+        )
+    return manifest
+
+
+def load_array(path: str, name: str, mmap: bool = True) -> np.ndarray:
+    """
+    Read one array of a checkpoint without building a market.
+
+    Parameters:
+    -----------
+    path : str
+        The checkpoint directory.
+    name : str
+        The array name, for example "trades", "events" or "top_of_book".
+    mmap : bool, optional
+        Whether to memory-map the array instead of reading it (default is True).
+
+    Returns:
+    --------
+    numpy.ndarray
+        The saved array.
+    """
+    manifest = read_manifest(path)
+    if name not in manifest["arrays"]:
+        raise KeyError(f"No array named {name!r} in the checkpoint.")
+    return np.load(
+        os.path.join(path, manifest["arrays"][name]["file"]),
+        mmap_mode="r" if mmap else None,
+    )
+
+
+def load_checkpoint(
+    path: str, parts: Optional[Iterable[str]] = None, mmap: bool = True
+) -> Market:
+    """
+    Rebuild a market from a checkpoint directory.
+
+    Loading is selective: parts that are not requested are left empty. With
+    ``mmap`` the trade tape, message log, top-of-book history and snapshot
+    arrays are memory-mapped, so they are read from disk only when accessed and
+    copied into memory only if the market records more rows.
+
+    Traders are rebuilt as instances of their saved class, without running
+    ``__init__``, with their scalar attributes, random streams, fills and orders. Their
+    strategies are not saved, so they are not scheduled when the market runs
+    again; new traders can be registered and run against the restored book.
+
+    Parameters:
+    -----------
+    path : str
+        The checkpoint directory.
+    parts : iterable of str, optional
+        The parts to load, from ``PARTS`` (default is all). "book" implies
+        "traders", since resting orders belong to traders whose IDs must not be
+        handed out again, and "traders" implies "trades", since fills are rows
+        of the trade tape.
+    mmap : bool, optional
+        Whether to memory-map the arrays (default is True).
+
+    Returns:
+    --------
+    ContinuousDoubleAuction
+        The restored market.
+    """
+    manifest = read_manifest(path)
+    parts = set(PARTS if parts is None else parts)
+    unknown = parts - set(PARTS)
+    if unknown:
+        raise ValueError(f"Unknown checkpoint parts {sorted(unknown)}.")
+    if "book" in parts:
+        parts.add("traders")
+    if "traders" in parts:
+        parts.add("trades")
+
+    def array(name: str) -> np.ndarray:
+        file = os.path.join(path, manifest["arrays"][name]["file"])
+        return np.load(file, mmap_mode="r" if mmap else None)
+
+    saved = manifest["market"]
+    attributes = saved["attributes"]
+    cls = _resolve(saved, Market)
+    market = cls(
+        initial_fair_price=attributes["initial_fair_price"],
+        keyframe_interval=saved["keyframe_interval"],
+        depth_levels=saved["depth_levels"],
+        recording=attributes["recording"],
+        record_every=attributes["record_every"],
+        history_window=attributes["history_window"],
+        spill_dir=attributes["spill_dir"],
+    )
+    for key, value in attributes.items():
+        setattr(market, key, value)
+    market.seed_sequence = np.random.SeedSequence(
+        int(saved["seed_entropy"]), n_children_spawned=saved["seed_children"]
+    )
+    market.rng = np.random.default_rng(market.seed_sequence)
+    market.rng.bit_generator.state = saved["rng_state"]
+
+    if "trades" in parts:
+        market.trades.restore(array("trades"))
+    if "events" in parts:
+        market.events.restore(array("events"))
+    if "top_of_book" in parts:
+        market.top_of_book.restore(array("top_of_book"))
+    if "snapshots" in parts:
+        market.ob_snapshots.restore(
+            {
+                name: array(f"snapshots_{name}")
+                for name in ("index", "deltas", "keyframes", "keyframe_ends", "levels")
+            }
+        )
+    if "news" in parts:
+        market.news_history = NewsHistory(array("news"))
+
+    if "traders" in parts:
+        fills = array("fills")
+        if "orders" in parts:
+            orders = array("orders")
+            inactive = array("inactive_orders")
+        for saved_trader in manifest["traders"]:
+            trader_cls = _resolve(saved_trader, Trader)
+            trader = trader_cls.__new__(trader_cls)
+            trader.__dict__.update(saved_trader["attributes"])
+            trader.market = market
+            trader.orders = []
+            trader.active_orders = {}
+            trader.inactive_orders = market.create_history("inactive-orders")
+            trader.fills = market.create_records(fills.dtype, "fills")
+            trader.fills.restore(fills[slice(*saved_trader["fills"])])
+            trader.rng = np.random.default_rng()
+            trader.rng.bit_generator.state = saved_trader["rng_state"]
+            # Strategies are not saved, so restored traders are never woken.
+            trader.arrival = ArrivalProcess()
+            if "orders" in parts:
+                trader.orders = _orders_from_array(
+                    orders[slice(*saved_trader["orders"])]
+                )
+                trader.inactive_orders.extend(
+                    _orders_from_array(
+                        inactive[slice(*saved_trader["inactive_orders"])]
+                    )
+                )
+            market.participants_by_id[trader.trader_id] = trader
+            market.participants.append(trader)
+
+    if "orders" in parts:
+        market.cancellations.extend(_orders_from_array(array("cancellations")))
+
+    if "book" in parts:
+        for order in _orders_from_array(array("book")):
+            book = market.bid_book if order.side == 1 else market.ask_book
+            book.add(order)
+            market._order_index[order.id] = book
+            trader = market.participants_by_id.get(order.trader_id)
+            if trader is not None:
+                trader.active_orders[order.id] = order
+        # Let the next snapshot compare every recorded level with the book.
+        snapshots = market.ob_snapshots
+        market.bid_book.changed_prices.update(snapshots._bid_levels)
+        market.ask_book.changed_prices.update(snapshots._ask_levels)
+
+    return market
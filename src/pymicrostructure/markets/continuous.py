@@ -1,15 +1,22 @@
 """Continuous type markets module for financial markets."""
 
 from pymicrostructure.markets.base import Market
+from pymicrostructure.markets.book import BookSide
+from pymicrostructure.markets.checkpoint import load_checkpoint, save_checkpoint
+from pymicrostructure.markets.events import EventLog, EventType, MessageRecords
+from pymicrostructure.markets.news import BernoulliNews, NewsHistory, NewsProcess
+from pymicrostructure.markets.scheduler import Scheduler
+from pymicrostructure.markets.snapshots import DepthSnapshots, TopOfBookHistory
+from pymicrostructure.orders.limit import LimitOrder
 from pymicrostructure.orders.market import MarketOrder
-from pymicrostructure.orders.base import Order
+from pymicrostructure.orders.base import Order, OrderStatus
 from pymicrostructure.traders.base import Trader
-from operator import itemgetter, attrgetter
-import random
-from typing import Union, List, Dict, Any, Optional, Tuple
+from pymicrostructure.utils.buffers import History
+import numpy as np
+from typing import Union, List, Dict, Any, Optional, Sequence, Tuple
 from tqdm import tqdm
-from dill import load, dump
-from collections import defaultdict
+
+RECORDING_POLICIES = ("full", "tick", "every_k", "top", "none")
 
 
 class ContinuousDoubleAuction(Market):
@@ -23,234 +30,511 @@ class ContinuousDoubleAuction(Market):
 
     Attributes:
     -----------
+    bid_book : BookSide
+        The bid side of the price-level order book.
+    ask_book : BookSide
+        The ask side of the price-level order book.
     bid_ob : list
-        A list of bid orders in the order book.
+        The resting bid orders in price-time priority.
     ask_ob : list
-        A list of ask orders in the order book.
-    ob_snapshots : list
-        A list of order book snapshots, capturing the state of the order book over time.
-    midprices : list
-        A list of tuples containing timestamp and midprice at each snapshot.
-    cancellations : list
+        The resting ask orders in price-time priority.
+    ob_snapshots : DepthSnapshots
+        The order book depth after every submission, stored as level deltas with
+        periodic keyframes and read like a list of snapshots.
+    top_of_book : TopOfBookHistory
+        Columnar history of best prices, midprice, spread, depth and the top
+        levels of the book at each snapshot, backed by NumPy arrays.
+    midprices : numpy.ndarray
+        A record view of ``top_of_book`` with ``time`` and ``mark_price`` fields
+        (the midprice carried forward over one-sided books).
+    events : EventLog
+        The typed message log of order additions, cancellations, rejections and
+        trades.
+    msg_history : MessageRecords
+        The message log as ``(time, type, description)`` tuples, formatted on
+        access.
+    cancellations : History
         A list to track cancelled orders.
+    recording : str
+        The recording policy, one of ``RECORDING_POLICIES``:
+
+        - ``"full"``: book snapshots after every submission, message log and
+          cancellations recorded.
+        - ``"tick"``: book snapshots once at the end of every tick, message log and
+          cancellations recorded.
+        - ``"every_k"``: book snapshots after every ``record_every``-th submission,
+          message log and cancellations recorded.
+        - ``"top"``: only ``top_of_book`` after every submission.
+        - ``"none"``: nothing but trades and trader fills.
     duration : int or None
         The duration of the market simulation in ticks.
     current_tick : int
         The current tick (time step) of the market simulation.
+    news_process : NewsProcess or None
+        The process generating the news of each run up front.
+    news_history : NewsHistory
+        The news revealed so far, one value per tick after an initial 0.
+    exporters : list of StreamingExporter
+        Exporters that write the histories to disk at the end of every tick.
 
     Methods:
     --------
     submit_order(orders)
         Submit one or more orders to the market.
+    submit_orders(orders)
+        Submit a batch of orders with one insert, one matching pass and one snapshot.
+    submit_order_arrays(trader_ids, volumes, prices)
+        Build orders from column arrays and submit them as one batch.
+    cancel_order(order)
+        Cancel a resting order and remove it from the order book.
     drop_cancelled_orders()
         Remove cancelled orders from the order books.
     save_ob_state()
         Save the current state of the order book.
     match_orders()
         Match and execute orders in the order book.
-    get_participant(trader_id)
-        Retrieve a market participant by their trader ID.
     execute_trade(buyer, seller, price, volume, aggressor_side)
         Execute a trade between two participants.
     update_order_status(order)
         Update the status of an order after matching.
     run(ticks=10)
         Run the market simulation for a specified number of ticks.
+    save(path)
+        Write the market to a checkpoint directory.
+    load(path, parts, mmap)
+        Rebuild a market from a checkpoint directory.
 
     """
 
-    def __init__(self, initial_fair_price: int = 100):
+    def __init__(
+        self,
+        initial_fair_price: int = 100,
+        keyframe_interval: int = 100,
+        depth_levels: int = 5,
+        recording: str = "full",
+        record_every: int = 1,
+        history_window: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+        seed: Optional[int] = None,
+        news_process: Optional[NewsProcess] = None,
+    ):
         """
         Initialize a new ContinuousDoubleAuction instance.
 
         Sets up empty order books, snapshots, midprices, and other tracking attributes.
+
+        Parameters:
+        -----------
+        initial_fair_price : int, optional
+            The fair price traders start from (default is 100).
+        keyframe_interval : int, optional
+            The number of order book snapshots between full keyframes (default is 100).
+        depth_levels : int, optional
+            The number of price levels per side kept in ``top_of_book`` (default is 5).
+        recording : str, optional
+            The recording policy, one of ``RECORDING_POLICIES`` (default is "full").
+        record_every : int, optional
+            The snapshot interval in submissions for the "every_k" policy
+            (default is 1).
+        history_window : int, optional
+            The number of recent entries or rows each history keeps in memory;
+            older ones are spilled to disk in chunks (default is no limit).
+        spill_dir : str, optional
+            The directory spilled chunks are written under (default is the system
+            temporary directory).
+        seed : int, optional
+            The seed of the market's random streams. Participants draw from
+            child streams of it, so a seeded market is reproducible (default is
+            fresh OS entropy).
+        news_process : NewsProcess, optional
+            The process generating market news (default is ``BernoulliNews``
+            with ``news_arrival_rate`` and ``good_news_prob``).
         """
-        super().__init__()
-        self.bid_ob: List[Order] = []
-        self.ask_ob: List[Order] = []
-        self.ob_snapshots: List[Dict[str, Any]] = []
-        self.midprices: List[Tuple[int, float]] = [(0, 0)]
-        self.cancellations: List[Order] = []
+        if recording not in RECORDING_POLICIES:
+            raise ValueError(
+                f"Unknown recording policy {recording!r}, "
+                f"expected one of {RECORDING_POLICIES}."
+            )
+        if record_every < 1:
+            raise ValueError("record_every must be at least 1.")
+        super().__init__(history_window, spill_dir, seed)
+        self.bid_book: BookSide = BookSide(1)
+        self.ask_book: BookSide = BookSide(-1)
+        self._order_index: Dict[int, BookSide] = {}
+        self.ob_snapshots: DepthSnapshots = DepthSnapshots(
+            keyframe_interval, memory_rows=history_window, spill_dir=spill_dir
+        )
+        self.top_of_book: TopOfBookHistory = TopOfBookHistory(
+            depth_levels, memory_rows=history_window, spill_dir=spill_dir
+        )
+        self.mark_price: float = 0
+        self.cancellations: History = self.create_history("cancellations")
         self.duration: Optional[int] = None
         self.current_tick: int = 0
         self.initial_fair_price: int = initial_fair_price
         self.news_arrival_rate: float = 0.1
         self.good_news_prob: float = 0.5
-        self.news_history: List[int] = [0]
-        self.msg_history: List[Tuple[int, str, Any]] = []
+        self.news_process: Optional[NewsProcess] = news_process
+        self.news_history: NewsHistory = NewsHistory([0])
+        self.events: EventLog = EventLog(
+            memory_rows=history_window, spill_dir=spill_dir
+        )
+        self.recording: str = recording
+        self.record_every: int = record_every if recording == "every_k" else 1
+        self._record_events: bool = recording in ("full", "tick", "every_k")
+        self._snapshot_time: int = 0
+        self._next_order_id: int = 0
+        self.scheduler: Scheduler = Scheduler(self.spawn_rng())
+        self.exporters: List[Any] = []
 
     def submit_order(self, orders: Union[Order, list[Order]]):
         """
         Submit one or more orders to the market.
 
         This method processes incoming orders, adds them to the appropriate order book,
-        updates order statuses, and triggers order matching.
+        updates order statuses, and triggers order matching. A list of orders is
+        submitted as one batch (see ``submit_orders``).
 
         Parameters:
         -----------
         orders : Union[Order, list[Order]]
             A single order or a list of orders to be submitted to the market.
         """
-        if not isinstance(orders, list):
-            orders = [orders]
+        self.submit_orders(orders if isinstance(orders, list) else [orders])
+
+    def submit_orders(self, orders: Sequence[Order]) -> None:
+        """
+        Submit a batch of orders in a single event.
+
+        All orders of the batch share one event time and order IDs are assigned
+        in batch order. The orders then execute as if they had arrived one at a
+        time in that order: each market order sweeps the book as it stands at
+        its position in the batch, and a limit order that crosses trades
+        immediately, as the aggressor, against the orders that arrived before it.
+        Runs of consecutive limit orders that do not cross are inserted with one
+        grouped insert per side, and the book is recorded once.
+
+        Every order is logged as added on submission. A market order is rejected
+        when it executes if there is nothing on the opposite side of the book at
+        that point, and the unfilled remainder of a market order is cancelled; the
+        rest of the batch is still processed.
 
+        Parameters:
+        -----------
+        orders : sequence of Order
+            The orders to submit, in arrival order.
+        """
         self.last_submission_time += 1
+        time = self.last_submission_time
+        record_events = self._record_events
+        bid_book, ask_book = self.bid_book, self.ask_book
+        accepted: List[Tuple[Order, Trader]] = []
 
         for order in orders:
             submitting_trader = self.get_participant(order.trader_id)
+            order.id = self._next_order_id
+            self._next_order_id += 1
+            order.time = time
+            if record_events:
+                self._log_order(EventType.ADD, order, order.volume)
+
+            order.status = OrderStatus.ACTIVE
+            accepted.append((order, submitting_trader))
             if isinstance(order, MarketOrder):
-                if order.volume > 0 and not self.ask_ob:
-                    self.msg_history.append(
-                        (self.last_submission_time, "REJECT", order)
-                    )
-
-                    order.status = "rejected"
-                    submitting_trader.inactive_orders.append(order)
-                    break
-                elif order.volume < 0 and not self.bid_ob:
-                    self.msg_history.append(
-                        (self.last_submission_time, "REJECT", order)
-                    )
-                    order.status = "rejected"
-                    submitting_trader.inactive_orders.append(order)
-                    break
-
-            order.time = self.last_submission_time
-            self.msg_history.append((self.last_submission_time, "ADD", order))
-
+                continue
             if order.volume > 0:
-                self.bid_ob.append(order)
+                self._order_index[order.id] = bid_book
             else:
-                self.ask_ob.append(order)
-            order.status = "active"
-            try:
-                submitting_trader = next(
-                    participant
-                    for participant in self.participants
-                    if participant.trader_id == order.trader_id
-                )
-                submitting_trader.active_orders.append(order)
-            except StopIteration:
-                raise ValueError(f"No trader found with ID {order.trader_id}")
+                self._order_index[order.id] = ask_book
+            submitting_trader.active_orders[order.id] = order
+
+        # Non-crossing limit orders wait here for one grouped insert per side.
+        bids: List[Order] = []
+        asks: List[Order] = []
+        best_bid = best_ask = None
+        for order, submitting_trader in accepted:
+            if isinstance(order, MarketOrder):
+                self._insert(bids, asks)
+                best_bid = best_ask = None
+                self._sweep(order, submitting_trader)
+                continue
+            price = order.price
+            if order.volume > 0:
+                opposite = ask_book.best_price
+                if best_ask is not None and (opposite is None or best_ask < opposite):
+                    opposite = best_ask
+                if opposite is None or price < opposite:
+                    bids.append(order)
+                    if best_bid is None or price > best_bid:
+                        best_bid = price
+                    continue
+            else:
+                opposite = bid_book.best_price
+                if best_bid is not None and (opposite is None or best_bid > opposite):
+                    opposite = best_bid
+                if opposite is None or price > opposite:
+                    asks.append(order)
+                    if best_ask is None or price < best_ask:
+                        best_ask = price
+                    continue
+            # The order crosses: everything before it rests, then it matches.
+            self._insert(bids, asks)
+            best_bid = best_ask = None
+            (bid_book if order.volume > 0 else ask_book).add(order)
+            self.match_orders()
+        self._insert(bids, asks)
+        self._update_mark_price()
+        self._record_submission()
+
+    def _insert(self, bids: List[Order], asks: List[Order]) -> None:
+        """Insert and clear the waiting limit orders of a batch."""
+        if bids:
+            self.bid_book.add_many(bids)
+            bids.clear()
+        if asks:
+            self.ask_book.add_many(asks)
+            asks.clear()
+
+    def submit_order_arrays(
+        self,
+        trader_ids: Sequence[int],
+        volumes: Sequence[Union[int, float]],
+        prices: Optional[Sequence[float]] = None,
+    ) -> List[Order]:
+        """
+        Build orders from column arrays and submit them as one batch.
 
-        self.match_orders()
-        self.save_ob_state()
+        The side of each order is the sign of its volume. Rows whose price is NaN
+        (or all rows, if ``prices`` is omitted) become market orders, the others
+        limit orders.
+
+        Parameters:
+        -----------
+        trader_ids : sequence of int
+            The ID of the trader submitting each order.
+        volumes : sequence of int or float
+            The signed volume of each order.
+        prices : sequence of float, optional
+            The limit price of each order (default is all market orders).
+
+        Returns:
+        --------
+        list of Order
+            The submitted orders, in batch order.
+        """
+        trader_ids = np.asarray(trader_ids).tolist()
+        volumes = np.asarray(volumes).tolist()
+        if prices is None:
+            orders = [MarketOrder(t, v) for t, v in zip(trader_ids, volumes)]
+        else:
+            orders = [
+                MarketOrder(t, v) if p != p else LimitOrder(t, v, p)
+                for t, v, p in zip(trader_ids, volumes, np.asarray(prices).tolist())
+            ]
+        self.submit_orders(orders)
+        return orders
+
+    def cancel_order(self, order: Order) -> None:
+        """
+        Cancel a resting order and remove it from the order book.
+
+        The order is located through the market's order-id index, so the cost does
+        not depend on the size of the book. Orders that are no longer resting
+        (filled, rejected or already cancelled) are ignored.
+
+        Parameters:
+        -----------
+        order : Order
+            The order to cancel.
+        """
+        book = self._order_index.pop(order.id, None)
+        if book is None:
+            return
+        book.remove(order)
+        order.status = OrderStatus.CANCELED
+        if self._record_events:
+            self._log_order(EventType.CANCEL, order, order.active_volume)
+            self.cancellations.append(order)
+        self._deactivate_order(self.get_participant(order.trader_id), order)
+
+    def _log_order(self, code: EventType, order: Order, volume: float) -> None:
+        """Record an order event in the message log."""
+        self.events.record(
+            code,
+            self.last_submission_time,
+            order.id,
+            order.trader_id,
+            np.nan if order.price is None else order.price,
+            volume,
+        )
 
     def drop_cancelled_orders(self):
-        """Remove cancelled orders from both bid and ask order books."""
-        self.bid_ob = [order for order in self.bid_ob if order.status != "canceled"]
-        self.ask_ob = [order for order in self.ask_ob if order.status != "canceled"]
+        """
+        Remove cancelled orders from both bid and ask order books.
+
+        Only needed for orders whose status was set to "canceled" without going
+        through ``cancel_order``; this scans the whole book.
+        """
+        for book in (self.bid_book, self.ask_book):
+            for order in [o for o in book if o.status == OrderStatus.CANCELED]:
+                book.remove(order)
+                self._order_index.pop(order.id, None)
+
+    def _deactivate_order(self, trader: Trader, order: Order) -> None:
+        """Move an order that left the book to the trader's inactive orders."""
+        trader.active_orders.pop(order.id, None)
+        trader.inactive_orders.append(order)
 
     def save_ob_state(self):
         """
         Save the current state of the order book.
 
-        This method aggregates orders at each price level, creates a snapshot of the
-        current order book state, and updates the midprice.
+        The book keeps its aggregated price levels up to date as orders are added,
+        filled and cancelled, so only the levels that changed since the previous
+        snapshot are recorded. The top-of-book history is updated as well.
         """
-        from collections import defaultdict
-
-        bid_volumes = defaultdict(int)
-        ask_volumes = defaultdict(int)
-
-        for order in self.bid_ob:
-            bid_volumes[order.price] += order.volume
-        for order in self.ask_ob:
-            ask_volumes[order.price] += order.volume
-
-        bid_ob_snapshot = [
-            {"price": price, "volume": volume} for price, volume in bid_volumes.items()
-        ]
-        ask_ob_snapshot = [
-            {"price": price, "volume": volume} for price, volume in ask_volumes.items()
-        ]
-
-        bid_ob_snapshot.sort(key=lambda x: x["price"], reverse=True)
-        ask_ob_snapshot.sort(key=lambda x: x["price"])
-
-        self.ob_snapshots.append(
-            {
-                "bid": bid_ob_snapshot,
-                "ask": ask_ob_snapshot,
-                "time": self.last_submission_time,
-            }
+        self._snapshot_time = self.last_submission_time
+        self.ob_snapshots.record(
+            self.last_submission_time, self.bid_book, self.ask_book
+        )
+        self.top_of_book.record(
+            self.last_submission_time, self.bid_book, self.ask_book, self.mark_price
         )
 
-        if bid_ob_snapshot and ask_ob_snapshot:
-            new_midprice = (
-                bid_ob_snapshot[0]["price"] + ask_ob_snapshot[0]["price"]
-            ) / 2
+    def _update_mark_price(self):
+        """Update the mark price from the best bid and ask, if both exist."""
+        best_bid = self.bid_book.best_price
+        best_ask = self.ask_book.best_price
+        if best_bid is not None and best_ask is not None:
+            self.mark_price = (best_bid + best_ask) / 2
         elif self.current_tick == 0:
-            new_midprice = 0
-        else:
-            new_midprice = self.midprices[-1][1]
-
-        self.midprices.append((self.last_submission_time, new_midprice))
+            self.mark_price = 0
+
+    def _record_submission(self):
+        """Record the book state after a submission, as the recording policy asks."""
+        recording = self.recording
+        if recording == "full":
+            self.save_ob_state()
+        elif recording == "every_k":
+            if self.last_submission_time % self.record_every == 0:
+                self.save_ob_state()
+        elif recording == "top":
+            self.top_of_book.record(
+                self.last_submission_time, self.bid_book, self.ask_book, self.mark_price
+            )
 
     def match_orders(self):
         """
         Match and execute orders in the order book.
 
-        This method sorts the order books, identifies matching orders, and executes
-        trades when possible.
+        This method crosses the best bid and ask levels of the order book while they
+        overlap, executing trades in price-time priority. Market orders never rest
+        in the book; they are executed by the sweep in ``submit_orders``.
         """
-        self.bid_ob.sort(key=attrgetter("price"), reverse=True)
-        self.ask_ob.sort(key=attrgetter("price"))
-        trade_counter = 0
-        while (
-            self.bid_ob and self.ask_ob and self.bid_ob[0].price >= self.ask_ob[0].price
-        ):
-            bid_order = self.bid_ob[0]
-            ask_order = self.ask_ob[0]
-
-            fill_price = (
-                bid_order.price if bid_order.time < ask_order.time else ask_order.price
-            )
+        bid_book = self.bid_book
+        ask_book = self.ask_book
+        while bid_book and ask_book and bid_book.best_price >= ask_book.best_price:
+            bid_order = bid_book.front()
+            ask_order = ask_book.front()
+
+            bid_rests = bid_order.id < ask_order.id
+            fill_price = bid_order.price if bid_rests else ask_order.price
             fill_volume = min(bid_order.active_volume, abs(ask_order.active_volume))
-            aggressor_side = -1 if bid_order.time < ask_order.time else 1
+            aggressor_side = -1 if bid_rests else 1
 
             buyer = self.get_participant(bid_order.trader_id)
             seller = self.get_participant(ask_order.trader_id)
 
-            self.execute_trade(buyer, seller, fill_price, fill_volume, aggressor_side)
+            self.execute_trade(
+                buyer,
+                seller,
+                fill_price,
+                fill_volume,
+                aggressor_side,
+                bid_order.id,
+                ask_order.id,
+            )
 
-            bid_order.filled += fill_volume
-            ask_order.filled -= fill_volume
+            bid_book.fill_front(fill_volume)
+            ask_book.fill_front(-fill_volume)
 
             self.update_order_status(bid_order)
             self.update_order_status(ask_order)
 
-            if bid_order.status == "filled":
-                self.bid_ob.pop(0)
-            if ask_order.status == "filled":
-                self.ask_ob.pop(0)
-            trade_counter += 1
-
-        # if market order remains in the order book, cancel rest
-        for order in self.bid_ob + self.ask_ob:
-            if isinstance(order, MarketOrder):
-                order.status = "canceled"
-                self.cancellations.append(order)
-        self.drop_cancelled_orders()
+            if bid_order.status == OrderStatus.FILLED:
+                bid_book.pop_front()
+                del self._order_index[bid_order.id]
+                self._deactivate_order(buyer, bid_order)
+            if ask_order.status == OrderStatus.FILLED:
+                ask_book.pop_front()
+                del self._order_index[ask_order.id]
+                self._deactivate_order(seller, ask_order)
 
-    def get_participant(self, trader_id):
+    def _sweep(self, order: MarketOrder, trader: Trader) -> None:
         """
-        Retrieve a market participant by their trader ID.
+        Execute a market order against the opposite side of the book.
+
+        The order walks the opposite price levels from the best one, trading at
+        each resting order's price, and is never inserted into the book. The
+        order is rejected if the opposite side is empty when it executes, and any
+        unfilled remainder is cancelled.
 
         Parameters:
         -----------
-        trader_id : str or int
-            The unique identifier of the trader.
-
-        Returns:
-        --------
-        Participant
-            The participant object with the matching trader ID.
+        order : MarketOrder
+            The market order to execute.
+        trader : Trader
+            The trader who submitted the order.
         """
-        try:
-            return next(p for p in self.participants if p.trader_id == trader_id)
-        except StopIteration:
-            raise ValueError(f"No trader found with ID {trader_id}")
+        is_buy = order.volume > 0
+        book = self.ask_book if is_buy else self.bid_book
+        sign = 1 if is_buy else -1
+        if not book:
+            order.status = OrderStatus.REJECTED
+            if self._record_events:
+                self._log_order(EventType.REJECT, order, order.volume)
+            trader.inactive_orders.append(order)
+            return
+        while order.volume != order.filled and book:
+            resting = book.front()
+            fill_volume = min(abs(order.active_volume), abs(resting.active_volume))
+            counterparty = self.get_participant(resting.trader_id)
+            if is_buy:
+                self.execute_trade(
+                    trader,
+                    counterparty,
+                    resting.price,
+                    fill_volume,
+                    1,
+                    order.id,
+                    resting.id,
+                )
+            else:
+                self.execute_trade(
+                    counterparty,
+                    trader,
+                    resting.price,
+                    fill_volume,
+                    -1,
+                    resting.id,
+                    order.id,
+                )
+            order.filled += sign * fill_volume
+            book.fill_front(-sign * fill_volume)
+            self.update_order_status(resting)
+            if resting.status == OrderStatus.FILLED:
+                book.pop_front()
+                del self._order_index[resting.id]
+                self._deactivate_order(counterparty, resting)
+
+        if order.volume == order.filled:
+            order.status = OrderStatus.FILLED
+        else:
+            order.status = OrderStatus.CANCELED
+            if self._record_events:
+                self._log_order(EventType.CANCEL, order, order.active_volume)
+                self.cancellations.append(order)
+        trader.inactive_orders.append(order)
 
     def execute_trade(
         self,
@@ -259,12 +543,15 @@ class ContinuousDoubleAuction(Market):
         price: float,
         volume: Union[int, float],
         aggressor_side: int,
+        buy_order_id: int = -1,
+        sell_order_id: int = -1,
     ) -> None:
         """
         Execute a trade between two participants.
 
-        This method updates participant positions, records trade information,
-        and adds the trade to the market's trade history.
+        This method updates participant positions and cash, appends the trade to
+        the market's trade tape and indexes the new tape row in both
+        participants' fills.
 
         Parameters:
         -----------
@@ -278,33 +565,43 @@ class ContinuousDoubleAuction(Market):
             The volume of the asset being traded.
         aggressor_side : int
             Indicates which side initiated the trade (1 for buy, -1 for sell).
+        buy_order_id : int, optional
+            The ID of the buy order (default is -1).
+        sell_order_id : int, optional
+            The ID of the sell order (default is -1).
         """
+        time = self.last_submission_time
+        row = len(self.trades)
         buyer.position += volume
         seller.position -= volume
-
-        trade_info = {
-            "price": price,
-            "volume": volume,
-            "aggressor_side": aggressor_side,
-            "time": self.last_submission_time,
-        }
-
-        buyer_trade = trade_info.copy()
-        buyer_trade["volume"] = volume
-        buyer.filled_trades.append(buyer_trade)
-
-        seller_trade = trade_info.copy()
-        seller_trade["volume"] = -volume
-        seller.filled_trades.append(seller_trade)
-
-        self.msg_history.append(
-            (
-                self.last_submission_time,
-                "TRADE",
-                f"{trade_info['volume']} @ {trade_info['price']}, AGG: {trade_info['aggressor_side']}",
+        buyer.cash -= price * volume
+        seller.cash += price * volume
+        buyer.fills.append((row, 1))
+        seller.fills.append((row, -1))
+
+        if self._record_events:
+            if aggressor_side == 1:
+                order_id, trader_id = buy_order_id, buyer.trader_id
+            else:
+                order_id, trader_id = sell_order_id, seller.trader_id
+            self.events.record(
+                EventType.TRADE,
+                time,
+                order_id,
+                trader_id,
+                price,
+                volume * aggressor_side,
             )
+        self.trades.record(
+            time,
+            price,
+            volume,
+            aggressor_side,
+            buyer.trader_id,
+            seller.trader_id,
+            buy_order_id,
+            sell_order_id,
         )
-        self.trade_history.append(trade_info)
 
     def update_order_status(self, order: Order):
         """
@@ -316,50 +613,97 @@ class ContinuousDoubleAuction(Market):
             The order whose status needs to be updated.
         """
         if order.volume == order.filled:
-            order.status = "filled"
+            order.status = OrderStatus.FILLED
         else:
-            order.status = "partial"
+            order.status = OrderStatus.PARTIAL
 
-    def run(self, ticks: int = 10):
+    def run(self, ticks: int = 10, progress: bool = True):
         """
         Run the market simulation for a specified number of ticks.
 
-        This method simulates the market activity for a given duration, updating
-        participants and processing their actions in each tick.
+        This method simulates the market activity for a given duration. On each
+        tick, the scheduler wakes the participants whose arrival process fires
+        (every participant by default), in random order, and calls their
+        ``update()`` method. Participants listening for trades or top-of-book
+        changes are woken on the tick after one occurs. Attached exporters are
+        flushed at the end of every tick and closed when the run ends.
 
         Parameters:
         -----------
         ticks : int, optional
             The number of ticks to run the simulation (default is 10).
+        progress : bool, optional
+            Whether to show a progress bar (default is True).
         """
         self.duration = ticks
-        for tick in tqdm(range(ticks)):
+        scheduler = self.scheduler
+        for participant in self.participants:
+            scheduler.add(participant)
+        watch_trades = scheduler.watching("trade")
+        watch_top = scheduler.watching("top_of_book")
+        news_process = self.news_process or BernoulliNews(
+            self.news_arrival_rate, self.good_news_prob
+        )
+        self.news_history.extend(news_process.generate(ticks, self.rng))
+        for tick in tqdm(range(ticks), disable=not progress):
             self.current_tick = tick
 
-            # News Arrival
-            if random.random() < self.news_arrival_rate:
-                self.news_history.append(
-                    1 if random.random() < self.good_news_prob else -1
-                )
-            else:
-                self.news_history.append(0)
+            self.news_history.advance()
 
-            random.shuffle(self.participants)
-            for participant in self.participants:
+            n_trades = len(self.trades)
+            top = (self.bid_book.best_price, self.ask_book.best_price)
+            for participant in scheduler.advance():
                 participant.update()
+            self._end_tick()
+            if watch_trades and len(self.trades) > n_trades:
+                scheduler.notify("trade")
+            if (
+                watch_top
+                and (self.bid_book.best_price, self.ask_book.best_price) != top
+            ):
+                scheduler.notify("top_of_book")
+        for exporter in self.exporters:
+            exporter.close()
         self.completed = True
 
+    def _end_tick(self) -> None:
+        """Record the tick's book state and flush the exporters."""
+        if self.recording == "tick" and self.last_submission_time > self._snapshot_time:
+            self.save_ob_state()
+        for exporter in self.exporters:
+            exporter.flush()
+
+    @property
+    def midprices(self) -> np.ndarray:
+        """Record view of snapshot times and mark prices."""
+        return self.top_of_book.to_numpy()[["time", "mark_price"]]
+
+    @property
+    def msg_history(self) -> MessageRecords:
+        """The event log as ``(time, type, description)`` messages."""
+        return MessageRecords(self.events)
+
+    @property
+    def bid_ob(self) -> List[Order]:
+        """The resting bid orders in price-time priority."""
+        return list(self.bid_book)
+
+    @property
+    def ask_ob(self) -> List[Order]:
+        """The resting ask orders in price-time priority."""
+        return list(self.ask_book)
+
     @property
     def best_bid(self) -> Optional[float]:
-        return self.bid_ob[0].price if self.bid_ob else None
+        return self.bid_book.best_price
 
     @property
     def best_ask(self) -> Optional[float]:
-        return self.ask_ob[0].price if self.ask_ob else None
+        return self.ask_book.best_price
 
     @property
     def midprice(self) -> Optional[float]:
-        if self.ask_ob and self.bid_ob:
+        if self.ask_book and self.bid_book:
             return (self.best_ask + self.best_bid) / 2
         else:
             return None
@@ -372,18 +716,57 @@ class ContinuousDoubleAuction(Market):
             else None
         )
 
-    def get_recent_trades(self, n: int = 10) -> List[dict]:
-        return (
-            self.trade_history[-n:]
-            if len(self.trade_history) > n
-            else self.trade_history
-        )
+    def get_recent_trades(self, n: int = 10) -> np.ndarray:
+        """
+        Return the last ``n`` trades.
 
-    def save(self, filename) -> None:
-        with open(filename, "wb") as f:
-            dump(self, f)
+        Parameters:
+        -----------
+        n : int, optional
+            The number of trades to return (default is 10).
+
+        Returns:
+        --------
+        numpy.ndarray
+            A record slice of the trade tape, a zero-copy view unless the rows
+            were spilled to disk.
+        """
+        return self.trades.tail(n)
+
+    def save(self, path: str) -> None:
+        """
+        Write the market to a checkpoint directory.
+
+        See ``pymicrostructure.markets.checkpoint.save_checkpoint``.
+
+        Parameters:
+        -----------
+        path : str
+            The checkpoint directory.
+        """
+        save_checkpoint(self, path)
 
     @staticmethod
-    def load(filename: str) -> "ContinuousDoubleAuction":
-        with open(filename, "rb") as f:
-            return load(f)
+    def load(
+        path: str, parts: Optional[Sequence[str]] = None, mmap: bool = True
+    ) -> "ContinuousDoubleAuction":
+        """
+        Rebuild a market from a checkpoint directory.
+
+        See ``pymicrostructure.markets.checkpoint.load_checkpoint``.
+
+        Parameters:
+        -----------
+        path : str
+            The checkpoint directory.
+        parts : sequence of str, optional
+            The parts to load, from ``checkpoint.PARTS`` (default is all).
+        mmap : bool, optional
+            Whether to memory-map the saved arrays (default is True).
+
+        Returns:
+        --------
+        ContinuousDoubleAuction
+            The restored market.
+        """
+        return load_checkpoint(path, parts, mmap)
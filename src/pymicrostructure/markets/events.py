@@ -0,0 +1,224 @@
+"""Typed message log of order book events."""
+
+from enum import IntEnum
+from typing import Iterator, Optional, Tuple, Union
+import numpy as np
+from pymicrostructure.utils.buffers import RecordBuffer
+
+
+class EventType(IntEnum):
+    """The type code of an event in the message log."""
+
+    ADD = 0
+    CANCEL = 1
+    TRADE = 2
+    REJECT = 3
+
+
+class EventLog(RecordBuffer):
+    """
+    Compact, fixed-width log of order book events.
+
+    Every order submission, cancellation, rejection and trade is recorded as one
+    row of plain numbers, so the log does not keep order objects alive and does
+    not format strings while the simulation runs. Use ``filter()`` to select
+    events as a record array, ``iter_events()`` to iterate over them and
+    ``format()`` to render an event as text.
+
+    Fields:
+    -------
+    code : int
+        The ``EventType`` of the event.
+    time : int
+        The event time.
+    order_id : int
+        The order concerned (for trades, the aggressor's order).
+    trader_id : int
+        The trader who owns that order.
+    price : float
+        The limit or trade price (NaN for market orders).
+    volume : float
+        The signed volume: the order volume for ADD and REJECT, the remaining
+        volume for CANCEL, and ``volume * aggressor_side`` for TRADE.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 4096,
+        memory_rows: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize an empty event log.
+
+        Parameters:
+        -----------
+        chunk_size : int, optional
+            The growth step of the underlying buffer in rows (default is 4096).
+        memory_rows : int, optional
+            The maximum number of rows kept in memory before older rows are
+            spilled to disk (default is no limit).
+        spill_dir : str, optional
+            The directory spilled rows are written under (default is the system
+            temporary directory).
+        """
+        super().__init__(
+            [
+                ("code", "i1"),
+                ("time", "i8"),
+                ("order_id", "i8"),
+                ("trader_id", "i8"),
+                ("price", "f8"),
+                ("volume", "f8"),
+            ],
+            chunk_size,
+            memory_rows=memory_rows,
+            spill_dir=spill_dir,
+            name="events",
+        )
+
+    def record(
+        self,
+        code: EventType,
+        time: int,
+        order_id: int,
+        trader_id: int,
+        price: float,
+        volume: float,
+    ) -> None:
+        """
+        Record one event.
+
+        Parameters:
+        -----------
+        code : EventType
+            The type of the event.
+        time : int
+            The event time.
+        order_id : int
+            The order concerned.
+        trader_id : int
+            The trader who owns the order.
+        price : float
+            The limit or trade price (NaN for market orders).
+        volume : float
+            The signed volume of the event.
+        """
+        self.append((code, time, order_id, trader_id, price, volume))
+
+    def filter(
+        self,
+        code: Optional[Union[EventType, Tuple[EventType, ...]]] = None,
+        trader_id: Optional[int] = None,
+        order_id: Optional[int] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Select events matching all of the given criteria.
+
+        Parameters:
+        -----------
+        code : EventType or tuple of EventType, optional
+            The event type(s) to keep.
+        trader_id : int, optional
+            Keep only events of this trader.
+        order_id : int, optional
+            Keep only events of this order.
+        start : int, optional
+            Keep only events at or after this time.
+        end : int, optional
+            Keep only events before this time.
+
+        Returns:
+        --------
+        numpy.ndarray
+            The matching events as a record array, in log order.
+        """
+        events = self.to_numpy()
+        mask = np.ones(len(events), dtype=bool)
+        if code is not None:
+            mask &= np.isin(events["code"], np.atleast_1d(code))
+        if trader_id is not None:
+            mask &= events["trader_id"] == trader_id
+        if order_id is not None:
+            mask &= events["order_id"] == order_id
+        if start is not None:
+            mask &= events["time"] >= start
+        if end is not None:
+            mask &= events["time"] < end
+        return events[mask]
+
+    def iter_events(self, **criteria) -> Iterator[Tuple]:
+        """
+        Iterate over events as ``(type, time, order_id, trader_id, price, volume)``.
+
+        Accepts the same keyword criteria as ``filter()``.
+        """
+        events = self.filter(**criteria) if criteria else self.to_numpy()
+        for code, *fields in events.tolist():
+            yield (EventType(code), *fields)
+
+    @staticmethod
+    def format(event) -> str:
+        """
+        Render one event as human-readable text.
+
+        Parameters:
+        -----------
+        event : numpy.void or tuple
+            A row of the log, or a tuple in field order.
+
+        Returns:
+        --------
+        str
+            The event description.
+        """
+        code, time, order_id, trader_id, price, volume = (
+            event.tolist() if isinstance(event, np.void) else event
+        )
+        code = EventType(code)
+        if code == EventType.TRADE:
+            side = 1 if volume > 0 else -1
+            return f"{abs(volume):g} @ {price:g}, AGG: {side}"
+        kind = "MKT" if price != price else f"LMT P: {price:g}"
+        return f"{kind} V: {volume:+g}, ORDER: {order_id}, FROM: {trader_id}"
+
+
+class MessageRecords:
+    """
+    Read-only list of ``(time, type, description)`` messages from an event log.
+
+    This is the shape ``msg_history`` has always had. Messages are formatted on
+    access and are not cached.
+    """
+
+    def __init__(self, log: EventLog) -> None:
+        self.log = log
+
+    def __len__(self) -> int:
+        return len(self.log)
+
+    def __bool__(self) -> bool:
+        return len(self.log) > 0
+
+    def __iter__(self) -> Iterator[Tuple[int, str, str]]:
+        for event in self.log.to_numpy().tolist():
+            yield self._message(event)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self._message(event) for event in self.log[index].tolist()]
+        return self._message(self.log[index].tolist())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (MessageRecords, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"MessageRecords(len={len(self)})"
+
+    @staticmethod
+    def _message(event: tuple) -> Tuple[int, str, str]:
+        return event[1], EventType(event[0]).name, EventLog.format(event)
@@ -0,0 +1,237 @@
+"""Streaming export of market histories to columnar files."""
+
+import glob
+import os
+from typing import Dict, Iterator, Optional, Sequence
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+STREAMS = ("trades", "events", "deltas")
+FORMATS = ("parquet", "npy")
+
+
+class StreamingExporter:
+    """
+    Writes a market's trades, events and book deltas to disk while it runs.
+
+    The exporter keeps one cursor per stream. At the end of every tick the
+    market calls ``flush()``, and each stream with at least ``row_group_size``
+    new rows writes them in groups of exactly that size; the remainder is
+    written when the run ends. Each stream is a directory under ``path``:
+
+    - ``"parquet"``: one ``part-NNNNNN.parquet`` file per run, written with one
+      row group per chunk. Requires ``pyarrow``.
+    - ``"npy"``: one ``part-NNNNNN.npy`` file per chunk, which can be
+      memory-mapped with ``numpy.load(..., mmap_mode="r")``.
+
+    The columns are the fields of ``market.trades``, ``market.events`` and
+    ``DepthSnapshots.DELTA_DTYPE``. Use ``iter_export()`` or ``read_export()``
+    to read them back. The exporter holds no rows itself; combine it with the
+    market's ``history_window`` to keep the market's memory flat as well.
+
+    Attributes:
+    -----------
+    path : str
+        The output directory.
+    streams : tuple of str
+        The exported streams, from ``STREAMS``.
+    row_group_size : int
+        The number of rows per written chunk.
+    format : str
+        The file format, one of ``FORMATS``.
+
+    Methods:
+    --------
+    attach(market)
+        Export the histories of ``market`` during its runs.
+    flush(final)
+        Write the complete chunks of new rows, or all of them if ``final``.
+    close()
+        Write the remaining rows and close the open files.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        streams: Sequence[str] = STREAMS,
+        row_group_size: int = 65536,
+        format: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize a new StreamingExporter.
+
+        Parameters:
+        -----------
+        path : str
+            The output directory. It is created if needed.
+        streams : sequence of str, optional
+            The streams to export (default is all of ``STREAMS``).
+        row_group_size : int, optional
+            The number of rows per written chunk (default is 65536).
+        format : str, optional
+            "parquet" or "npy" (default is "parquet" if ``pyarrow`` is
+            installed, else "npy").
+        """
+        unknown = set(streams) - set(STREAMS)
+        if unknown:
+            raise ValueError(f"Unknown streams {sorted(unknown)}.")
+        if row_group_size < 1:
+            raise ValueError("row_group_size must be at least 1.")
+        if format is None:
+            format = "npy" if pa is None else "parquet"
+        if format not in FORMATS:
+            raise ValueError(f"Unknown format {format!r}, expected one of {FORMATS}.")
+        if format == "parquet" and pa is None:
+            raise ImportError("The parquet format requires pyarrow.")
+        self.path = path
+        self.streams = tuple(streams)
+        self.row_group_size = row_group_size
+        self.format = format
+        self.market = None
+        self._cursors: Dict[str, int] = dict.fromkeys(self.streams, 0)
+        self._writers: Dict[str, "pq.ParquetWriter"] = {}
+        for stream in self.streams:
+            os.makedirs(os.path.join(path, stream), exist_ok=True)
+
+    def attach(self, market) -> "StreamingExporter":
+        """
+        Export the histories of ``market`` during its runs.
+
+        Rows recorded before attaching are exported with the first flush.
+
+        Parameters:
+        -----------
+        market : ContinuousDoubleAuction
+            The market to export.
+
+        Returns:
+        --------
+        StreamingExporter
+            The exporter itself.
+        """
+        self.market = market
+        market.exporters.append(self)
+        return self
+
+    def flush(self, final: bool = False) -> None:
+        """
+        Write the complete chunks of new rows of every stream.
+
+        Parameters:
+        -----------
+        final : bool, optional
+            Whether to also write the last, smaller chunk (default is False).
+        """
+        for stream in self.streams:
+            start = self._cursors[stream]
+            stop = self._length(stream)
+            if not final:
+                stop -= (stop - start) % self.row_group_size
+            for lo in range(start, stop, self.row_group_size):
+                hi = min(lo + self.row_group_size, stop)
+                self._write(stream, self._rows(stream, lo, hi))
+            self._cursors[stream] = stop
+
+    def close(self) -> None:
+        """Write the remaining rows and close the open files."""
+        self.flush(final=True)
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+
+    def _length(self, stream: str) -> int:
+        """Return the number of recorded rows of ``stream``."""
+        if stream == "deltas":
+            return len(self.market.ob_snapshots)
+        return len(getattr(self.market, stream))
+
+    def _rows(self, stream: str, start: int, stop: int) -> np.ndarray:
+        """Return rows ``start:stop`` of ``stream``."""
+        if stream == "deltas":
+            return self.market.ob_snapshots.delta_records(start, stop)
+        return getattr(self.market, stream)[start:stop]
+
+    def _write(self, stream: str, rows: np.ndarray) -> None:
+        """Write one chunk of ``stream``."""
+        directory = os.path.join(self.path, stream)
+        if self.format == "npy":
+            if len(rows):
+                np.save(_next_part(directory, ".npy"), rows)
+            return
+        table = pa.table({name: rows[name] for name in rows.dtype.names})
+        writer = self._writers.get(stream)
+        if writer is None:
+            writer = pq.ParquetWriter(_next_part(directory, ".parquet"), table.schema)
+            self._writers[stream] = writer
+        writer.write_table(table, row_group_size=self.row_group_size)
+
+
+def _next_part(directory: str, suffix: str) -> str:
+    """Return the path of the next part file in ``directory``."""
+    n = len(glob.glob(os.path.join(directory, f"part-*{suffix}")))
+    return os.path.join(directory, f"part-{n:06d}{suffix}")
+
+
+def iter_export(path: str, stream: str, mmap: bool = True) -> Iterator[np.ndarray]:
+    """
+    Iterate over the exported chunks of one stream.
+
+    Chunks are yielded one at a time, so a stream can be scanned without
+    loading it whole.
+
+    Parameters:
+    -----------
+    path : str
+        The exporter's output directory.
+    stream : str
+        The stream to read, from ``STREAMS``.
+    mmap : bool, optional
+        Whether to memory-map ``.npy`` chunks (default is True).
+
+    Yields:
+    -------
+    numpy.ndarray
+        One record array per ``.npy`` chunk or Parquet row group.
+    """
+    directory = os.path.join(path, stream)
+    for file in sorted(glob.glob(os.path.join(directory, "part-*"))):
+        if file.endswith(".npy"):
+            yield np.load(file, mmap_mode="r" if mmap else None)
+        elif file.endswith(".parquet"):
+            if pq is None:
+                raise ImportError("Reading parquet exports requires pyarrow.")
+            parquet = pq.ParquetFile(file)
+            for i in range(parquet.num_row_groups):
+                table = parquet.read_row_group(i)
+                yield np.rec.fromarrays(
+                    [column.to_numpy() for column in table.columns],
+                    names=table.column_names,
+                ).view(np.ndarray)
+
+
+def read_export(path: str, stream: str) -> np.ndarray:
+    """
+    Read one exported stream as a single record array.
+
+    Parameters:
+    -----------
+    path : str
+        The exporter's output directory.
+    stream : str
+        The stream to read, from ``STREAMS``.
+
+    Returns:
+    --------
+    numpy.ndarray
+        All exported rows of the stream, in recording order.
+    """
+    chunks = list(iter_export(path, stream, mmap=False))
+    if not chunks:
+        return np.empty(0)
+    return np.concatenate(chunks)
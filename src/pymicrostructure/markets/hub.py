@@ -0,0 +1,628 @@
+"""Multi-instrument markets with one participant registry."""
+
+from array import array
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+from pymicrostructure.markets.base import Market
+from pymicrostructure.markets.continuous import ContinuousDoubleAuction
+from pymicrostructure.markets.news import NewsProcess
+from pymicrostructure.markets.scheduler import Scheduler
+from pymicrostructure.markets.tape import FillRecords
+from pymicrostructure.orders.base import Order
+
+
+class InstrumentAccount:
+    """
+    A participant's position, cash and fills in one instrument of a hub.
+
+    Accounts are what the books of a ``MarketHub`` register as participants,
+    so the matching engine updates them in place of the trader. They share the
+    trader's ``active_orders`` and ``inactive_orders``, since order IDs are
+    unique across the hub.
+
+    Attributes:
+    -----------
+    trader : Trader
+        The participant the account belongs to.
+    trader_id : int
+        The participant's ID in the hub.
+    market : ContinuousDoubleAuction
+        The book of the instrument.
+    position : int or float
+        The position in the instrument.
+    cash : float
+        The cash spent and received trading the instrument.
+    fills : RecordBuffer
+        The fills as ``(trade, side)`` rows of the book's trade tape.
+    """
+
+    def __init__(self, trader: Any, book: ContinuousDoubleAuction) -> None:
+        """
+        Initialize an empty account.
+
+        Parameters:
+        -----------
+        trader : Trader
+            The participant the account belongs to.
+        book : ContinuousDoubleAuction
+            The book of the instrument.
+        """
+        self.trader = trader
+        self.trader_id: int = trader.trader_id
+        self.market = book
+        self.position = 0
+        self.cash = 0.0
+        self.fills = book.create_records(
+            [("trade", "i8"), ("side", "i1")], "fills", chunk_size=64
+        )
+        self.active_orders = trader.active_orders
+        self.inactive_orders = trader.inactive_orders
+
+    @property
+    def filled_trades(self) -> FillRecords:
+        """The account's fills as a list of dictionaries."""
+        return FillRecords(self.market.trades, self.fills)
+
+
+class InstrumentMarket:
+    """
+    One instrument of a hub, with the interface of a single-book market.
+
+    Traders written for a ``ContinuousDoubleAuction`` run unchanged in a hub
+    when they are created on an instrument market, e.g.
+    ``NoiseTrader(hub.market("A"))``. Their ``submit_order(orders)`` and
+    ``cancel_order(order)`` calls are routed through the hub, so they share the
+    hub's clock and order IDs, and they are registered and scheduled by the
+    hub. The instrument's book keeps the trader itself as its participant, so
+    the trader's own ``position``, ``cash`` and ``fills`` are those of the
+    instrument.
+
+    The run state (``current_tick``, ``duration`` and ``last_submission_time``)
+    is the hub's. Every other attribute, such as ``trades``, ``best_bid``,
+    ``top_of_book`` or ``news_history``, is read from the book.
+
+    Attributes:
+    -----------
+    hub : MarketHub
+        The hub the instrument belongs to.
+    instrument : str
+        The instrument name.
+    book : ContinuousDoubleAuction
+        The instrument's book.
+    """
+
+    def __init__(self, hub: "MarketHub", instrument: str) -> None:
+        """
+        Initialize a view of one instrument of a hub.
+
+        Parameters:
+        -----------
+        hub : MarketHub
+            The hub.
+        instrument : str
+            The instrument name.
+        """
+        self.hub = hub
+        self.instrument = instrument
+        self.book = hub.books[instrument]
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.book, name)
+
+    @property
+    def current_tick(self) -> int:
+        return self.hub.current_tick
+
+    @property
+    def duration(self) -> Optional[int]:
+        return self.hub.duration
+
+    @property
+    def last_submission_time(self) -> float:
+        return self.hub.last_submission_time
+
+    @property
+    def deferred_participants(self) -> Optional[List[Any]]:
+        return self.hub.deferred_participants
+
+    def deferred_registration(self):
+        """Defer registration in the hub; see ``Market.deferred_registration``."""
+        return self.hub.deferred_registration()
+
+    def register_participant(self, trader: Any) -> int:
+        """Register a trader in the hub and bind it to this instrument."""
+        return self.hub.register_participant(trader)
+
+    def spawn_rng(self) -> np.random.Generator:
+        return self.hub.spawn_rng()
+
+    def create_history(self, name: str, items: Optional[List[Any]] = None):
+        return self.hub.create_history(name, items)
+
+    def create_records(self, dtype: Any, name: str, chunk_size: int = 4096):
+        return self.hub.create_records(dtype, name, chunk_size)
+
+    def submit_order(self, orders: Union[Order, List[Order]]) -> None:
+        """Submit one or more orders to the instrument through the hub."""
+        self.hub.submit_order(self.instrument, orders)
+
+    def submit_orders(self, orders: Sequence[Order]) -> None:
+        """Submit a batch of orders to the instrument through the hub."""
+        self.hub.submit_orders(self.instrument, orders)
+
+    def cancel_order(self, order: Order) -> None:
+        """Cancel a resting order through the hub."""
+        self.hub.cancel_order(order)
+
+
+class MarketHub(Market):
+    """
+    A set of instruments, each with its own order book, sharing one set of traders.
+
+    Every instrument is a ``ContinuousDoubleAuction`` with its own columnar
+    histories (trade tape, message log, snapshots and top of book). Traders are
+    created with the hub as their market and are registered once. They send
+    orders with ``submit_order(instrument, orders)`` and cancel them with
+    ``cancel_order(order)``, which finds the instrument from the order ID. The
+    hub keeps one clock and one order ID sequence, so event times and order IDs
+    are comparable across instruments.
+
+    A trader's position, cash and fills are kept per instrument in an
+    ``InstrumentAccount``, created when the trader first sends an order to the
+    instrument. ``positions(trader)`` and ``position_matrix()`` collect them.
+    The ``position`` and ``cash`` attributes of a trader created on the hub
+    itself are not used and stay at zero.
+
+    Single-instrument traders, including all the built-in ones, are created on
+    an instrument's market instead, ``market(instrument)``. That market has the
+    usual ``submit_order(orders)`` interface, and the trader is its own account
+    in the instrument (see ``InstrumentMarket``).
+
+    ``run()`` drives all traders from one scheduler. Orders are matched as they
+    arrive, so only the books that receive orders do matching and snapshot
+    work; the end-of-tick work (tick snapshots and trade and top-of-book
+    notifications) also only looks at the books touched during the tick.
+
+    Attributes:
+    -----------
+    instruments : list of str
+        The instrument names, in creation order.
+    books : dict
+        Maps instrument names to their ``ContinuousDoubleAuction``.
+    initial_fair_price : int
+        The fair price traders start from.
+    scheduler : Scheduler
+        Decides which traders act on each tick.
+    news_process : NewsProcess or None
+        The news process of every instrument, or None for no news.
+    reference_prices : dict
+        Reference prices of instruments simulated elsewhere, keyed by name.
+        A ``PartitionedHub`` refreshes them at every barrier; traders may read
+        them to follow instruments outside their own partition.
+    current_tick : int
+        The current tick.
+    duration : int or None
+        The number of ticks of the last run.
+
+    Methods:
+    --------
+    market(instrument)
+        Return the single-book market view of an instrument.
+    submit_order(instrument, orders)
+        Route one or more orders to an instrument's book.
+    submit_orders(instrument, orders)
+        Route a batch of orders to an instrument's book.
+    cancel_order(order)
+        Cancel a resting order in whichever book it rests.
+    account(trader, instrument)
+        Return a trader's account in an instrument.
+    positions(trader)
+        Return a trader's position in every instrument it traded.
+    position_matrix()
+        Return the positions of all traders in all instruments.
+    mark_prices()
+        Return the mark price of every instrument.
+    run(ticks)
+        Run all instruments for a number of ticks.
+    start(ticks), step(), finish()
+        Drive a run one tick at a time.
+    """
+
+    def __init__(
+        self,
+        instruments: Union[Sequence[str], Mapping[str, int]],
+        initial_fair_price: int = 100,
+        keyframe_interval: int = 100,
+        depth_levels: int = 5,
+        recording: str = "full",
+        record_every: int = 1,
+        history_window: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+        seed: Optional[int] = None,
+        news_process: Optional[NewsProcess] = None,
+    ) -> None:
+        """
+        Initialize a new MarketHub.
+
+        Parameters:
+        -----------
+        instruments : sequence of str or dict
+            The instrument names, or a mapping from names to the initial fair
+            price of each book.
+        initial_fair_price : int, optional
+            The fair price traders start from, and the initial fair price of
+            books not given one in ``instruments`` (default is 100).
+        keyframe_interval : int, optional
+            The snapshot keyframe interval of every book (default is 100).
+        depth_levels : int, optional
+            The top-of-book depth of every book (default is 5).
+        recording : str, optional
+            The recording policy of every book (default is "full").
+        record_every : int, optional
+            The snapshot interval for the "every_k" policy (default is 1).
+        history_window : int, optional
+            The number of recent entries or rows each history keeps in memory
+            (default is no limit).
+        spill_dir : str, optional
+            The directory spilled chunks are written under (default is the system
+            temporary directory).
+        seed : int, optional
+            The seed of the hub's random streams. Books and traders draw from
+            child streams of it (default is fresh OS entropy).
+        news_process : NewsProcess, optional
+            Generates the news of every instrument, each from the book's own
+            random stream (default is no news).
+        """
+        super().__init__(history_window, spill_dir, seed)
+        if not isinstance(instruments, Mapping):
+            if len(instruments) != len(set(instruments)):
+                raise ValueError("Instrument names must be unique.")
+            instruments = dict.fromkeys(instruments, initial_fair_price)
+        self.instruments: List[str] = list(instruments)
+        self.books: Dict[str, ContinuousDoubleAuction] = {}
+        for instrument, fair_price in instruments.items():
+            self.books[instrument] = ContinuousDoubleAuction(
+                initial_fair_price=fair_price,
+                keyframe_interval=keyframe_interval,
+                depth_levels=depth_levels,
+                recording=recording,
+                record_every=record_every,
+                history_window=history_window,
+                spill_dir=spill_dir,
+                seed=int(self.seed_sequence.spawn(1)[0].generate_state(1)[0]),
+            )
+        self._markets: Dict[str, InstrumentMarket] = {}
+        self._instrument_index: Dict[str, int] = {
+            instrument: i for i, instrument in enumerate(self.instruments)
+        }
+        # The instrument index of every order ID, 4 bytes per order.
+        self._order_instruments = array("i")
+        self._next_order_id: int = 0
+        # Books touched in the current tick, with their trade count and best
+        # prices before the first touch.
+        self._touched: Dict[str, Tuple[int, Tuple[Any, Any]]] = {}
+        self.initial_fair_price: int = initial_fair_price
+        self.news_process: Optional[NewsProcess] = news_process
+        self.reference_prices: Dict[str, float] = {}
+        self.current_tick: int = 0
+        self.duration: Optional[int] = None
+        self.scheduler: Scheduler = Scheduler(self.spawn_rng())
+        self._tick: int = 0
+        self._watch_trades: bool = False
+        self._watch_top: bool = False
+
+    def __getitem__(self, instrument: str) -> ContinuousDoubleAuction:
+        return self.books[instrument]
+
+    def __len__(self) -> int:
+        return len(self.instruments)
+
+    def market(self, instrument: str) -> InstrumentMarket:
+        """
+        Return the single-book market view of an instrument.
+
+        Parameters:
+        -----------
+        instrument : str
+            The instrument name.
+
+        Returns:
+        --------
+        InstrumentMarket
+            The view traders of a single instrument are created on.
+        """
+        market = self._markets.get(instrument)
+        if market is None:
+            market = self._markets[instrument] = InstrumentMarket(self, instrument)
+        return market
+
+    def register_participant(self, trader: Any) -> int:
+        """
+        Register a trader in the hub.
+
+        Traders created on an instrument's market also become their own
+        account in that instrument's book.
+
+        Parameters:
+        -----------
+        trader : Trader
+            The trader to register.
+
+        Returns:
+        --------
+        int
+            The trader ID assigned to the trader.
+        """
+        trader_id = super().register_participant(trader)
+        trader.trader_id = trader_id
+        self._bind(trader)
+        return trader_id
+
+    def register_participants(self, traders: Iterable[Any]) -> List[int]:
+        """
+        Register several traders in the hub at once.
+
+        See ``Market.register_participants`` and ``register_participant``.
+        """
+        traders = list(traders)
+        trader_ids = super().register_participants(traders)
+        for trader in traders:
+            self._bind(trader)
+        return trader_ids
+
+    def _is_own(self, trader: Any) -> bool:
+        """Whether ``trader`` was created on the hub or one of its instruments."""
+        market = trader.market
+        return market is self or (
+            isinstance(market, InstrumentMarket) and market.hub is self
+        )
+
+    def _bind(self, trader: Any) -> None:
+        """Make a trader of an instrument's market its own account in the book."""
+        market = getattr(trader, "market", None)
+        if isinstance(market, InstrumentMarket):
+            book = market.book
+            book.participants_by_id[trader.trader_id] = trader
+            book.participants.append(trader)
+
+    def submit_order(self, instrument: str, orders: Union[Order, List[Order]]) -> None:
+        """
+        Route one or more orders to an instrument's book.
+
+        Parameters:
+        -----------
+        instrument : str
+            The instrument to trade.
+        orders : Order or list of Order
+            A single order, or a list submitted as one batch.
+        """
+        self.submit_orders(instrument, orders if isinstance(orders, list) else [orders])
+
+    def submit_orders(self, instrument: str, orders: Sequence[Order]) -> None:
+        """
+        Route a batch of orders to an instrument's book.
+
+        The batch is submitted with ``ContinuousDoubleAuction.submit_orders``,
+        at the next time of the hub's clock and with order IDs from the hub's
+        sequence.
+
+        Parameters:
+        -----------
+        instrument : str
+            The instrument to trade.
+        orders : sequence of Order
+            The orders to submit, in priority order.
+        """
+        book = self._touch(instrument)
+        accounts = book.participants_by_id
+        for order in orders:
+            if order.trader_id not in accounts:
+                self.account(order.trader_id, instrument)
+        book.last_submission_time = self.last_submission_time
+        book._next_order_id = self._next_order_id
+        book.submit_orders(orders)
+        self.last_submission_time = book.last_submission_time
+        self._order_instruments.extend(
+            [self._instrument_index[instrument]]
+            * (book._next_order_id - self._next_order_id)
+        )
+        self._next_order_id = book._next_order_id
+
+    def cancel_order(self, order: Order) -> None:
+        """
+        Cancel a resting order in whichever book it rests.
+
+        Parameters:
+        -----------
+        order : Order
+            The order to cancel.
+        """
+        if order.id is None or not 0 <= order.id < self._next_order_id:
+            return
+        instrument = self.instruments[self._order_instruments[order.id]]
+        book = self._touch(instrument)
+        book.last_submission_time = self.last_submission_time
+        book.cancel_order(order)
+
+    def account(self, trader: Any, instrument: str) -> InstrumentAccount:
+        """
+        Return a trader's account in an instrument, creating it if needed.
+
+        Parameters:
+        -----------
+        trader : Trader or int
+            The trader or its ID.
+        instrument : str
+            The instrument.
+
+        Returns:
+        --------
+        InstrumentAccount or Trader
+            The trader's position, cash and fills in the instrument. A trader
+            created on the instrument's market is its own account.
+        """
+        if not hasattr(trader, "trader_id"):
+            trader = self.get_participant(trader)
+        book = self.books[instrument]
+        account = book.participants_by_id.get(trader.trader_id)
+        if account is None:
+            account = InstrumentAccount(trader, book)
+            book.participants_by_id[trader.trader_id] = account
+            book.participants.append(account)
+        return account
+
+    def positions(self, trader: Any) -> Dict[str, Union[int, float]]:
+        """
+        Return a trader's position in every instrument it traded.
+
+        Parameters:
+        -----------
+        trader : Trader or int
+            The trader or its ID.
+
+        Returns:
+        --------
+        dict
+            Maps instruments to positions, for instruments the trader has an
+            account in.
+        """
+        trader_id = getattr(trader, "trader_id", trader)
+        return {
+            instrument: book.participants_by_id[trader_id].position
+            for instrument, book in self.books.items()
+            if trader_id in book.participants_by_id
+        }
+
+    def position_matrix(self) -> pd.DataFrame:
+        """
+        Return the positions of all traders in all instruments.
+
+        Returns:
+        --------
+        pandas.DataFrame
+            One row per trader ID and one column per instrument, with 0 where a
+            trader has no account.
+        """
+        positions = np.zeros((len(self.participants_by_id), len(self.instruments)))
+        for column, book in enumerate(self.books.values()):
+            for trader_id, account in book.participants_by_id.items():
+                positions[trader_id, column] = account.position
+        return pd.DataFrame(
+            positions,
+            index=pd.Index(list(self.participants_by_id), name="trader_id"),
+            columns=self.instruments,
+        )
+
+    def mark_prices(self) -> np.ndarray:
+        """
+        Return the mark price of every instrument.
+
+        Returns:
+        --------
+        numpy.ndarray
+            The books' mark prices, in the order of ``instruments``.
+        """
+        return np.array([book.mark_price for book in self.books.values()], dtype=float)
+
+    def run(self, ticks: int = 10, progress: bool = True) -> None:
+        """
+        Run all instruments for a number of ticks.
+
+        On each tick, the scheduler wakes the traders that are due and calls
+        their ``update()`` method. Traders listening for trades or top-of-book
+        changes are woken on the tick after one occurs in any instrument.
+        ``run(ticks)`` is ``start(ticks)``, ``ticks`` calls of ``step()`` and
+        ``finish()``; drivers that exchange data between ticks call those
+        directly.
+
+        Parameters:
+        -----------
+        ticks : int, optional
+            The number of ticks to run (default is 10).
+        progress : bool, optional
+            Whether to show a progress bar (default is True).
+        """
+        self.start(ticks)
+        for _ in tqdm(range(ticks), disable=not progress):
+            self.step()
+        self.finish()
+
+    def start(self, ticks: int) -> None:
+        """
+        Prepare a run of ``ticks`` ticks: schedule the traders and generate news.
+
+        Parameters:
+        -----------
+        ticks : int
+            The number of ticks of the run.
+        """
+        self.duration = ticks
+        self._tick = 0
+        scheduler = self.scheduler
+        for participant in self.participants:
+            scheduler.add(participant)
+        self._watch_trades = scheduler.watching("trade")
+        self._watch_top = scheduler.watching("top_of_book")
+        if self.news_process is not None:
+            for book in self.books.values():
+                book.news_history.extend(self.news_process.generate(ticks, book.rng))
+
+    def step(self) -> None:
+        """Run the next tick of the run prepared by ``start()``."""
+        self.current_tick = self._tick
+        self._tick += 1
+        if self.news_process is not None:
+            for book in self.books.values():
+                book.news_history.advance()
+
+        scheduler = self.scheduler
+        for participant in scheduler.advance():
+            participant.update()
+
+        traded = moved = False
+        for instrument, (n_trades, top) in self._touched.items():
+            book = self.books[instrument]
+            traded = traded or len(book.trades) > n_trades
+            moved = moved or (
+                (book.bid_book.best_price, book.ask_book.best_price) != top
+            )
+            if (
+                book.recording == "tick"
+                and book.last_submission_time > book._snapshot_time
+            ):
+                book.save_ob_state()
+        self._touched.clear()
+        if self._watch_trades and traded:
+            scheduler.notify("trade")
+        if self._watch_top and moved:
+            scheduler.notify("top_of_book")
+
+    def finish(self) -> None:
+        """Mark the run prepared by ``start()`` as completed."""
+        for book in self.books.values():
+            book.duration = self.duration
+            book.completed = True
+        self.completed = True
+
+    def _touch(self, instrument: str) -> ContinuousDoubleAuction:
+        """Return an instrument's book, noting its state on the first touch of a tick."""
+        book = self.books[instrument]
+        if instrument not in self._touched:
+            self._touched[instrument] = (
+                len(book.trades),
+                (book.bid_book.best_price, book.ask_book.best_price),
+            )
+            book.current_tick = self.current_tick
+        return book
@@ -0,0 +1,298 @@
+"""News processes and the market's news history."""
+
+from abc import ABC, abstractmethod
+from typing import Iterable, Iterator, Optional, Sequence, Union
+import numpy as np
+
+
+class NewsProcess(ABC):
+    """
+    Abstract base class for news processes.
+
+    A news process generates the news of a whole simulation at once, as one
+    integer per tick: positive for good news, negative for bad news and 0 for
+    no news. Processes may keep state between calls, so consecutive calls
+    continue the same path.
+    """
+
+    @abstractmethod
+    def generate(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        """
+        Generate the news of the next ``n`` ticks.
+
+        Parameters:
+        -----------
+        n : int
+            The number of ticks.
+        rng : numpy.random.Generator
+            The market's random generator.
+
+        Returns:
+        --------
+        numpy.ndarray
+            An integer array of length ``n`` with the net news of each tick.
+        """
+
+
+def _signs(rng: np.random.Generator, good_prob, n: int) -> np.ndarray:
+    """Draw ``n`` news signs, +1 with probability ``good_prob`` and -1 otherwise."""
+    return np.where(rng.random(n) < good_prob, 1, -1)
+
+
+class BernoulliNews(NewsProcess):
+    """
+    At most one piece of news per tick, arriving with a fixed probability.
+
+    This is the market's default news process.
+
+    Parameters:
+    -----------
+    arrival_rate : float, optional
+        The probability of news on each tick (default is 0.1).
+    good_prob : float, optional
+        The probability that news is good (default is 0.5).
+    """
+
+    def __init__(self, arrival_rate: float = 0.1, good_prob: float = 0.5) -> None:
+        self.arrival_rate = arrival_rate
+        self.good_prob = good_prob
+
+    def generate(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        arrivals = rng.random(n) < self.arrival_rate
+        return np.where(arrivals, _signs(rng, self.good_prob, n), 0)
+
+
+class PoissonNews(NewsProcess):
+    """
+    A Poisson number of news items per tick, each good or bad independently.
+
+    The news of a tick is the number of good items minus the number of bad ones.
+
+    Parameters:
+    -----------
+    rate : float, optional
+        The expected number of news items per tick (default is 0.1).
+    good_prob : float, optional
+        The probability that an item is good (default is 0.5).
+    """
+
+    def __init__(self, rate: float = 0.1, good_prob: float = 0.5) -> None:
+        self.rate = rate
+        self.good_prob = good_prob
+
+    def generate(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        counts = rng.poisson(self.rate, n)
+        good = rng.binomial(counts, self.good_prob)
+        return 2 * good - counts
+
+
+class HawkesNews(NewsProcess):
+    """
+    Self-exciting news: every item can trigger follow-up items of the same sign.
+
+    Items arrive in continuous time. Background items arrive at ``baseline``
+    per tick; each item then triggers a Poisson number of follow-ups with mean
+    ``excitation``, delayed by exponential times with rate ``decay``, which can
+    trigger follow-ups in turn. The path is simulated one generation at a time
+    and binned into ticks. Follow-ups that would fall after the last tick of a
+    call are dropped.
+
+    Parameters:
+    -----------
+    baseline : float, optional
+        The rate of background items per tick (default is 0.05).
+    excitation : float, optional
+        The expected number of follow-ups per item, below 1 (default is 0.5).
+    decay : float, optional
+        The rate of the exponential follow-up delay, per tick (default is 0.5).
+    good_prob : float, optional
+        The probability that a background item is good (default is 0.5).
+    """
+
+    def __init__(
+        self,
+        baseline: float = 0.05,
+        excitation: float = 0.5,
+        decay: float = 0.5,
+        good_prob: float = 0.5,
+    ) -> None:
+        if not 0 <= excitation < 1:
+            raise ValueError("excitation must be in [0, 1) for a stable process.")
+        if decay <= 0:
+            raise ValueError("decay must be positive.")
+        self.baseline = baseline
+        self.excitation = excitation
+        self.decay = decay
+        self.good_prob = good_prob
+
+    def generate(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        times = rng.uniform(0, n, rng.poisson(self.baseline * n))
+        signs = _signs(rng, self.good_prob, len(times))
+        all_times, all_signs = [times], [signs]
+        while len(times):
+            parents = np.repeat(
+                np.arange(len(times)), rng.poisson(self.excitation, len(times))
+            )
+            times = times[parents] + rng.exponential(1 / self.decay, len(parents))
+            signs = signs[parents]
+            keep = times < n
+            times, signs = times[keep], signs[keep]
+            all_times.append(times)
+            all_signs.append(signs)
+        ticks = np.concatenate(all_times).astype(np.int64)
+        news = np.bincount(ticks, weights=np.concatenate(all_signs), minlength=n)
+        return news.astype(np.int64)
+
+
+class RegimeSwitchingNews(NewsProcess):
+    """
+    Bernoulli news whose arrival rate and tone depend on a hidden regime.
+
+    On each tick the regime moves to the next one (cyclically) with probability
+    ``switch_prob``. With two regimes this is a symmetric two-state Markov
+    chain, for example a calm and a turbulent news regime. The current regime
+    carries over between calls.
+
+    Parameters:
+    -----------
+    arrival_rates : sequence of float, optional
+        The news probability per tick in each regime (default is (0.02, 0.3)).
+    good_probs : sequence of float, optional
+        The probability of good news in each regime (default is 0.5 in all).
+    switch_prob : float, optional
+        The probability of a regime switch on each tick (default is 0.01).
+
+    Attributes:
+    -----------
+    regime : int
+        The regime at the end of the last generated path.
+    """
+
+    def __init__(
+        self,
+        arrival_rates: Sequence[float] = (0.02, 0.3),
+        good_probs: Optional[Sequence[float]] = None,
+        switch_prob: float = 0.01,
+    ) -> None:
+        self.arrival_rates = np.asarray(arrival_rates, dtype=float)
+        if good_probs is None:
+            good_probs = [0.5] * len(self.arrival_rates)
+        self.good_probs = np.asarray(good_probs, dtype=float)
+        if self.good_probs.shape != self.arrival_rates.shape:
+            raise ValueError("arrival_rates and good_probs must have equal length.")
+        self.switch_prob = switch_prob
+        self.regime = 0
+
+    def generate(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        switches = np.cumsum(rng.random(n) < self.switch_prob)
+        regimes = (self.regime + switches) % len(self.arrival_rates)
+        if n:
+            self.regime = int(regimes[-1])
+        arrivals = rng.random(n) < self.arrival_rates[regimes]
+        return np.where(arrivals, _signs(rng, self.good_probs[regimes], n), 0)
+
+
+class NewsHistory:
+    """
+    The news revealed so far, backed by a pre-generated path.
+
+    The market generates the news of a run up front and reveals one value per
+    tick with ``advance()``. Indexing, iteration and ``len()`` only see the
+    revealed values, as with a list. A running sum is stored next to the
+    values, so ``window_sum()`` and ``window_mean()`` take constant time.
+
+    Methods:
+    --------
+    extend(path)
+        Append a generated path to be revealed later.
+    advance()
+        Reveal the next value.
+    window_sum(window)
+        Return the sum of the last ``window`` revealed values.
+    window_mean(window)
+        Return ``window_sum(window) / window``.
+    to_numpy()
+        Return the revealed values as an array.
+    """
+
+    def __init__(self, values: Optional[Iterable[int]] = None) -> None:
+        """
+        Initialize a history.
+
+        Parameters:
+        -----------
+        values : iterable of int, optional
+            Initial values, revealed immediately.
+        """
+        self._values = np.zeros(0, dtype=np.int64)
+        self._cumsum = np.zeros(1, dtype=np.int64)
+        self._revealed = 0
+        if values is not None:
+            self.extend(np.fromiter(values, dtype=np.int64))
+            self._revealed = len(self._values)
+
+    def __len__(self) -> int:
+        return self._revealed
+
+    def __bool__(self) -> bool:
+        return self._revealed > 0
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.to_numpy().tolist())
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return self.to_numpy()[index].tolist()
+        if index < 0:
+            index += self._revealed
+        if not 0 <= index < self._revealed:
+            raise IndexError("news index out of range")
+        return int(self._values[index])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (NewsHistory, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"NewsHistory(len={len(self)}, pending={self.pending})"
+
+    @property
+    def pending(self) -> int:
+        """The number of generated values not revealed yet."""
+        return len(self._values) - self._revealed
+
+    def extend(self, path: np.ndarray) -> None:
+        """
+        Append a generated path to be revealed later.
+
+        Parameters:
+        -----------
+        path : numpy.ndarray
+            The news of the coming ticks.
+        """
+        path = np.asarray(path, dtype=np.int64)
+        self._values = np.concatenate((self._values, path))
+        self._cumsum = np.concatenate(
+            (self._cumsum, self._cumsum[-1] + np.cumsum(path))
+        )
+
+    def advance(self) -> int:
+        """Reveal the next value and return it."""
+        if not self.pending:
+            raise IndexError("no generated news left to reveal")
+        self._revealed += 1
+        return int(self._values[self._revealed - 1])
+
+    def window_sum(self, window: int) -> int:
+        """Return the sum of the last ``window`` revealed values."""
+        n = self._revealed
+        return int(self._cumsum[n] - self._cumsum[max(n - window, 0)])
+
+    def window_mean(self, window: int) -> float:
+        """Return the sum of the last ``window`` revealed values over ``window``."""
+        return self.window_sum(window) / window
+
+    def to_numpy(self) -> np.ndarray:
+        """Return the revealed values as an array."""
+        return self._values[: self._revealed]
@@ -0,0 +1,307 @@
+"""Opt-in phase timers and stack sampling for market runs."""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import pandas as pd
+
+PHASES = ("update", "insert", "match", "snapshot", "log", "cancel")
+
+
+class PhaseTimer:
+    """
+    Cumulative wall-clock time of the phases of a market run.
+
+    Attaching a timer wraps the methods that implement each phase on the
+    market, its books, its message log and its participants, so a market
+    without a timer runs its plain methods and pays nothing. Each wrapper adds
+    one ``time.perf_counter_ns`` reading on entry and one on exit.
+
+    Times are exclusive: a phase called from inside another (for example, the
+    message log written while matching) is charged to the inner phase only, so
+    the phases add up to at most the duration of the run.
+
+    The phases are:
+
+    - ``"update"``: the participants' ``update()`` methods, i.e. trading logic.
+    - ``"insert"``: order submission and insertion into the book.
+    - ``"match"``: matching, market-order sweeps, trade execution and batch
+      auction clearing.
+    - ``"snapshot"``: recording the book state.
+    - ``"log"``: writing the message log.
+    - ``"cancel"``: cancelling orders.
+
+    Attributes:
+    -----------
+    market : ContinuousDoubleAuction or None
+        The market the timer is attached to.
+    elapsed_ns : dict
+        The cumulative exclusive time of each phase, in nanoseconds.
+    calls : dict
+        The number of timed calls of each phase.
+
+    Methods:
+    --------
+    attach(market)
+        Time the phases of ``market``.
+    detach()
+        Restore the market's plain methods.
+    reset()
+        Zero the accumulated times.
+    report()
+        Return the times as a DataFrame.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a new, unattached PhaseTimer."""
+        self.market = None
+        self.elapsed_ns: Dict[str, int] = dict.fromkeys(PHASES, 0)
+        self.calls: Dict[str, int] = dict.fromkeys(PHASES, 0)
+        # Time spent in nested timed calls, one entry per open call.
+        self._stack: List[int] = []
+        self._patched: List[Tuple[Any, str, Optional[Callable]]] = []
+
+    def attach(self, market) -> "PhaseTimer":
+        """
+        Time the phases of ``market``.
+
+        Attach after the participants are created; participants registered
+        later are not timed.
+
+        Parameters:
+        -----------
+        market : ContinuousDoubleAuction
+            The market to time.
+
+        Returns:
+        --------
+        PhaseTimer
+            The timer itself.
+        """
+        if self.market is not None:
+            self.detach()
+        self.market = market
+        targets = [
+            (market, "submit_orders", "insert"),
+            (market.bid_book, "add_many", "insert"),
+            (market.ask_book, "add_many", "insert"),
+            (market, "match_orders", "match"),
+            (market, "_sweep", "match"),
+            (market, "execute_trade", "match"),
+            (market, "_record_submission", "snapshot"),
+            (market, "save_ob_state", "snapshot"),
+            (market.events, "record", "log"),
+            (market, "cancel_order", "cancel"),
+        ]
+        if hasattr(market, "clear"):
+            targets.append((market, "clear", "match"))
+        targets += [
+            (participant, "update", "update") for participant in market.participants
+        ]
+        for owner, name, phase in targets:
+            self._wrap(owner, name, phase)
+        return self
+
+    def detach(self) -> None:
+        """Restore the market's plain methods."""
+        for owner, name, original in reversed(self._patched):
+            if original is None:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+        self._patched = []
+        self.market = None
+
+    def reset(self) -> None:
+        """Zero the accumulated times and call counts."""
+        for phase in PHASES:
+            self.elapsed_ns[phase] = 0
+            self.calls[phase] = 0
+
+    @property
+    def total_ns(self) -> int:
+        """The time spent in all phases, in nanoseconds."""
+        return sum(self.elapsed_ns.values())
+
+    def report(self) -> pd.DataFrame:
+        """
+        Return the accumulated times.
+
+        Returns:
+        --------
+        pandas.DataFrame
+            One row per phase with its ``calls``, its total time ``total_ns``,
+            its ``mean_ns`` per call and its ``share`` of the timed total.
+        """
+        report = pd.DataFrame(
+            {
+                "calls": pd.Series(self.calls),
+                "total_ns": pd.Series(self.elapsed_ns),
+            }
+        ).rename_axis("phase")
+        report["mean_ns"] = report["total_ns"] / report["calls"].where(
+            report["calls"] > 0
+        )
+        report["share"] = report["total_ns"] / max(self.total_ns, 1)
+        return report
+
+    def _wrap(self, owner: Any, name: str, phase: str) -> None:
+        """Replace ``owner.name`` with a timed wrapper charged to ``phase``."""
+        method = getattr(owner, name)
+        elapsed, calls, stack = self.elapsed_ns, self.calls, self._stack
+        clock = time.perf_counter_ns
+
+        def timed(*args, **kwargs):
+            stack.append(0)
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                duration = clock() - start
+                elapsed[phase] += duration - stack.pop()
+                calls[phase] += 1
+                if stack:
+                    stack[-1] += duration
+
+        self._patched.append((owner, name, vars(owner).get(name)))
+        setattr(owner, name, timed)
+
+
+class StackSampler:
+    """
+    Samples the Python stack of a thread at a fixed interval.
+
+    A background thread reads the sampled thread's current frame every
+    ``interval`` seconds and counts each distinct stack, so the cost is set
+    by the sampling rate and not by the number of calls. The counts are
+    written as collapsed stacks (one ``frame;frame;... count`` line per stack,
+    root first), the input format of flamegraph tools such as
+    ``flamegraph.pl``, inferno and speedscope.
+
+    Use it as a context manager around a run:
+
+    >>> with StackSampler(interval=0.005) as sampler:
+    ...     market.run(1000)
+    >>> sampler.write("run.collapsed")
+
+    Attributes:
+    -----------
+    interval : float
+        The time between samples, in seconds.
+    stacks : collections.Counter
+        The number of samples of each stack, keyed by tuples of frame labels.
+    samples : int
+        The number of samples taken.
+
+    Methods:
+    --------
+    start()
+        Start sampling the calling thread.
+    stop()
+        Stop sampling.
+    collapsed()
+        Return the samples as collapsed-stack lines.
+    write(path)
+        Write the collapsed stacks to a file.
+    """
+
+    def __init__(self, interval: float = 0.01) -> None:
+        """
+        Initialize a new StackSampler.
+
+        Parameters:
+        -----------
+        interval : float, optional
+            The time between samples, in seconds (default is 0.01).
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive.")
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._target: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "StackSampler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Start sampling the calling thread."""
+        if self._thread is not None:
+            return
+        self._target = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="StackSampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def collapsed(self) -> List[str]:
+        """
+        Return the samples as collapsed-stack lines.
+
+        Returns:
+        --------
+        list of str
+            One ``frame;frame;... count`` line per stack, root frame first,
+            most sampled stacks first.
+        """
+        return [
+            f"{';'.join(stack)} {count}" for stack, count in self.stacks.most_common()
+        ]
+
+    def write(self, path: str) -> None:
+        """
+        Write the collapsed stacks to a file.
+
+        Parameters:
+        -----------
+        path : str
+            The output file.
+        """
+        with open(path, "w") as file:
+            for line in self.collapsed():
+                file.write(line + "\n")
+
+    def _run(self) -> None:
+        """Take samples until stopped."""
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+            self.stacks[_stack_labels(frame)] += 1
+            self.samples += 1
+
+
+def _stack_labels(frame) -> Tuple[str, ...]:
+    """Label the frames of a stack, root first."""
+    labels = []
+    while frame is not None:
+        code = frame.f_code
+        if code.co_name == "timed" and code.co_filename == __file__:
+            # Phase timer wrappers would double the depth of every stack.
+            frame = frame.f_back
+            continue
+        label = (
+            f"{os.path.basename(code.co_filename)}:"
+            f"{getattr(code, 'co_qualname', code.co_name)}"
+        )
+        labels.append(label.replace(";", ":").replace(" ", "_"))
+        frame = frame.f_back
+    return tuple(reversed(labels))
@@ -0,0 +1,273 @@
+"""Replay of recorded order book events into a fresh market."""
+
+from typing import Any
+import numpy as np
+from pymicrostructure.markets.continuous import ContinuousDoubleAuction
+from pymicrostructure.markets.events import EventLog, EventType, MessageRecords
+from pymicrostructure.markets.scheduler import ArrivalProcess
+from pymicrostructure.orders.limit import LimitOrder
+from pymicrostructure.orders.market import MarketOrder
+from pymicrostructure.traders.base import Trader
+
+ADD, CANCEL, TRADE, REJECT = (int(code) for code in EventType)
+
+
+def _event_rows(events: Any) -> np.ndarray:
+    """Return the rows of an event log, message history or event array."""
+    if isinstance(events, MessageRecords):
+        events = events.log
+    if isinstance(events, EventLog):
+        events = events.to_numpy()
+    events = np.asarray(events)
+    missing = {"code", "time", "order_id", "trader_id", "price", "volume"} - set(
+        events.dtype.names or ()
+    )
+    if missing:
+        raise ValueError(f"Event rows are missing the fields {sorted(missing)}.")
+    return events
+
+
+class Replay:
+    """
+    Rebuilds a market from its recorded message log.
+
+    The ADD events of each submission are resubmitted as one batch, with the
+    original order IDs and event time, and CANCEL events cancel the same
+    orders, so the fresh market's matching engine re-derives every trade
+    without running any trader logic. Each trader of the recording is replaced
+    by a passive ``Trader`` with the same ID, which accumulates the same
+    position, cash and fills.
+
+    The replayed market records with its own recording policy, so metrics can
+    be recomputed at a different snapshot granularity than the original run.
+    With ``verify``, the trades of each batch are compared with the recorded
+    TRADE events and a mismatch raises ``ValueError``.
+
+    The recording must have been made with the "full", "tick" or "every_k"
+    policy, since the other policies do not keep a message log.
+
+    Attributes:
+    -----------
+    market : ContinuousDoubleAuction
+        The market the events are replayed into.
+    events : numpy.ndarray
+        The recorded event rows.
+    position : int
+        The number of event rows replayed so far.
+    verify : bool
+        Whether re-derived trades are checked against the recorded ones.
+
+    Methods:
+    --------
+    replay_until(time)
+        Replay every event up to and including event time ``time``.
+    run()
+        Replay all remaining events.
+    """
+
+    def __init__(
+        self,
+        events: Any,
+        initial_fair_price: int = 100,
+        keyframe_interval: int = 100,
+        depth_levels: int = 5,
+        recording: str = "full",
+        record_every: int = 1,
+        verify: bool = True,
+    ) -> None:
+        """
+        Initialize a new Replay.
+
+        Parameters:
+        -----------
+        events : EventLog, MessageRecords or numpy.ndarray
+            The recorded events, for example ``market.events``,
+            ``market.msg_history``, ``read_export(path, "events")`` or
+            ``load_array(checkpoint, "events")``.
+        initial_fair_price : int, optional
+            The initial fair price of the replayed market (default is 100).
+        keyframe_interval : int, optional
+            The snapshot keyframe interval of the replayed market (default is 100).
+        depth_levels : int, optional
+            The top-of-book depth of the replayed market (default is 5).
+        recording : str, optional
+            The recording policy of the replayed market (default is "full").
+        record_every : int, optional
+            The snapshot interval for the "every_k" policy (default is 1).
+        verify : bool, optional
+            Whether to check re-derived trades against the recorded TRADE
+            events (default is True).
+        """
+        self.events = _event_rows(events)
+        self.verify = verify
+        self.position = 0
+        self.market = ContinuousDoubleAuction(
+            initial_fair_price=initial_fair_price,
+            keyframe_interval=keyframe_interval,
+            depth_levels=depth_levels,
+            recording=recording,
+            record_every=record_every,
+        )
+        n_traders = int(self.events["trader_id"].max()) + 1 if len(self.events) else 0
+        for _ in range(n_traders):
+            # Stand-ins never act; they only hold positions, cash and fills.
+            Trader(self.market).arrival = ArrivalProcess()
+        # Per-row access goes through lists, which is much faster than numpy
+        # scalars for the short batches of a typical run.
+        volumes = self.events["volume"]
+        if np.array_equal(volumes, np.round(volumes)):
+            volumes = volumes.astype(np.int64)
+        self._codes = self.events["code"].tolist()
+        self._times = self.events["time"].tolist()
+        self._order_ids = self.events["order_id"].tolist()
+        self._trader_ids = self.events["trader_id"].tolist()
+        self._prices = self.events["price"].tolist()
+        self._volumes = volumes.tolist()
+        self._trade_rows = np.flatnonzero(self.events["code"] == TRADE)
+        self._checked = 0
+
+    @property
+    def time(self) -> int:
+        """The event time of the last replayed submission."""
+        return self.market.last_submission_time
+
+    @property
+    def done(self) -> bool:
+        """Whether every event has been replayed."""
+        return self.position >= len(self.events)
+
+    def replay_until(self, time: int) -> ContinuousDoubleAuction:
+        """
+        Replay every event up to and including event time ``time``.
+
+        Parameters:
+        -----------
+        time : int
+            The last event time to replay.
+
+        Returns:
+        --------
+        ContinuousDoubleAuction
+            The replayed market, in the state it had after the last submission
+            at or before ``time`` and the cancellations that followed it.
+        """
+        codes, times = self._codes, self._times
+        n = len(codes)
+        position = self.position
+        while position < n and times[position] <= time:
+            code = codes[position]
+            if code == CANCEL:
+                self._cancel(position)
+                position += 1
+            elif code == TRADE:
+                raise ValueError(
+                    f"TRADE event at row {position} does not follow a submission."
+                )
+            else:
+                position = self._submit(position)
+        self.position = position
+        if self.verify:
+            self._check_trades()
+        return self.market
+
+    def run(self) -> ContinuousDoubleAuction:
+        """
+        Replay all remaining events.
+
+        Returns:
+        --------
+        ContinuousDoubleAuction
+            The replayed market.
+        """
+        if not self.done:
+            self.replay_until(self._times[-1])
+        self.market.completed = True
+        return self.market
+
+    def _submit(self, start: int) -> int:
+        """Resubmit the batch starting at row ``start`` and return the next row."""
+        codes, times, order_ids = self._codes, self._times, self._order_ids
+        n = len(codes)
+        time = times[start]
+        first_id = order_ids[start]
+        end = start
+        # Submissions carry consecutive IDs; a REJECT of an earlier ID closes an
+        # order of the batch when it executes.
+        while (
+            end < n
+            and codes[end] in (ADD, REJECT)
+            and times[end] == time
+            and order_ids[end] == first_id + end - start
+        ):
+            end += 1
+        orders = [
+            (
+                MarketOrder(trader_id, volume)
+                if price != price
+                else LimitOrder(trader_id, volume, price)
+            )
+            for trader_id, volume, price in zip(
+                self._trader_ids[start:end],
+                self._volumes[start:end],
+                self._prices[start:end],
+            )
+        ]
+        market = self.market
+        market.last_submission_time = time - 1
+        market._next_order_id = first_id
+        market.submit_orders(orders)
+        # The batch's trades, and the rejections and cancelled remainders of its
+        # market orders, are re-derived by matching; trades are checked in bulk.
+        closed = {order.id for order in orders if isinstance(order, MarketOrder)}
+        while (
+            end < n
+            and times[end] == time
+            and (codes[end] == TRADE or order_ids[end] in closed)
+        ):
+            end += 1
+        return end
+
+    def _cancel(self, row: int) -> None:
+        """Cancel the order of the CANCEL event at ``row``."""
+        order_id = self._order_ids[row]
+        trader = self.market.get_participant(self._trader_ids[row])
+        order = trader.active_orders.get(order_id)
+        if order is None:
+            if self.verify:
+                raise ValueError(
+                    f"Cancelled order {order_id} is not resting "
+                    f"at time {self._times[row]}."
+                )
+            return
+        self.market.cancel_order(order)
+
+    def _check_trades(self) -> None:
+        """Compare the trades derived since the last check with the recorded ones."""
+        start = self._checked
+        trades = self.market.trades[start:]
+        stop = int(np.searchsorted(self._trade_rows, self.position))
+        recorded = self.events[self._trade_rows[start:stop]]
+        if len(trades) != len(recorded):
+            raise ValueError(
+                f"Replay derived {start + len(trades)} trades up to time "
+                f"{self.time}, but {stop} were recorded."
+            )
+        aggressor = trades["aggressor_side"]
+        mismatch = (
+            (trades["time"] != recorded["time"])
+            | (trades["price"] != recorded["price"])
+            | (trades["volume"] * aggressor != recorded["volume"])
+            | (
+                np.where(
+                    aggressor == 1, trades["buy_order_id"], trades["sell_order_id"]
+                )
+                != recorded["order_id"]
+            )
+        )
+        if mismatch.any():
+            first = int(np.argmax(mismatch))
+            raise ValueError(
+                f"Replayed trade {start + first} at time "
+                f"{int(trades['time'][first])} differs from the recording."
+            )
+        self._checked = start + len(trades)
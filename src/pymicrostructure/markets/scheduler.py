@@ -0,0 +1,322 @@
+"""Event-driven scheduling of market participants."""
+
+import heapq
+import math
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+EVENTS = ("trade", "top_of_book")
+
+
+class ArrivalProcess:
+    """
+    Decides when a participant is woken up.
+
+    A process gives the number of ticks until an agent's first wake-up and the
+    gap between consecutive wake-ups, and can name market events that wake the
+    agent on the following tick. Processes may keep state between draws, so
+    every agent needs its own instance.
+
+    Attributes:
+    -----------
+    every_tick : bool
+        True if the agent is woken on every tick, which lets the scheduler skip
+        the priority queue.
+    triggers : tuple of str
+        The market events (see ``EVENTS``) that wake the agent.
+    """
+
+    every_tick: bool = False
+    triggers: Tuple[str, ...] = ()
+
+    def first(self, rng: np.random.Generator) -> Optional[int]:
+        """
+        Return the number of ticks until the first wake-up.
+
+        Parameters:
+        -----------
+        rng : numpy.random.Generator
+            The scheduler's random generator.
+
+        Returns:
+        --------
+        int or None
+            0 for the next tick to run, or None to never wake on a timer.
+        """
+        return None
+
+    def next(self, rng: np.random.Generator) -> Optional[int]:
+        """
+        Return the number of ticks from one wake-up to the next.
+
+        Parameters:
+        -----------
+        rng : numpy.random.Generator
+            The scheduler's random generator.
+
+        Returns:
+        --------
+        int or None
+            The gap in ticks (0 wakes the agent again in the same tick), or None
+            to stop waking on a timer.
+        """
+        return None
+
+
+class EveryTick(ArrivalProcess):
+    """Wake the agent on every tick. This is the default for all traders."""
+
+    every_tick = True
+
+    def first(self, rng: np.random.Generator) -> Optional[int]:
+        return 0
+
+    def next(self, rng: np.random.Generator) -> Optional[int]:
+        return 1
+
+
+class Periodic(ArrivalProcess):
+    """
+    Wake the agent every ``period`` ticks.
+
+    Parameters:
+    -----------
+    period : int
+        The number of ticks between wake-ups.
+    offset : int, optional
+        The tick of the first wake-up (default is 0).
+    """
+
+    def __init__(self, period: int, offset: int = 0) -> None:
+        if period < 1:
+            raise ValueError("period must be at least 1.")
+        if offset < 0:
+            raise ValueError("offset must be non-negative.")
+        self.period = period
+        self.offset = offset
+
+    def first(self, rng: np.random.Generator) -> Optional[int]:
+        return self.offset
+
+    def next(self, rng: np.random.Generator) -> Optional[int]:
+        return self.period
+
+
+class BernoulliArrivals(ArrivalProcess):
+    """
+    Wake the agent on each tick independently with probability ``rate``.
+
+    The gaps between wake-ups are drawn from a geometric distribution, so an
+    agent that acts on one tick in a hundred is woken once instead of a hundred
+    times.
+
+    Parameters:
+    -----------
+    rate : float
+        The per-tick wake-up probability, between 0 and 1.
+    """
+
+    def __init__(self, rate: float) -> None:
+        if not 0 <= rate <= 1:
+            raise ValueError("rate must be between 0 and 1.")
+        self.rate = rate
+
+    def first(self, rng: np.random.Generator) -> Optional[int]:
+        gap = self.next(rng)
+        return None if gap is None else gap - 1
+
+    def next(self, rng: np.random.Generator) -> Optional[int]:
+        if self.rate == 0:
+            return None
+        return int(rng.geometric(self.rate))
+
+
+class PoissonArrivals(ArrivalProcess):
+    """
+    Wake the agent at the arrivals of a Poisson process with ``rate`` per tick.
+
+    Arrivals are drawn in continuous time and fall into the tick they occur in,
+    so the agent can be woken several times in one tick.
+
+    Parameters:
+    -----------
+    rate : float
+        The expected number of arrivals per tick.
+    """
+
+    def __init__(self, rate: float) -> None:
+        if rate < 0:
+            raise ValueError("rate must be non-negative.")
+        self.rate = rate
+        self._clock = 0.0
+
+    def first(self, rng: np.random.Generator) -> Optional[int]:
+        if self.rate == 0:
+            return None
+        self._clock = rng.exponential(1 / self.rate)
+        return math.floor(self._clock)
+
+    def next(self, rng: np.random.Generator) -> Optional[int]:
+        previous = math.floor(self._clock)
+        self._clock += rng.exponential(1 / self.rate)
+        return math.floor(self._clock) - previous
+
+
+class OnEvent(ArrivalProcess):
+    """
+    Wake the agent on the tick after a market event.
+
+    Parameters:
+    -----------
+    *events : str
+        The events that wake the agent, from ``EVENTS``: "trade" (at least one
+        trade executed) and "top_of_book" (the best bid or ask changed).
+    """
+
+    def __init__(self, *events: str) -> None:
+        unknown = set(events) - set(EVENTS)
+        if not events or unknown:
+            raise ValueError(f"Events must be a non-empty subset of {EVENTS}.")
+        self.triggers = tuple(events)
+
+
+class Scheduler:
+    """
+    Priority queue of participant wake-up times.
+
+    Agents with an ``EveryTick`` process are kept in a plain list; all other
+    timed wake-ups are kept in a heap keyed by tick. ``advance()`` returns the
+    agents due on the next tick in random order, so only agents that act are
+    called. Agents listening for market events are queued for the following
+    tick by ``notify()``.
+
+    Attributes:
+    -----------
+    tick : int
+        The number of ticks advanced so far.
+    rng : numpy.random.Generator
+        The source of random wake-up gaps and of the order of agents.
+
+    Methods:
+    --------
+    add(agent, process)
+        Start scheduling an agent.
+    advance()
+        Move to the next tick and return the agents due on it.
+    notify(event)
+        Wake the agents listening for an event on the next tick.
+    watching(event)
+        Return True if any agent listens for an event.
+    """
+
+    def __init__(self, rng: Optional[np.random.Generator] = None) -> None:
+        """
+        Initialize an empty scheduler.
+
+        Parameters:
+        -----------
+        rng : numpy.random.Generator, optional
+            The source of random wake-up gaps and of the order of agents
+            (default is a generator seeded from OS entropy).
+        """
+        self.tick = 0
+        self.rng = np.random.default_rng() if rng is None else rng
+        self._agents: set = set()
+        self._every_tick: List[Any] = []
+        self._heap: List[Tuple[int, int, Any, Optional[ArrivalProcess]]] = []
+        self._seq = 0
+        self._listeners: Dict[str, List[Any]] = defaultdict(list)
+        self._triggered: set = set()
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def __contains__(self, agent: Any) -> bool:
+        return agent in self._agents
+
+    def add(self, agent: Any, process: Optional[ArrivalProcess] = None) -> None:
+        """
+        Start scheduling an agent. Agents already scheduled are ignored.
+
+        Parameters:
+        -----------
+        agent : Trader
+            The agent to wake up.
+        process : ArrivalProcess, optional
+            The agent's arrival process (default is the agent's ``arrival``
+            attribute, or ``EveryTick``).
+        """
+        if agent in self._agents:
+            return
+        self._agents.add(agent)
+        if process is None:
+            process = getattr(agent, "arrival", None) or EveryTick()
+        if process.every_tick:
+            self._every_tick.append(agent)
+        else:
+            self._push(agent, process, process.first(self.rng))
+        for event in process.triggers:
+            self._listeners[event].append(agent)
+
+    def advance(self) -> List[Any]:
+        """
+        Move to the next tick and return the agents due on it.
+
+        Timed agents are rescheduled from their arrival process as they are
+        returned. The result is in random order.
+
+        Returns:
+        --------
+        list of Trader
+            The agents to wake up on this tick, possibly with repeats if an
+            arrival process fires more than once in the tick.
+        """
+        tick = self.tick
+        self.tick += 1
+        self._triggered.clear()
+        heap = self._heap
+        due = []
+        while heap and heap[0][0] <= tick:
+            _, _, agent, process = heapq.heappop(heap)
+            due.append(agent)
+            if process is not None:
+                self._push(agent, process, process.next(self.rng), tick)
+        if not due:
+            self.rng.shuffle(self._every_tick)
+            return self._every_tick
+        due += self._every_tick
+        self.rng.shuffle(due)
+        return due
+
+    def notify(self, event: str) -> None:
+        """
+        Wake the agents listening for ``event`` on the next tick, once each.
+
+        Parameters:
+        -----------
+        event : str
+            The event that occurred, from ``EVENTS``.
+        """
+        for agent in self._listeners.get(event, ()):
+            if agent not in self._triggered:
+                self._triggered.add(agent)
+                self._push(agent, None, 0)
+
+    def watching(self, event: str) -> bool:
+        """Return True if any agent listens for ``event``."""
+        return bool(self._listeners.get(event))
+
+    def _push(
+        self,
+        agent: Any,
+        process: Optional[ArrivalProcess],
+        gap: Optional[int],
+        tick: Optional[int] = None,
+    ) -> None:
+        """Queue a wake-up ``gap`` ticks after ``tick`` (default the next tick)."""
+        if gap is None:
+            return
+        tick = self.tick if tick is None else tick
+        heapq.heappush(self._heap, (tick + gap, self._seq, agent, process))
+        self._seq += 1
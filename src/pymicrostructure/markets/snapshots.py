@@ -0,0 +1,406 @@
+"""Delta-encoded order book depth history."""
+
+from typing import Any, Dict, Iterator, List, Optional, Union
+import numpy as np
+from pymicrostructure.markets.book import BookSide
+from pymicrostructure.utils.buffers import RecordBuffer
+
+
+class DepthSnapshots:
+    """
+    Order book depth history stored as level deltas with periodic keyframes.
+
+    Each recorded snapshot stores only the price levels whose aggregated volume
+    changed since the previous snapshot (a volume of 0 marks a removed level).
+    Every ``keyframe_interval`` snapshots a full copy of the levels is kept, so any
+    snapshot can be rebuilt by seeking to the nearest earlier keyframe and replaying
+    at most ``keyframe_interval`` deltas.
+
+    The object behaves like a read-only list of snapshots in the format the market
+    has always exposed: dictionaries with ``"bid"`` and ``"ask"`` lists of
+    ``{"price": ..., "volume": ...}`` levels sorted best first, and a ``"time"``
+    key. Snapshots are materialized on access and are not cached.
+
+    Attributes:
+    -----------
+    keyframe_interval : int
+        The number of snapshots between two full keyframes.
+
+    Methods:
+    --------
+    record(time, bid_book, ask_book)
+        Record the current depth of the order book.
+    levels_at(index)
+        Return the bid and ask price -> volume maps of a snapshot.
+    delta_records(start, stop)
+        Return the level deltas of a range of snapshots with their times.
+    to_arrays()
+        Return the internal state as a dictionary of arrays.
+    restore(arrays)
+        Replace the state with arrays returned by ``to_arrays()``.
+    """
+
+    DELTA_DTYPE = np.dtype(
+        [("time", "i8"), ("side", "i1"), ("price", "f8"), ("volume", "f8")]
+    )
+
+    def __init__(
+        self,
+        keyframe_interval: int = 100,
+        memory_rows: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize an empty depth history.
+
+        Parameters:
+        -----------
+        keyframe_interval : int, optional
+            The number of snapshots between two full keyframes (default is 100).
+        memory_rows : int, optional
+            The maximum number of rows each underlying buffer keeps in memory
+            before spilling older rows to disk (default is no limit).
+        spill_dir : str, optional
+            The directory spilled rows are written under (default is the system
+            temporary directory).
+        """
+        if keyframe_interval < 1:
+            raise ValueError("Keyframe interval must be at least 1.")
+        self.keyframe_interval = keyframe_interval
+        level_dtype = [("side", "i1"), ("price", "f8"), ("volume", "f8")]
+        # Deltas of snapshot i are rows _index[i - 1].end:_index[i].end.
+        self._index = RecordBuffer(
+            [("time", "i8"), ("end", "i8")],
+            memory_rows=memory_rows,
+            spill_dir=spill_dir,
+            name="snapshot-index",
+        )
+        self._deltas = RecordBuffer(
+            level_dtype, memory_rows=memory_rows, spill_dir=spill_dir, name="deltas"
+        )
+        # Keyframe k holds rows _keyframe_ends[k - 1]:_keyframe_ends[k].
+        self._keyframes = RecordBuffer(
+            level_dtype, memory_rows=memory_rows, spill_dir=spill_dir, name="keyframes"
+        )
+        self._keyframe_ends: List[int] = []
+        self._bid_levels: Dict[float, float] = {}
+        self._ask_levels: Dict[float, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self._replay(range(len(self)))
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            indices = range(*index.indices(len(self)))
+            if indices.step > 0:
+                return list(self._replay(indices))
+            return list(self._replay(indices[::-1]))[::-1]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("snapshot index out of range")
+        return next(self._replay(range(index, index + 1)))
+
+    def record(self, time: int, bid_book: BookSide, ask_book: BookSide) -> None:
+        """
+        Record the current depth of the order book.
+
+        Only the prices flagged in each book side's ``changed_prices`` are
+        inspected, and the flags are cleared afterwards.
+
+        Parameters:
+        -----------
+        time : int
+            The event time of the snapshot.
+        bid_book : BookSide
+            The bid side of the order book.
+        ask_book : BookSide
+            The ask side of the order book.
+        """
+        for side, book, levels in (
+            (1, bid_book, self._bid_levels),
+            (-1, ask_book, self._ask_levels),
+        ):
+            for price in book.changed_prices:
+                volume = book.volume_at(price)
+                if levels.get(price, 0) == volume:
+                    continue
+                if volume:
+                    levels[price] = volume
+                else:
+                    del levels[price]
+                self._deltas.append((side, price, volume))
+            book.changed_prices.clear()
+
+        index = len(self._index)
+        self._index.append((time, len(self._deltas)))
+        if index % self.keyframe_interval == 0:
+            for side, levels in ((1, self._bid_levels), (-1, self._ask_levels)):
+                for price, volume in levels.items():
+                    self._keyframes.append((side, price, volume))
+            self._keyframe_ends.append(len(self._keyframes))
+
+    def levels_at(self, index: int) -> tuple:
+        """
+        Return the bid and ask price -> volume maps of a snapshot.
+
+        Parameters:
+        -----------
+        index : int
+            The position of the snapshot in the history.
+
+        Returns:
+        --------
+        tuple of dict
+            The bid and ask levels, mapping price to aggregated volume.
+        """
+        k = index // self.keyframe_interval
+        start = self._keyframe_ends[k - 1] if k else 0
+        bids: Dict[float, float] = {}
+        asks: Dict[float, float] = {}
+        for side, price, volume in self._keyframes[
+            start : self._keyframe_ends[k]
+        ].tolist():
+            (bids if side == 1 else asks)[price] = volume
+        for i in range(k * self.keyframe_interval + 1, index + 1):
+            self._apply(i, bids, asks)
+        return bids, asks
+
+    def delta_records(self, start: int, stop: Optional[int] = None) -> np.ndarray:
+        """
+        Return the level deltas of snapshots ``start:stop`` with their times.
+
+        Parameters:
+        -----------
+        start : int
+            The first snapshot.
+        stop : int, optional
+            The snapshot after the last one (default is the number of snapshots).
+
+        Returns:
+        --------
+        numpy.ndarray
+            A record array with ``time``, ``side``, ``price`` and ``volume``
+            fields, one row per changed level.
+        """
+        stop = len(self) if stop is None else stop
+        index = self._index[start:stop]
+        first = int(self._index[start - 1]["end"]) if start else 0
+        ends = index["end"]
+        rows = self._deltas[first : int(ends[-1]) if len(ends) else first]
+        out = np.empty(len(rows), dtype=self.DELTA_DTYPE)
+        out["time"] = np.repeat(index["time"], np.diff(ends, prepend=first))
+        for name in ("side", "price", "volume"):
+            out[name] = rows[name]
+        return out
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Return the internal state as a dictionary of arrays.
+
+        Returns:
+        --------
+        dict
+            The snapshot index, deltas, keyframes, keyframe boundaries and the
+            levels of the latest snapshot, keyed by name.
+        """
+        levels = [
+            (side, price, volume)
+            for side, book in ((1, self._bid_levels), (-1, self._ask_levels))
+            for price, volume in book.items()
+        ]
+        return {
+            "index": self._index.to_numpy(),
+            "deltas": self._deltas.to_numpy(),
+            "keyframes": self._keyframes.to_numpy(),
+            "keyframe_ends": np.asarray(self._keyframe_ends, dtype=np.int64),
+            "levels": np.array(levels, dtype=self._deltas.dtype),
+        }
+
+    def restore(self, arrays: Dict[str, np.ndarray]) -> None:
+        """
+        Replace the state with arrays returned by ``to_arrays()``.
+
+        The index, delta and keyframe arrays are used without a copy, so they
+        may be memory-mapped.
+
+        Parameters:
+        -----------
+        arrays : dict
+            The arrays, keyed as in ``to_arrays()``.
+        """
+        self._index.restore(arrays["index"])
+        self._deltas.restore(arrays["deltas"])
+        self._keyframes.restore(arrays["keyframes"])
+        self._keyframe_ends = arrays["keyframe_ends"].tolist()
+        self._bid_levels = {}
+        self._ask_levels = {}
+        for side, price, volume in arrays["levels"].tolist():
+            (self._bid_levels if side == 1 else self._ask_levels)[price] = volume
+
+    def _apply(self, index: int, bids: dict, asks: dict) -> None:
+        """Apply the deltas of snapshot ``index`` to the given level maps."""
+        start = int(self._index[index - 1]["end"]) if index else 0
+        stop = int(self._index[index]["end"])
+        for side, price, volume in self._deltas[start:stop].tolist():
+            levels = bids if side == 1 else asks
+            if volume:
+                levels[price] = volume
+            else:
+                levels.pop(price, None)
+
+    def _replay(self, indices: range) -> Iterator[Dict[str, Any]]:
+        """Yield materialized snapshots for an increasing range of indices."""
+        if not indices:
+            return
+        current = indices[0]
+        bids, asks = self.levels_at(current)
+        yield self._materialize(current, bids, asks)
+        for index in indices[1:]:
+            if index - current > self.keyframe_interval:
+                bids, asks = self.levels_at(index)
+            else:
+                for i in range(current + 1, index + 1):
+                    self._apply(i, bids, asks)
+            current = index
+            yield self._materialize(index, bids, asks)
+
+    def _materialize(self, index: int, bids: dict, asks: dict) -> Dict[str, Any]:
+        """Build a snapshot dictionary from level maps."""
+        return {
+            "bid": [
+                {"price": price, "volume": bids[price]}
+                for price in sorted(bids, reverse=True)
+            ],
+            "ask": [{"price": price, "volume": asks[price]} for price in sorted(asks)],
+            "time": int(self._index[index]["time"]),
+        }
+
+
+class TopOfBookHistory(RecordBuffer):
+    """
+    Columnar history of the top of the order book.
+
+    One row is recorded per snapshot with the best prices, the midprice and
+    spread, the carried-forward mark price, the total depth of each side and the
+    prices and volumes of the best ``depth_levels`` levels. Missing prices are NaN
+    and missing volumes are 0. All fields are available as NumPy arrays, e.g.
+    ``history.column("spread")``, which are zero-copy views unless rows have been
+    spilled to disk.
+
+    Fields:
+    -------
+    time : int
+        The event time of the snapshot.
+    best_bid, best_ask : float
+        The best prices (NaN if the side is empty).
+    midprice, spread : float
+        Computed from the best prices (NaN if either side is empty).
+    mark_price : float
+        The midprice, carried forward from the previous row when a side is empty.
+    bid_depth, ask_depth : float
+        The total resting volume of each side (asks are negative).
+    bid_prices, bid_volumes, ask_prices, ask_volumes : float array
+        The best ``depth_levels`` levels of each side, best first.
+    """
+
+    def __init__(
+        self,
+        depth_levels: int = 5,
+        chunk_size: int = 4096,
+        memory_rows: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize an empty top-of-book history.
+
+        Parameters:
+        -----------
+        depth_levels : int, optional
+            The number of price levels per side to record (default is 5).
+        chunk_size : int, optional
+            The growth step of the underlying buffer in rows (default is 4096).
+        memory_rows : int, optional
+            The maximum number of rows kept in memory before older rows are
+            spilled to disk (default is no limit).
+        spill_dir : str, optional
+            The directory spilled rows are written under (default is the system
+            temporary directory).
+        """
+        self.depth_levels = depth_levels
+        super().__init__(
+            [
+                ("time", "i8"),
+                ("best_bid", "f8"),
+                ("best_ask", "f8"),
+                ("midprice", "f8"),
+                ("spread", "f8"),
+                ("mark_price", "f8"),
+                ("bid_depth", "f8"),
+                ("ask_depth", "f8"),
+                ("bid_prices", "f8", (depth_levels,)),
+                ("bid_volumes", "f8", (depth_levels,)),
+                ("ask_prices", "f8", (depth_levels,)),
+                ("ask_volumes", "f8", (depth_levels,)),
+            ],
+            chunk_size,
+            memory_rows=memory_rows,
+            spill_dir=spill_dir,
+            name="top-of-book",
+        )
+        self._empty_prices = [np.nan] * depth_levels
+        self._empty_volumes = [0] * depth_levels
+
+    def record(
+        self, time: int, bid_book: BookSide, ask_book: BookSide, mark_price: float
+    ) -> None:
+        """
+        Record the current top of the order book.
+
+        Parameters:
+        -----------
+        time : int
+            The event time of the snapshot.
+        bid_book : BookSide
+            The bid side of the order book.
+        ask_book : BookSide
+            The ask side of the order book.
+        mark_price : float
+            The market's current mark price.
+        """
+        k = self.depth_levels
+        bids = bid_book.top(k)
+        asks = ask_book.top(k)
+        if bids and asks:
+            best_bid = bids[0].price
+            best_ask = asks[0].price
+            midprice = (best_bid + best_ask) / 2
+            spread = best_ask - best_bid
+        else:
+            best_bid = bids[0].price if bids else np.nan
+            best_ask = asks[0].price if asks else np.nan
+            midprice = spread = np.nan
+
+        bid_prices = [level.price for level in bids]
+        bid_volumes = [level.volume for level in bids]
+        ask_prices = [level.price for level in asks]
+        ask_volumes = [level.volume for level in asks]
+        self.append(
+            (
+                time,
+                best_bid,
+                best_ask,
+                midprice,
+                spread,
+                mark_price,
+                bid_book.volume,
+                ask_book.volume,
+                bid_prices + self._empty_prices[len(bids) :],
+                bid_volumes + self._empty_volumes[len(bids) :],
+                ask_prices + self._empty_prices[len(asks) :],
+                ask_volumes + self._empty_volumes[len(asks) :],
+            )
+        )
@@ -0,0 +1,298 @@
+"""Columnar record of the trades executed in a market."""
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+import numpy as np
+from pymicrostructure.utils.buffers import RecordBuffer
+
+
+class TradeTape(RecordBuffer):
+    """
+    Columnar history of executed trades.
+
+    One row is recorded per fill, stored in chunked typed arrays. Columns are
+    available as NumPy arrays (``tape.column("price")``), the whole tape through
+    ``to_numpy()`` and ``to_pandas()``, and the latest fills through ``tail(n)``.
+
+    Each row also carries the running totals of signed and unsigned volume, so
+    the order flow over the last ``n`` trades is the difference of two rows
+    (see ``order_flow``), whatever ``n`` is. When that row has been spilled,
+    the running totals of its chunk are read once and kept in memory for the
+    following queries, for up to ``FLOW_CACHE_CHUNKS`` chunks.
+
+    Fields:
+    -------
+    time : int
+        The event time of the trade.
+    price : float
+        The execution price.
+    volume : float
+        The traded volume (always positive).
+    aggressor_side : int
+        1 if the buyer initiated the trade, -1 if the seller did.
+    buyer_id, seller_id : int
+        The trader IDs of the two counterparties.
+    buy_order_id, sell_order_id : int
+        The IDs of the matched orders (-1 if unknown).
+    cum_signed_volume : float
+        The running sum of ``volume * aggressor_side`` up to and including the row.
+    cum_volume : float
+        The running sum of ``volume`` up to and including the row.
+    """
+
+    FLOW_CACHE_CHUNKS = 4
+
+    def __init__(
+        self,
+        chunk_size: int = 4096,
+        memory_rows: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize an empty trade tape.
+
+        Parameters:
+        -----------
+        chunk_size : int, optional
+            The growth step of the underlying buffer in rows (default is 4096).
+        memory_rows : int, optional
+            The maximum number of rows kept in memory before older rows are
+            spilled to disk (default is no limit).
+        spill_dir : str, optional
+            The directory spilled rows are written under (default is the system
+            temporary directory).
+        """
+        super().__init__(
+            [
+                ("time", "i8"),
+                ("price", "f8"),
+                ("volume", "f8"),
+                ("aggressor_side", "i1"),
+                ("buyer_id", "i8"),
+                ("seller_id", "i8"),
+                ("buy_order_id", "i8"),
+                ("sell_order_id", "i8"),
+                ("cum_signed_volume", "f8"),
+                ("cum_volume", "f8"),
+            ],
+            chunk_size,
+            memory_rows=memory_rows,
+            spill_dir=spill_dir,
+            name="trades",
+        )
+        self._cum_signed_volume = 0.0
+        self._cum_volume = 0.0
+        # Running totals of recently read spilled chunks, oldest first.
+        self._flow_cache: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def record(
+        self,
+        time: int,
+        price: float,
+        volume: float,
+        aggressor_side: int,
+        buyer_id: int,
+        seller_id: int,
+        buy_order_id: int = -1,
+        sell_order_id: int = -1,
+    ) -> None:
+        """
+        Record one trade.
+
+        Parameters:
+        -----------
+        time : int
+            The event time of the trade.
+        price : float
+            The execution price.
+        volume : float
+            The traded volume.
+        aggressor_side : int
+            1 if the buyer initiated the trade, -1 if the seller did.
+        buyer_id : int
+            The trader ID of the buyer.
+        seller_id : int
+            The trader ID of the seller.
+        buy_order_id : int, optional
+            The ID of the buy order (default is -1).
+        sell_order_id : int, optional
+            The ID of the sell order (default is -1).
+        """
+        self._cum_signed_volume += volume * aggressor_side
+        self._cum_volume += volume
+        self.append(
+            (
+                time,
+                price,
+                volume,
+                aggressor_side,
+                buyer_id,
+                seller_id,
+                buy_order_id,
+                sell_order_id,
+                self._cum_signed_volume,
+                self._cum_volume,
+            )
+        )
+
+    def order_flow(self, window: int) -> Tuple[float, float]:
+        """
+        Return the signed and total volume of the last ``window`` trades.
+
+        Runs in constant time for any window, using the running totals.
+
+        Parameters:
+        -----------
+        window : int
+            The number of most recent trades to aggregate.
+
+        Returns:
+        --------
+        tuple of float
+            The sum of ``volume * aggressor_side`` and the sum of ``volume``.
+        """
+        n = len(self)
+        if not n or window < 1:
+            return 0.0, 0.0
+        signed, total = self._cum_signed_volume, self._cum_volume
+        if window >= n:
+            return signed, total
+        index = n - window - 1
+        spilled = self.spilled_rows
+        if index >= spilled:
+            start = self._data[index - spilled]
+            return (
+                signed - float(start["cum_signed_volume"]),
+                total - float(start["cum_volume"]),
+            )
+        chunk, offset = divmod(index, self.chunk_size)
+        signed_totals, totals = self._spilled_flow(chunk)
+        return signed - signed_totals.item(offset), total - totals.item(offset)
+
+    def _spilled_flow(self, chunk: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the running totals of a spilled chunk, reading it at most once."""
+        cached = self._flow_cache.get(chunk)
+        if cached is None:
+            rows = self._load(chunk)
+            cached = (np.array(rows["cum_signed_volume"]), np.array(rows["cum_volume"]))
+            if len(self._flow_cache) >= self.FLOW_CACHE_CHUNKS:
+                del self._flow_cache[next(iter(self._flow_cache))]
+            self._flow_cache[chunk] = cached
+        return cached
+
+    def clear(self) -> None:
+        """Drop all recorded trades and reset the running totals."""
+        super().clear()
+        self._cum_signed_volume = 0.0
+        self._cum_volume = 0.0
+        self._flow_cache = {}
+
+    def restore(self, rows: np.ndarray) -> None:
+        """Replace the tape with saved rows and resume the running totals."""
+        super().restore(rows)
+        if len(rows):
+            self._cum_signed_volume = float(rows[-1]["cum_signed_volume"])
+            self._cum_volume = float(rows[-1]["cum_volume"])
+
+
+class TradeRecords:
+    """
+    Read-only list of trades as dictionaries, generated from a trade tape.
+
+    This is the format ``trade_history`` has always had: one dictionary per trade
+    with ``"price"``, ``"volume"``, ``"aggressor_side"`` and ``"time"`` keys.
+    Dictionaries are built on access and are not cached, so prefer the tape's
+    columns for analysis.
+    """
+
+    KEYS = ("price", "volume", "aggressor_side", "time")
+
+    def __init__(self, tape: TradeTape) -> None:
+        self.tape = tape
+
+    def __len__(self) -> int:
+        return len(self.tape)
+
+    def __bool__(self) -> bool:
+        return len(self.tape) > 0
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self._to_dicts(self.tape.to_numpy())
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return list(self._to_dicts(self.tape[index]))
+        row = self.tape[index]
+        return {key: row[key].item() for key in self.KEYS}
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (TradeRecords, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TradeRecords(len={len(self)})"
+
+    def _to_dicts(self, rows: np.ndarray) -> Iterator[Dict[str, Any]]:
+        """Yield one dictionary per row."""
+        columns: List[list] = [rows[key].tolist() for key in self.KEYS]
+        for values in zip(*columns):
+            yield dict(zip(self.KEYS, values))
+
+
+class FillRecords(TradeRecords):
+    """
+    Read-only list of one trader's fills, generated from the market's trade tape.
+
+    A trader keeps only the tape row of each fill and the side it traded on, so a
+    fill costs a few bytes per trader. The dictionaries have the same keys as
+    ``TradeRecords``, with ``"volume"`` signed from the trader's point of view
+    (positive when buying, negative when selling). ``to_numpy()`` returns all
+    fills as one record array for vectorized analysis.
+    """
+
+    DTYPE = np.dtype(
+        [
+            ("price", "f8"),
+            ("volume", "f8"),
+            ("aggressor_side", "i1"),
+            ("time", "i8"),
+        ]
+    )
+
+    def __init__(self, tape: TradeTape, fills: RecordBuffer) -> None:
+        super().__init__(tape)
+        self.fills = fills
+
+    def __len__(self) -> int:
+        return len(self.fills)
+
+    def __bool__(self) -> bool:
+        return len(self.fills) > 0
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self._to_dicts(self.to_numpy())
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return list(self._to_dicts(self._resolve(self.fills[index])))
+        fill = self.fills[index]
+        row = self.tape[int(fill["trade"])]
+        trade = {key: row[key].item() for key in self.KEYS}
+        trade["volume"] *= int(fill["side"])
+        return trade
+
+    def __repr__(self) -> str:
+        return f"FillRecords(len={len(self)})"
+
+    def to_numpy(self) -> np.ndarray:
+        """Return the trader's fills as a record array, in execution order."""
+        return self._resolve(self.fills.to_numpy())
+
+    def _resolve(self, fills: np.ndarray) -> np.ndarray:
+        """Look up fill index rows on the tape and sign their volumes."""
+        rows = self.tape.take(fills["trade"])
+        out = np.empty(len(rows), dtype=self.DTYPE)
+        for key in ("price", "aggressor_side", "time"):
+            out[key] = rows[key]
+        out["volume"] = rows["volume"] * fills["side"]
+        return out
@@ -21,28 +21,19 @@ def quoted_spread(market: Market) -> pd.DataFrame:
     Parameters:
     -----------
     market : Market
-        An object representing the market, which must have an 'ob_snapshots' attribute.
-        Each snapshot should be a dictionary with 'bid' and 'ask' keys.
+        An object representing the market, which must have a 'top_of_book' attribute
+        recording the spread at each order book snapshot.
 
     Returns:
     --------
     pd.DataFrame
         A DataFrame with a 'quoted_spread' column, indexed by snapshot times.
     """
-    best_bid = [
-        snapshot["bid"][0]["price"] if snapshot["bid"] else None
-        for snapshot in market.ob_snapshots
-    ]
-    best_ask = [
-        snapshot["ask"][0]["price"] if snapshot["ask"] else None
-        for snapshot in market.ob_snapshots
-    ]
-    ob_time = [snapshot["time"] for snapshot in market.ob_snapshots]
-
-    df = pd.DataFrame({"best_bid": best_bid, "best_ask": best_ask}, index=ob_time)
-    df["quoted_spread"] = df["best_ask"] - df["best_bid"]
-
-    return df[["quoted_spread"]]
+    top_of_book = market.top_of_book
+    return pd.DataFrame(
+        {"quoted_spread": top_of_book.column("spread")},
+        index=top_of_book.column("time"),
+    )
 
 
 def effective_spread(
@@ -130,8 +121,8 @@ def amihud_illiquidity(market: Market, window: int = 20) -> pd.DataFrame:
     Parameters:
     -----------
     market : Market
-        An object representing the market, which must have a 'trade_history' attribute.
-        Each trade in the history should be a dictionary with 'price', 'volume', and 'time' keys.
+        An object representing the market, which must have a 'trades' attribute
+        holding its trade tape.
     window : int, optional
         The size of the rolling window (in number of periods). Default is 20.
 
@@ -140,8 +131,7 @@ def amihud_illiquidity(market: Market, window: int = 20) -> pd.DataFrame:
     pd.DataFrame
         A DataFrame with an 'amihud_lambda' column, indexed by time.
     """
-    # Convert trade history to DataFrame
-    trades_df = pd.DataFrame(market.trade_history)
+    trades_df = market.trades.to_pandas()
     trades_df.set_index("time", inplace=True)
 
     # Calculate returns
@@ -168,8 +158,8 @@ def kyle_lambda(market: Market, window: int = 20) -> pd.DataFrame:
     Parameters:
     -----------
     market : Market
-        An object representing the market, which must have a 'trade_history' attribute.
-        Each trade in the history should be a dictionary with 'price', 'volume', 'aggressor_side', and 'time' keys.
+        An object representing the market, which must have a 'trades' attribute
+        holding its trade tape.
     window : int, optional
         The size of the rolling window (in number of periods). Default is 20.
 
@@ -178,8 +168,7 @@ def kyle_lambda(market: Market, window: int = 20) -> pd.DataFrame:
     pd.DataFrame
         A DataFrame with a 'kyle_lambda' column, indexed by time.
     """
-    # Convert trade history to DataFrame
-    trades_df = pd.DataFrame(market.trade_history)
+    trades_df = market.trades.to_pandas()
     trades_df.set_index("time", inplace=True)
 
     # Calculate price changes
@@ -213,8 +202,8 @@ def returns_autocorrelation(market: Market, window: int = 20) -> pd.DataFrame:
     Parameters:
     -----------
     market : Market
-        An object representing the market, which must have a 'trade_history' attribute.
-        Each trade in the history should be a dictionary with 'price', 'time', and 'aggressor_side' keys.
+        An object representing the market, which must have a 'trades' attribute
+        holding its trade tape.
     window : int, optional
         The size of the rolling window (in number of periods). Default is 20.
 
@@ -223,8 +212,7 @@ def returns_autocorrelation(market: Market, window: int = 20) -> pd.DataFrame:
     pd.DataFrame
         A DataFrame with a 'returns_autocorr' column, indexed by time.
     """
-    # Convert trade history to DataFrame
-    trades_df = pd.DataFrame(market.trade_history)
+    trades_df = market.trades.to_pandas()
     trades_df.set_index("time", inplace=True)
 
     # Calculate returns
@@ -245,8 +233,8 @@ def variance_ratio_test(market: Market, k: int = 5, window: int = 100) -> pd.Dat
     Parameters:
     -----------
     market : Market
-        An object representing the market, which must have a 'trade_history' attribute.
-        Each trade in the history should be a dictionary with 'price' and 'time' keys.
+        An object representing the market, which must have a 'trades' attribute
+        holding its trade tape.
     k : int, optional
         The number of periods to use for the k-period return. Default is 5.
     window : int, optional
@@ -257,8 +245,7 @@ def variance_ratio_test(market: Market, k: int = 5, window: int = 100) -> pd.Dat
     pd.DataFrame
         A DataFrame with 'vr_statistic' and 'p_value' columns, indexed by time.
     """
-    # Convert trade history to DataFrame
-    trades_df = pd.DataFrame(market.trade_history)
+    trades_df = market.trades.to_pandas()
     trades_df.set_index("time", inplace=True)
 
     # Calculate log returns
@@ -300,8 +287,8 @@ def hurst_exponent(
     Parameters:
     -----------
     market : Market
-        An object representing the market, which must have a 'trade_history' attribute.
-        Each trade in the history should be a dictionary with 'price' and 'time' keys.
+        An object representing the market, which must have a 'trades' attribute
+        holding its trade tape.
     window : int, optional
         The size of the rolling window. Default is 100.
     max_lag : int, optional
@@ -312,8 +299,7 @@ def hurst_exponent(
     pd.DataFrame
         A DataFrame with a 'hurst_exponent' column, indexed by time.
     """
-    # Convert trade history to DataFrame
-    trades_df = pd.DataFrame(market.trade_history)
+    trades_df = market.trades.to_pandas()
     trades_df.set_index("time", inplace=True)
 
     # Calculate log returns
@@ -363,8 +349,8 @@ def rolling_adf_test(
     Parameters:
     -----------
     market : Market
-        An object representing the market, which must have a 'trade_history' attribute.
-        Each trade in the history should be a dictionary with 'price' and 'time' keys.
+        An object representing the market, which must have a 'trades' attribute
+        holding its trade tape.
     window : int, optional
         The size of the rolling window. Default is 100.
     alpha : float, optional
@@ -375,8 +361,7 @@ def rolling_adf_test(
     pd.DataFrame
         A DataFrame with 'adf_statistic', 'p_value', and 'is_stationary' columns, indexed by time.
     """
-    # Convert trade history to DataFrame
-    trades_df = pd.DataFrame(market.trade_history)
+    trades_df = market.trades.to_pandas()
     trades_df.set_index("time", inplace=True)
 
     def perform_adf_test(prices):
@@ -439,8 +424,8 @@ def order_flow_imbalance(market: Market, window: int = 100) -> pd.DataFrame:
     Parameters:
     -----------
     market : Market
-        An object representing the market, which must have a 'trade_history' attribute.
-        Each trade in the history should be a dictionary with 'volume' and 'aggressor_side' keys.
+        An object representing the market, which must have a 'trades' attribute
+        holding its trade tape.
     window : int, optional
         The size of the rolling window. Default is 100.
 
@@ -449,8 +434,7 @@ def order_flow_imbalance(market: Market, window: int = 100) -> pd.DataFrame:
     pd.DataFrame
         A DataFrame with an 'order_flow_imbalance' column, indexed by time.
     """
-    # Convert trade history to DataFrame
-    trades_df = pd.DataFrame(market.trade_history)
+    trades_df = market.trades.to_pandas()
     trades_df.set_index("time", inplace=True)
 
     # Calculate order flow imbalance
@@ -475,8 +459,8 @@ def trade_sign_autocorrelation(market: Market, window: int = 100) -> pd.DataFram
     Parameters:
     -----------
     market : Market
-        An object representing the market, which must have a 'trade_history' attribute.
-        Each trade in the history should be a dictionary with 'price', 'time', and 'aggressor_side' keys.
+        An object representing the market, which must have a 'trades' attribute
+        holding its trade tape.
     window : int, optional
         The size of the rolling window. Default is 100.
 
@@ -485,8 +469,7 @@ def trade_sign_autocorrelation(market: Market, window: int = 100) -> pd.DataFram
     pd.DataFrame
         A DataFrame with a 'trade_sign_autocorr' column, indexed by time.
     """
-    # Convert trade history to DataFrame
-    trades_df = pd.DataFrame(market.trade_history)
+    trades_df = market.trades.to_pandas()
     trades_df.set_index("time", inplace=True)
 
     # Calculate trade signs
@@ -514,9 +497,8 @@ def order_book_depth(market: Market, window: int = 100) -> pd.DataFrame:
     Parameters:
     -----------
     market : Market
-        An object representing the market, which must have an 'ob_snapshots' attribute.
-        Each snapshot should be a dictionary with 'bid' and 'ask' keys, containing lists
-        of price-volume pairs.
+        An object representing the market, which must have a 'top_of_book' attribute
+        recording the total depth of each side at each order book snapshot.
     window : int, optional
         The size of the rolling window. Default is 100.
 
@@ -525,18 +507,14 @@ def order_book_depth(market: Market, window: int = 100) -> pd.DataFrame:
     pd.DataFrame
         A DataFrame with 'bid_depth' and 'ask_depth' columns, indexed by time.
     """
-    # Extract bid and ask depths from order book snapshots
-    bid_depth = [
-        sum(order["volume"] for order in snapshot["bid"]) if snapshot["bid"] else 0
-        for snapshot in market.ob_snapshots
-    ]
-    ask_depth = [
-        sum(order["volume"] for order in snapshot["ask"]) if snapshot["ask"] else 0
-        for snapshot in market.ob_snapshots
-    ]
-    ob_time = [snapshot["time"] for snapshot in market.ob_snapshots]
-
-    df = pd.DataFrame({"bid_depth": bid_depth, "ask_depth": ask_depth}, index=ob_time)
+    top_of_book = market.top_of_book
+    df = pd.DataFrame(
+        {
+            "bid_depth": top_of_book.column("bid_depth"),
+            "ask_depth": top_of_book.column("ask_depth"),
+        },
+        index=top_of_book.column("time"),
+    )
     df["bid_depth"] = df["bid_depth"].rolling(window=window).mean()
     df["ask_depth"] = df["ask_depth"].rolling(window=window).mean()
     df["depth_difference"] = df["ask_depth"] + df["bid_depth"]
@@ -596,8 +574,8 @@ def vwap(market: Market, window: int = 100) -> pd.DataFrame:
     Parameters:
     -----------
     market : Market
-        An object representing the market, which must have a 'trade_history' attribute.
-        Each trade in the history should be a dictionary with 'price', 'volume', and 'time' keys.
+        An object representing the market, which must have a 'trades' attribute
+        holding its trade tape.
     window : int, optional
         The size of the rolling window. Default is 100.
 
@@ -606,8 +584,7 @@ def vwap(market: Market, window: int = 100) -> pd.DataFrame:
     pd.DataFrame
         A DataFrame with a 'vwap' column, indexed by time.
     """
-    # Convert trade history to DataFrame
-    trades_df = pd.DataFrame(market.trade_history)
+    trades_df = market.trades.to_pandas()
     trades_df.set_index("time", inplace=True)
 
     # Calculate VWAP
@@ -632,9 +609,8 @@ def trade_midprice_deviation(market: Market, window: int = 100) -> pd.DataFrame:
     Parameters:
     -----------
     market : Market
-        An object representing the market, which must have an 'ob_snapshots' and 'trade_history' attribute.
-        Each snapshot should be a dictionary with 'bid' and 'ask' keys, containing lists of price-volume pairs.
-        Each trade in the history should be a dictionary with 'price' and 'time' keys.
+        An object representing the market, which must have 'top_of_book' and 'trades'
+        attributes.
     window : int, optional
         The size of the rolling window. Default is 100.
 
@@ -643,22 +619,14 @@ def trade_midprice_deviation(market: Market, window: int = 100) -> pd.DataFrame:
     pd.DataFrame
         A DataFrame with a 'trade_midprice_deviation' column, indexed by time.
     """
-    # Extract midprices from order book snapshots
-    midprices = [
-        (
-            (snapshot["bid"][0]["price"] + snapshot["ask"][0]["price"]) / 2
-            if snapshot["bid"] and snapshot["ask"]
-            else None
-        )
-        for snapshot in market.ob_snapshots
-    ]
-    ob_time = [snapshot["time"] for snapshot in market.ob_snapshots]
-
-    # Convert trade history to DataFrame
-    trades_df = pd.DataFrame(market.trade_history)
+    trades_df = market.trades.to_pandas()
     trades_df.set_index("time", inplace=True)
 
-    ob_midprices = pd.DataFrame(midprices, index=ob_time, columns=["midprice"])
+    top_of_book = market.top_of_book
+    ob_midprices = pd.DataFrame(
+        {"midprice": top_of_book.column("midprice")},
+        index=top_of_book.column("time"),
+    )
     summary = trades_df.join(ob_midprices, how="outer")
     summary.dropna(inplace=True)
     # Calculate deviation from midprice
@@ -679,8 +647,8 @@ def realized_volatility(market: Market, window: int = 100) -> pd.DataFrame:
     Parameters:
     -----------
     market : Market
-        An object representing the market, which must have a 'trade_history' attribute.
-        Each trade in the history should be a dictionary with 'price' and 'time' keys.
+        An object representing the market, which must have a 'trades' attribute
+        holding its trade tape.
     window : int, optional
         The size of the rolling window. Default is 100.
 
@@ -689,8 +657,7 @@ def realized_volatility(market: Market, window: int = 100) -> pd.DataFrame:
     pd.DataFrame
         A DataFrame with a 'realized_volatility' column, indexed by time.
     """
-    # Convert trade history to DataFrame
-    trades_df = pd.DataFrame(market.trade_history)
+    trades_df = market.trades.to_pandas()
     trades_df.set_index("time", inplace=True)
 
     # Calculate log returns
@@ -719,8 +686,8 @@ def roll_spread_estimator(
     Parameters:
     -----------
     market : Market
-        An object representing the market, which must have a 'trade_history' attribute.
-        Each trade in the history should be a dictionary with 'price' and 'time' keys.
+        An object representing the market, which must have a 'trades' attribute
+        holding its trade tape.
     window_size : int, optional (default=100)
         The size of the rolling window for spread estimation.
     relative : bool, optional (default=False)
@@ -737,12 +704,7 @@ def roll_spread_estimator(
     roll_spread = mult * sqrt(-cov(delta_price_t, delta_price_t-1))
     where mult is 200 for relative changes and 2 for absolute changes.
     """
-    trade_data = [
-        {"price": trade["price"], "time": trade["time"]}
-        for trade in market.trade_history
-    ]
-
-    df = pd.DataFrame(trade_data)
+    df = market.trades.to_pandas()[["price", "time"]]
     df.set_index("time", inplace=True)
 
     if relative:
@@ -774,8 +736,8 @@ def news_goodness(market: Market, window: int = 20) -> pd.DataFrame:
     Parameters:
     -----------
     market : Market
-        An object representing the market, which must have a 'trade_history' attribute.
-        Each trade in the history should be a dictionary with 'price', 'time', and 'news' keys.
+        An object representing the market, which must have a 'trades' attribute
+        holding its trade tape.
     window : int, optional
         The size of the rolling window. Default is 100.
 
@@ -785,5 +747,5 @@ def news_goodness(market: Market, window: int = 20) -> pd.DataFrame:
         A DataFrame with a 'news_goodness' column, indexed by time.
     """
     # Convert trade history to DataFrame
-    news_history = pd.DataFrame(market.news_history)
+    news_history = pd.DataFrame(market.news_history.to_numpy())
     return news_history
@@ -19,26 +19,14 @@ def position_history(trader: Trader) -> Tuple[List[int], List[int]]:
             - List of timestamps
             - List of positions at each timestamp
     """
-    position = 0
-    position_history = [0]
-    position_timestamps = [0]
+    timestamps = np.arange(trader.market.last_submission_time + 1)
+    fills = trader.filled_trades.to_numpy()
 
-    final_timestamp = trader.market.last_submission_time
-    trade_index = 0
-    filled_trades = trader.filled_trades
-
-    for timestamp in range(1, final_timestamp + 1):
-        while (
-            trade_index < len(filled_trades)
-            and filled_trades[trade_index]["time"] == timestamp
-        ):
-            position += filled_trades[trade_index]["volume"]
-            trade_index += 1
+    # Position after each fill, looked up at the end of each timestamp
+    n_fills = np.searchsorted(fills["time"], timestamps, side="right")
+    position = np.concatenate(([0.0], np.cumsum(fills["volume"])))[n_fills]
 
-        position_history.append(position)
-        position_timestamps.append(timestamp)
-
-    return position_timestamps, position_history
+    return timestamps.tolist(), position.tolist()
 
 
 def profit_history(trader: Trader) -> Tuple[List[int], List[float]]:
@@ -53,34 +41,36 @@ def profit_history(trader: Trader) -> Tuple[List[int], List[float]]:
             - List of timestamps
             - List of cumulative profits at each timestamp
     """
-    realized_profit = 0
-    position = 0
-    profit = [0]
-    profit_timestamps = [0]
-
     final_timestamp = trader.market.last_submission_time
-    trade_history = trader.filled_trades
-    trade_index = 0
-    midprices = dict(trader.market.midprices)
-
-    for timestamp in range(1, final_timestamp + 1):
-        while (
-            trade_index < len(trade_history)
-            and trade_history[trade_index]["time"] == timestamp
-        ):
-            trade = trade_history[trade_index]
-            realized_profit -= trade["volume"] * trade["price"]
-            position += trade["volume"]
-            trade_index += 1
-
-        midprice = midprices.get(timestamp, midprices[timestamp - 1])
-        total_profit = realized_profit + position * midprice
-        profit.append(total_profit)
-        profit_timestamps.append(timestamp)
+    timestamps = np.arange(1, final_timestamp + 1)
+    fills = trader.filled_trades.to_numpy()
+    volumes = fills["volume"]
+
+    # Cash and position after each trade, looked up at the end of each timestamp
+    n_trades = np.searchsorted(fills["time"], timestamps, side="right")
+    cash = np.concatenate(([0.0], np.cumsum(-volumes * fills["price"])))[n_trades]
+    position = np.concatenate(([0.0], np.cumsum(volumes)))[n_trades]
+
+    # Latest mark price recorded at or before each timestamp. The market's current
+    # mark price covers events after the last recorded snapshot.
+    midprices = trader.market.midprices
+    mark_times = np.append(midprices["time"], final_timestamp)
+    mark_prices = np.append(midprices["mark_price"], trader.market.mark_price)
+    n_marks = np.searchsorted(mark_times, timestamps, side="right")
+    marks = np.concatenate(([0.0], mark_prices))[n_marks]
+
+    profit = [0] + (cash + position * marks).tolist()
+    profit_timestamps = [0] + timestamps.tolist()
 
     return profit_timestamps, profit
 
 
+def _fill_volumes(trader: Trader) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the absolute volume of each fill and whether the trader was aggressor."""
+    fills = trader.filled_trades.to_numpy()
+    return np.abs(fills["volume"]), fills["volume"] * fills["aggressor_side"] > 0
+
+
 def calculate_trader_metrics(trader: Trader) -> Dict[str, float]:
     """
     Calculate various performance metrics for a trader.
@@ -97,15 +87,12 @@ def calculate_trader_metrics(trader: Trader) -> Dict[str, float]:
     profit_series = pd.Series(profit_hist)
     profit_diff = profit_series.diff()
 
-    filled_trades = trader.filled_trades
-    total_volume = sum(abs(trade["volume"]) for trade in filled_trades)
-
-    aggressor_volume = sum(
-        abs(trade["volume"])
-        for trade in filled_trades
-        if trade["volume"] * trade["aggressor_side"] > 0
-    )
+    volumes, aggressive = _fill_volumes(trader)
+    n_fills = len(volumes)
+    total_volume = volumes.sum()
+    aggressor_volume = volumes[aggressive].sum()
     passive_volume = total_volume - aggressor_volume
+    positions = np.asarray(pos_hist)
 
     return {
         "final_profit": profit_hist[-1],
@@ -115,18 +102,18 @@ def calculate_trader_metrics(trader: Trader) -> Dict[str, float]:
         "information_ratio": (
             profit_diff.mean() / profit_diff.std() if profit_diff.std() != 0 else 0
         ),
-        "total_trades": len(filled_trades),
+        "total_trades": n_fills,
         "volume_traded": total_volume,
         "profit_per_volume": profit_hist[-1] / total_volume if total_volume != 0 else 0,
-        "average_trade_size": total_volume / len(filled_trades) if filled_trades else 0,
+        "average_trade_size": total_volume / n_fills if n_fills else 0,
         "fill_rate": (
             total_volume / sum(abs(order.volume) for order in trader.orders)
             if trader.orders
             else 0
         ),
-        "time_in_market": sum(1 for pos in pos_hist if pos != 0) / len(pos_hist),
-        "mean_position": np.mean(pos_hist),
-        "mean_abs_position": np.mean(np.abs(pos_hist)),
+        "time_in_market": np.count_nonzero(positions) / len(positions),
+        "mean_position": positions.mean(),
+        "mean_abs_position": np.abs(positions).mean(),
         "volume_as_aggressor": aggressor_volume,
         "volume_as_passive": passive_volume,
         "aggressor_ratio": aggressor_volume / total_volume if total_volume != 0 else 0,
@@ -186,7 +173,7 @@ def total_trades(trader: Trader) -> int:
 
 def volume_traded(trader: Trader) -> float:
     """Calculate the total volume traded by a trader."""
-    return sum(abs(trade["volume"]) for trade in trader.filled_trades)
+    return _fill_volumes(trader)[0].sum()
 
 
 def profit_per_volume(trader: Trader) -> float:
@@ -225,20 +212,14 @@ def mean_abs_position(trader: Trader) -> float:
 
 def volume_as_aggressor(trader: Trader) -> float:
     """Calculate the volume traded as an aggressor."""
-    return sum(
-        abs(trade["volume"])
-        for trade in trader.filled_trades
-        if trade["volume"] * trade["aggressor_side"] > 0
-    )
+    volumes, aggressive = _fill_volumes(trader)
+    return volumes[aggressive].sum()
 
 
 def volume_as_passive(trader: Trader) -> float:
     """Calculate the volume traded as a passive participant."""
-    return sum(
-        abs(trade["volume"])
-        for trade in trader.filled_trades
-        if trade["volume"] * trade["aggressor_side"] < 0
-    )
+    volumes, aggressive = _fill_volumes(trader)
+    return volumes[~aggressive].sum()
 
 
 def aggressor_ratio(trader: Trader) -> float:
@@ -1,7 +1,36 @@
 """Base order class."""
 
-from typing import Union
-import numpy as np
+from enum import IntEnum
+from typing import Optional, Union
+
+
+class OrderStatus(IntEnum):
+    """
+    The lifecycle status of an order.
+
+    Statuses are small integers, but compare equal to their lower-case names, so
+    ``order.status == "filled"`` keeps working.
+    """
+
+    CREATED = 0
+    ACTIVE = 1
+    PARTIAL = 2
+    FILLED = 3
+    CANCELED = 4
+    REJECTED = 5
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, str):
+            return self.name.lower() == other
+        return int.__eq__(self, other)
+
+    def __ne__(self, other) -> bool:
+        return not self == other
+
+    __hash__ = IntEnum.__hash__
+
+    def __str__(self) -> str:
+        return self.name.lower()
 
 
 class Order:
@@ -9,17 +38,24 @@ class Order:
     Represents a generic order.
 
     This class serves as a base class for specific order types. It provides the basic
-    structure for managing order status and volume.
+    structure for managing order status and volume. Orders use ``__slots__`` to keep
+    their memory footprint small, since a simulation can create millions of them.
 
     Attributes:
     -----------
+    id : int or None
+        The order ID, assigned by the market when the order is submitted.
     trader_id : int
         The ID of the trader submitting the order.
     volume : int
-        The volume of the order.
+        The volume of the order (positive to buy, negative to sell).
+    side : int
+        1 for buy orders, -1 for sell orders.
+    price : int or None
+        The limit price in ticks, or None for market orders.
     time : int or float
         The timestamp of the order submission.
-    status : str
+    status : OrderStatus
         The status of the order.
     filled : int
         The volume of the order that has been filled.
@@ -30,21 +66,31 @@ class Order:
         Calculate the volume of the order that has not yet been filled.
     """
 
-    _id_counter = 0
+    __slots__ = (
+        "id",
+        "trader_id",
+        "volume",
+        "side",
+        "price",
+        "time",
+        "status",
+        "filled",
+    )
 
     def __init__(self, trader_id: int, volume: int) -> None:
         """Initialize a new Order."""
         if volume == 0:
             raise ValueError("Order volume must be non-zero.")
+        self.id: Optional[int] = None
         self.trader_id = trader_id
         self.volume = volume
+        self.side = 1 if volume > 0 else -1
+        self.price: Optional[int] = None
         self.time = None
-        self.status = "created"
+        self.status = OrderStatus.CREATED
         self.filled = 0
-        self.id = Order._id_counter
-        Order._id_counter += 1
 
     @property
-    def active_volume(self) -> int:
+    def active_volume(self) -> Union[int, float]:
         """Calculate the volume of the order that has not yet been filled."""
         return self.volume - self.filled
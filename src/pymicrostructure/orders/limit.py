@@ -16,13 +16,27 @@ class LimitOrder(Order):
     volume : int
         The volume of the order.
     price : int
-        The price at which the order is submitted.
+        The price at which the order is submitted, in integer ticks.
     """
 
+    __slots__ = ()
+
     def __init__(self, trader_id: int, volume: int, price: int) -> None:
-        """Initialize a new LimitOrder."""
+        """
+        Initialize a new LimitOrder.
+
+        Raises:
+        -------
+        ValueError
+            If ``price`` is not a whole number of ticks.
+        """
         super().__init__(trader_id, volume)
-        self.price = price
+        tick_price = int(price)
+        if tick_price != price:
+            raise ValueError(
+                f"Limit price must be a whole number of ticks, got {price}."
+            )
+        self.price = tick_price
 
     def __repr__(self) -> str:
         """Return a string representation of the order."""
@@ -1,6 +1,5 @@
 """Market order class."""
 
-import numpy as np
 from pymicrostructure.orders.base import Order
 
 
@@ -16,8 +15,8 @@ class MarketOrder(Order):
         The ID of the trader submitting the order.
     volume : int
         The volume of the order.
-    price : float
-        The price at which the order is submitted - infinity for buy orders and negative infinity for sell orders.
+    price : None
+        Market orders have no limit price; they sweep the opposite side of the book.
 
     Methods:
     --------
@@ -25,10 +24,11 @@ class MarketOrder(Order):
         Return a string representation of the order.
     """
 
+    __slots__ = ()
+
     def __init__(self, trader_id: int, volume) -> None:
         """Initialize a new MarketOrder."""
         super().__init__(trader_id, volume)
-        self.price = np.inf if volume > 0 else -np.inf
 
     def __repr__(self) -> str:
         """Return a string representation of the order."""
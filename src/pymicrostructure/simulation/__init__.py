@@ -0,0 +1 @@
+"""Tools for running many market simulations."""
@@ -0,0 +1,190 @@
+"""Parallel Monte Carlo runs of market simulations."""
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import dill
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+from pymicrostructure.markets.base import Market
+
+
+def spawn_seeds(n_runs: int, seed: Optional[int] = None) -> List[int]:
+    """
+    Derive independent run seeds from one root seed.
+
+    Parameters:
+    -----------
+    n_runs : int
+        The number of seeds to derive.
+    seed : int, optional
+        The root seed (default is fresh OS entropy).
+
+    Returns:
+    --------
+    list of int
+        One 32-bit seed per run, spawned from ``numpy.random.SeedSequence``.
+    """
+    children = np.random.SeedSequence(seed).spawn(n_runs)
+    return [int(child.generate_state(1)[0]) for child in children]
+
+
+def _run_one(
+    payload: bytes, ticks: int, seed: int, params: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Build, seed and run one market, returning only its reductions."""
+    factory, reductions = dill.loads(payload)
+    random.seed(seed)
+    np.random.seed(seed)
+    market = factory(seed=seed, **params)
+    market.run(ticks, progress=False)
+    return {name: reduce(market) for name, reduce in reductions.items()}
+
+
+class MonteCarlo:
+    """
+    Runs independent simulations of one configuration across processes.
+
+    A factory builds a market and its participants for a given seed and
+    parameter set, and should pass the seed on to the market. Each run executes
+    in a worker process, and only the results of the reduction functions are
+    sent back, never the market itself. The global ``random`` and
+    ``numpy.random`` generators are also seeded with the run seed before the
+    factory is called, for user callables that draw from them. Every run is
+    therefore reproducible and the results do not depend on the number of
+    workers.
+
+    Attributes:
+    -----------
+    factory : Callable[..., Market]
+        Called as ``factory(seed=seed, **params)`` to build a market whose
+        participants are registered.
+    ticks : int
+        The number of ticks to run each market for.
+    reductions : dict
+        Maps result names to functions that reduce a finished market to a small
+        result, such as a report DataFrame or a metric series.
+    workers : int
+        The number of worker processes. With 1, runs execute in this process.
+
+    Methods:
+    --------
+    run(seeds, params, n_runs, seed)
+        Execute the runs and return their reductions.
+    collect(results, name)
+        Combine one reduction across runs.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[..., Market],
+        ticks: int,
+        reductions: Dict[str, Callable[[Market], Any]],
+        workers: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize a new MonteCarlo runner.
+
+        Parameters:
+        -----------
+        factory : Callable[..., Market]
+            Builds a market with its participants from ``seed`` and the keyword
+            arguments of a parameter set. Lambdas and local functions are fine,
+            since the factory is serialized with dill.
+        ticks : int
+            The number of ticks to run each market for.
+        reductions : dict
+            Maps result names to functions of a finished market.
+        workers : int, optional
+            The number of worker processes (default is the number of CPUs).
+        """
+        if not reductions:
+            raise ValueError("At least one reduction is required.")
+        self.factory = factory
+        self.ticks = ticks
+        self.reductions = reductions
+        self.workers = workers or os.cpu_count() or 1
+
+    def run(
+        self,
+        seeds: Optional[Sequence[int]] = None,
+        params: Optional[Sequence[Dict[str, Any]]] = None,
+        n_runs: Optional[int] = None,
+        seed: Optional[int] = None,
+        progress: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute one run per seed for every parameter set.
+
+        Parameters:
+        -----------
+        seeds : sequence of int, optional
+            The run seeds. If omitted, ``n_runs`` seeds are spawned from ``seed``.
+        params : sequence of dict, optional
+            The parameter sets passed to the factory (default is one empty set).
+        n_runs : int, optional
+            The number of seeds to spawn when ``seeds`` is omitted.
+        seed : int, optional
+            The root seed used to spawn run seeds.
+        progress : bool, optional
+            Whether to show a progress bar over runs (default is True).
+
+        Returns:
+        --------
+        list of dict
+            One dictionary per run, in submission order, with the ``"run"``
+            index, the ``"seed"``, the ``"params"`` and one entry per reduction.
+        """
+        if seeds is None:
+            if n_runs is None:
+                raise ValueError("Either seeds or n_runs must be given.")
+            seeds = spawn_seeds(n_runs, seed)
+        runs = list(product(params or [{}], seeds))
+        payload = dill.dumps((self.factory, self.reductions))
+        args = (
+            [payload] * len(runs),
+            [self.ticks] * len(runs),
+            [run_seed for _, run_seed in runs],
+            [run_params for run_params, _ in runs],
+        )
+
+        if self.workers == 1:
+            values = map(_run_one, *args)
+            values = list(tqdm(values, total=len(runs), disable=not progress))
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                values = executor.map(_run_one, *args)
+                values = list(tqdm(values, total=len(runs), disable=not progress))
+
+        return [
+            {"run": i, "seed": run_seed, "params": run_params, **reduced}
+            for i, ((run_params, run_seed), reduced) in enumerate(zip(runs, values))
+        ]
+
+    @staticmethod
+    def collect(results: List[Dict[str, Any]], name: str) -> Any:
+        """
+        Combine one reduction across runs.
+
+        Parameters:
+        -----------
+        results : list of dict
+            The output of ``run()``.
+        name : str
+            The reduction to combine.
+
+        Returns:
+        --------
+        pandas.DataFrame or pandas.Series
+            DataFrames and Series are concatenated with the run index as the
+            outer key; other values are returned as a Series indexed by run.
+        """
+        values = {result["run"]: result[name] for result in results}
+        if values and all(
+            isinstance(value, (pd.DataFrame, pd.Series)) for value in values.values()
+        ):
+            return pd.concat(values, names=["run"])
+        return pd.Series(values, name=name).rename_axis("run")
@@ -0,0 +1,269 @@
+"""Partitioned, process-parallel stepping of multi-instrument markets."""
+
+import multiprocessing
+import os
+import traceback
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import dill
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+from pymicrostructure.markets.hub import MarketHub
+from pymicrostructure.simulation.montecarlo import spawn_seeds
+
+
+def partition(instruments: Sequence[str], n_parts: int) -> List[List[str]]:
+    """
+    Split instruments into contiguous, nearly equal partitions.
+
+    Parameters:
+    -----------
+    instruments : sequence of str
+        The instrument names.
+    n_parts : int
+        The number of partitions, at most ``len(instruments)``.
+
+    Returns:
+    --------
+    list of list of str
+        The partitions, in order.
+    """
+    bounds = np.linspace(0, len(instruments), n_parts + 1).round().astype(int)
+    return [list(instruments[lo:hi]) for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+
+def _worker(
+    connection,
+    payload: bytes,
+    instruments: List[str],
+    seed: int,
+    all_instruments: List[str],
+    collect_positions: bool,
+) -> None:
+    """Own one partition's hub and step it on the coordinator's commands."""
+    try:
+        factory, reductions = dill.loads(payload)
+        hub = factory(instruments=instruments, seed=seed)
+        while True:
+            command, argument = connection.recv()
+            if command == "start":
+                hub.start(argument)
+                connection.send(("ok", None))
+            elif command == "step":
+                ticks, reference_prices = argument
+                hub.reference_prices = dict(
+                    zip(all_instruments, reference_prices.tolist())
+                )
+                for _ in range(ticks):
+                    hub.step()
+                positions = None
+                if collect_positions:
+                    positions = hub.position_matrix().to_numpy()
+                connection.send(("ok", (hub.mark_prices(), positions)))
+            elif command == "finish":
+                hub.finish()
+                connection.send(
+                    ("ok", {name: reduce(hub) for name, reduce in reductions.items()})
+                )
+                return
+    except Exception:
+        connection.send(("error", traceback.format_exc()))
+    finally:
+        connection.close()
+
+
+class PartitionedHub:
+    """
+    Runs the instruments of a market hub in parallel, one partition per process.
+
+    The instruments are split into contiguous partitions, and each worker
+    process builds its own ``MarketHub`` over one partition with the factory,
+    including its traders, so books and agents never leave their worker.
+    Workers step their hubs independently and meet at a barrier every
+    ``sync_every`` ticks. At the barrier each worker sends only its mark prices
+    (and, with ``collect_positions``, its position matrix) to the coordinator,
+    which broadcasts the mark prices of all instruments back as every hub's
+    ``reference_prices``. Traders that
+    follow instruments of other partitions therefore see their prices with a
+    lag of at most ``sync_every`` ticks.
+
+    Only reductions of the finished hubs are sent back, as in ``MonteCarlo``.
+    Traders and random streams belong to a partition, so results depend on the
+    number of workers, but a given worker count and seed always reproduce the
+    same run.
+
+    Attributes:
+    -----------
+    factory : Callable[..., MarketHub]
+        Called as ``factory(instruments=..., seed=...)`` in each worker to build
+        a hub over a partition, with its traders registered.
+    instruments : list of str
+        All instrument names.
+    reductions : dict
+        Maps result names to functions of a finished hub.
+    workers : int
+        The number of worker processes.
+    sync_every : int
+        The number of ticks between barriers.
+    collect_positions : bool
+        Whether workers send their position matrices at every barrier.
+    partitions : list of list of str
+        The instruments of each worker.
+    reference_prices : pandas.Series
+        The mark price of every instrument at the last barrier.
+    positions : list of pandas.DataFrame
+        The position matrix of each worker's hub at the last barrier, if
+        ``collect_positions`` is set.
+
+    Methods:
+    --------
+    run(ticks, seed, progress)
+        Run all partitions and return their reductions.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[..., MarketHub],
+        instruments: Sequence[str],
+        reductions: Optional[Dict[str, Callable[[MarketHub], Any]]] = None,
+        workers: Optional[int] = None,
+        sync_every: int = 1,
+        collect_positions: bool = False,
+    ) -> None:
+        """
+        Initialize a new PartitionedHub.
+
+        Parameters:
+        -----------
+        factory : Callable[..., MarketHub]
+            Builds a hub with its traders from ``instruments`` and ``seed``.
+            It is serialized with dill, so lambdas and local functions are fine.
+        instruments : sequence of str
+            All instrument names.
+        reductions : dict, optional
+            Maps result names to functions of a finished hub (default is none).
+        workers : int, optional
+            The number of worker processes (default is the number of CPUs,
+            capped at the number of instruments).
+        sync_every : int, optional
+            The number of ticks between barriers (default is 1).
+        collect_positions : bool, optional
+            Whether workers send their position matrices at every barrier
+            (default is False). Building the matrix visits every account, so
+            this adds work to each barrier.
+        """
+        if sync_every < 1:
+            raise ValueError("sync_every must be at least 1.")
+        self.factory = factory
+        self.instruments = list(instruments)
+        self.reductions = reductions or {}
+        self.workers = min(workers or os.cpu_count() or 1, len(self.instruments))
+        self.sync_every = sync_every
+        self.collect_positions = collect_positions
+        self.partitions = partition(self.instruments, self.workers)
+        self._mark_prices = np.full(len(self.instruments), np.nan)
+        self._positions: List[Optional[np.ndarray]] = []
+
+    @property
+    def reference_prices(self) -> pd.Series:
+        """The mark price of every instrument at the last barrier."""
+        return pd.Series(self._mark_prices, index=self.instruments)
+
+    @property
+    def positions(self) -> List[pd.DataFrame]:
+        """The position matrix of each worker's hub at the last barrier."""
+        return [
+            pd.DataFrame(positions, columns=instruments).rename_axis("trader_id")
+            for positions, instruments in zip(self._positions, self.partitions)
+            if positions is not None
+        ]
+
+    def run(
+        self, ticks: int, seed: Optional[int] = None, progress: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Run all partitions for ``ticks`` ticks.
+
+        Parameters:
+        -----------
+        ticks : int
+            The number of ticks to run.
+        seed : int, optional
+            The root seed; each worker's hub gets a seed spawned from it.
+        progress : bool, optional
+            Whether to show a progress bar over barriers (default is True).
+
+        Returns:
+        --------
+        list of dict
+            One dictionary per worker with its ``"worker"`` index, its
+            ``"instruments"``, its ``"seed"`` and one entry per reduction.
+        """
+        payload = dill.dumps((self.factory, self.reductions))
+        seeds = spawn_seeds(self.workers, seed)
+        connections = []
+        processes = []
+        for instruments, worker_seed in zip(self.partitions, seeds):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_worker,
+                args=(
+                    child,
+                    payload,
+                    instruments,
+                    worker_seed,
+                    self.instruments,
+                    self.collect_positions,
+                ),
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            connections.append(parent)
+            processes.append(process)
+
+        self._mark_prices = np.full(len(self.instruments), np.nan)
+        self._positions = []
+        try:
+            self._broadcast(connections, "start", ticks)
+            steps = range(0, ticks, self.sync_every)
+            for start in tqdm(steps, disable=not progress):
+                n = min(self.sync_every, ticks - start)
+                replies = self._broadcast(connections, "step", (n, self._mark_prices))
+                self._mark_prices = np.concatenate([prices for prices, _ in replies])
+                self._positions = [positions for _, positions in replies]
+            reduced = self._broadcast(connections, "finish", None)
+        finally:
+            for connection in connections:
+                connection.close()
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+
+        return [
+            {"worker": i, "instruments": instruments, "seed": worker_seed, **values}
+            for i, (instruments, worker_seed, values) in enumerate(
+                zip(self.partitions, seeds, reduced)
+            )
+        ]
+
+    @staticmethod
+    def _broadcast(connections: List[Any], command: str, argument: Any) -> List[Any]:
+        """Send a command to every worker and wait for all replies (the barrier)."""
+        for connection in connections:
+            try:
+                connection.send((command, argument))
+            except OSError:
+                # The worker has exited; its error reply is read below.
+                pass
+        replies = []
+        for connection in connections:
+            try:
+                status, value = connection.recv()
+            except EOFError:
+                raise RuntimeError("A partition worker exited unexpectedly.")
+            if status == "error":
+                raise RuntimeError(f"A partition worker failed:\n{value}")
+            replies.append(value)
+        return replies
@@ -1,9 +1,10 @@
 """Base class for traders in a market simulation."""
 
 import numpy as np
-import random
 from typing import Type
 from pymicrostructure.markets.base import Market
+from pymicrostructure.markets.scheduler import ArrivalProcess, EveryTick
+from pymicrostructure.markets.tape import FillRecords
 from pymicrostructure.orders.market import MarketOrder
 from pymicrostructure.orders.limit import LimitOrder
 from pymicrostructure.utils.utils import protect
@@ -26,18 +27,37 @@ class Trader(
         The market instance in which the trader participates.
     orders : list
         A list of orders submitted by the trader.
-    filled_trades : list
-        A list of trades that have been executed for the trader.
+    active_orders : dict
+        The trader's orders resting in the book, keyed by order id.
+    inactive_orders : History
+        Orders that were filled, cancelled or rejected.
+    fills : RecordBuffer
+        The trader's fills as ``(trade, side)`` rows, where ``trade`` is the row
+        of the fill on the market's trade tape and ``side`` is 1 for a buy and -1
+        for a sell.
+    filled_trades : FillRecords
+        A list of trades that have been executed for the trader, generated from
+        ``fills`` on access.
     position : int or float
         The current position of the trader in the market.
+    cash : float
+        The trader's cash balance, starting at zero.
     include_in_results : bool
         Flag indicating whether to include this trader in result calculations.
+    rng : numpy.random.Generator
+        The trader's own random stream, spawned from the market's seed.
+    arrival : ArrivalProcess
+        When the market wakes the trader up to call ``update()`` (default is
+        every tick). Set it before the market runs.
     trader_id : int
-        A unique identifier for the trader within the market.
+        A unique identifier for the trader within the market. It is None while
+        the trader waits in a market's ``deferred_registration()`` block.
 
     Methods:
     --------
-    cancel_orders(side)
+    cancel_order_by_id(order_id)
+        Cancel an active or partially filled order by its id.
+    cancel_orders_by_side(side)
         Cancel active or partially filled orders on a specific side.
     cancel_all_orders()
         Cancel all active or partially filled orders.
@@ -62,16 +82,32 @@ class Trader(
         """
         self.market = market
         self.orders = []
-        self.active_orders = []
-        self.inactive_orders = []
-        self.filled_trades = []
+        self.active_orders = {}
+        self.inactive_orders = market.create_history("inactive-orders")
+        # Most traders fill rarely, so the buffer starts small and grows on demand.
+        self.fills = market.create_records(
+            [("trade", "i8"), ("side", "i1")], "fills", chunk_size=64
+        )
         self.position = 0
+        self.cash = 0.0
         self.include_in_results = include_in_results
+        self.arrival: ArrivalProcess = EveryTick()
+        self.rng: np.random.Generator = market.spawn_rng()
         self.fair_price = market.initial_fair_price
-        self.market.participants.append(self)
-        self.trader_id = self.market.participants.index(self)
+        deferred = market.deferred_participants
+        if deferred is None:
+            self.trader_id = market.register_participant(self)
+        else:
+            # Registered with the rest of the batch by ``register_participants``.
+            self.trader_id = None
+            deferred.append(self)
         self.name = name
 
+    @property
+    def filled_trades(self) -> FillRecords:
+        """The trader's fills as a list of dictionaries."""
+        return FillRecords(self.market.trades, self.fills)
+
     def cancel_order_by_id(self, order_id: int) -> None:
         """
         Cancel an order by its unique identifier.
@@ -81,15 +117,9 @@ class Trader(
         order_id : int
             The unique identifier of the order to cancel.
         """
-        for order in self.active_orders:
-            if order.id == order_id:
-                order.status = "canceled"
-                self.market.msg_history.append((self.trader_id, "CANCEL", order))
-                self.market.cancellations.append(order)
-                self.active_orders.remove(order)
-                self.inactive_orders.append(order)
-                break
-        self.market.drop_cancelled_orders()
+        order = self.active_orders.get(order_id)
+        if order is not None:
+            self.market.cancel_order(order)
 
     def cancel_orders_by_side(self, side: str) -> None:
         """
@@ -100,21 +130,14 @@ class Trader(
         side : str
             The side of the market (either 'buy' or 'sell') on which to cancel orders.
         """
-        for order in self.active_orders:
-            if order.side == side:
-                order.status = "canceled"
-                self.market.msg_history.append((self.trader_id, "CANCEL", order))
-                self.market.cancellations.append(order)
-                self.inactive_orders.append(order)
-        self.active_orders = [o for o in self.active_orders if o.status == "active"]
-        self.market.drop_cancelled_orders()
+        if side not in ("buy", "sell"):
+            raise ValueError("Side must be either 'buy' or 'sell'.")
+        sign = 1 if side == "buy" else -1
+        for order in list(self.active_orders.values()):
+            if order.volume * sign > 0:
+                self.market.cancel_order(order)
 
     def cancel_all_orders(self) -> None:
         """Cancel all active or partially filled orders for this trader."""
-        for order in self.active_orders:
-            order.status = "canceled"
-            self.market.msg_history.append((self.trader_id, "CANCEL", order))
-            self.market.cancellations.append(order)
-            self.inactive_orders.append(order)
-        self.active_orders = []
-        self.market.drop_cancelled_orders()
+        for order in list(self.active_orders.values()):
+            self.market.cancel_order(order)
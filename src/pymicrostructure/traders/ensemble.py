@@ -1,9 +1,14 @@
 """Tools for creating ensembles of traders."""
 
+from contextlib import ExitStack
+
 
 def ensemble_traders(trader, params_dict):
     """Create an ensemble of traders with different parameter sets.
 
+    The traders of each market are registered together with one
+    ``register_participants`` call once the whole ensemble is built.
+
     Parameters:
     -----------
     trader : class
@@ -17,8 +22,12 @@ def ensemble_traders(trader, params_dict):
         A list of trader instances.
     """
     instances = []
-    for param_set in zip(*params_dict.values()):
-        instance = trader(**dict(zip(params_dict.keys(), param_set)))
-        instance.include_in_results = False
-        instances.append(instance)
+    markets = {id(market): market for market in params_dict.get("market", [])}
+    with ExitStack() as stack:
+        for market in markets.values():
+            stack.enter_context(market.deferred_registration())
+        for param_set in zip(*params_dict.values()):
+            instance = trader(**dict(zip(params_dict.keys(), param_set)))
+            instance.include_in_results = False
+            instances.append(instance)
     return instances
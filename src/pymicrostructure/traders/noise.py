@@ -1,12 +1,13 @@
 # trader.py
 """Base classes for noise traders."""
 import numpy as np
-import random
 from typing import Type
 from pymicrostructure.markets.base import Market
+from pymicrostructure.markets.scheduler import BernoulliArrivals
 from pymicrostructure.orders.market import MarketOrder
 from pymicrostructure.orders.limit import LimitOrder
 from pymicrostructure.traders.base import Trader
+from pymicrostructure.utils.draws import RandomBuffer
 from typing import Union, Type, Callable
 
 
@@ -25,6 +26,13 @@ class NoiseTrader(Trader):
         The rate at which the trader submits orders.
     volume_size : int or Callable[[], int]
         The size of the orders submitted by the trader.
+    event_driven : bool
+        If True, the trader is only woken on the ticks it submits an order,
+        drawn by a ``BernoulliArrivals`` process with the submission rate,
+        instead of being woken every tick to draw whether to submit.
+    draws : RandomBuffer
+        Pre-drawn uniforms from the trader's random stream, used for the
+        submission and side draws.
     """
 
     def __init__(
@@ -32,11 +40,16 @@ class NoiseTrader(Trader):
         market: Market,
         submission_rate: float = 1.00,
         volume_size: Union[int, Callable[[], int]] = 1,
+        event_driven: bool = False,
     ) -> None:
         """Initialize a new NoiseTrader."""
         super().__init__(market)
         self.submission_rate = submission_rate
         self.volume_size = volume_size
+        self.event_driven = event_driven
+        self.draws = RandomBuffer(self.rng)
+        if event_driven:
+            self.arrival = BernoulliArrivals(min(submission_rate, 1))
 
     def _get_volume(self) -> int:
         """Get the volume of the next order."""
@@ -50,9 +63,10 @@ class NoiseTrader(Trader):
         # Submit a predefined order, for example:
         volume = abs(int(self._get_volume()))
 
-        if np.random.rand() < self.submission_rate and volume > 0:
+        submit = self.event_driven or self.draws.random() < self.submission_rate
+        if submit and volume > 0:
             order = MarketOrder(
                 trader_id=self.trader_id,
-                volume=volume * random.choice([-1, 1]),
+                volume=volume * self.draws.sign(),
             )
             self.market.submit_order(order)
@@ -147,10 +147,7 @@ class OrderFlowSignFairPrice(FairPriceStrategy):
         Returns:
             int: The calculated fair price.
         """
-        orderflow = trader.market.get_recent_trades(self.window)
-        orderflow = sum(
-            [trade["volume"] * trade["aggressor_side"] for trade in orderflow]
-        )
+        orderflow, _ = trader.market.order_flow(self.window)
         return trader.fair_price + self.aggressiveness * int(np.sign(orderflow))
 
 
@@ -180,9 +177,7 @@ class OrderFlowMagnitudeFairPrice(FairPriceStrategy):
         Returns:
             int: The calculated fair price.
         """
-        trades = trader.market.get_recent_trades(self.window)
-        orderflow = sum([trade["volume"] * trade["aggressor_side"] for trade in trades])
-        total_volume = sum([trade["volume"] for trade in trades])
+        orderflow, total_volume = trader.market.order_flow(self.window)
         indicator = orderflow / total_volume if total_volume != 0 else 0
         return trader.fair_price + int(indicator * self.aggressiveness * 3)
 
@@ -245,7 +240,7 @@ class NewsImpactExponentialFairPrice(FairPriceStrategy):
         """
         if trader.market.current_tick < self.window:
             return trader.fair_price
-        news = sum(trader.market.news_history[-self.window :]) / self.window
+        news = trader.market.news_history.window_mean(self.window)
         return trader.fair_price + int(np.exp(news * self.agressiveness))
 
 
@@ -421,10 +416,7 @@ class OrderFlowImbalanceSpread(SpreadStrategy):
         Returns:
             Tuple[int, int]: The bid and ask spreads.
         """
-        trades = trader.market.get_recent_trades(self.window)
-        orderflow = sum([trade["volume"] * trade["aggressor_side"] for trade in trades])
-
-        total_volume = sum([trade["volume"] for trade in trades])
+        orderflow, total_volume = trader.market.order_flow(self.window)
         indicator = orderflow / total_volume if total_volume != 0 else 0
         bid_offset = min(int(indicator * self.aggressiveness), -self.min_halfspread)
         ask_offset = max(int(indicator * self.aggressiveness), self.min_halfspread)
@@ -0,0 +1,482 @@
+"""Growable NumPy buffers and bounded histories for simulation output."""
+
+import os
+import pickle
+import shutil
+import tempfile
+import weakref
+from itertools import chain
+from typing import Any, Dict, Iterator, List, Optional, Union
+import numpy as np
+import pandas as pd
+
+
+class _SpillFiles:
+    """
+    A lazily created directory of numbered chunk files.
+
+    The directory is removed by ``remove()`` or, at the latest, when the object
+    is garbage collected or the interpreter exits.
+    """
+
+    def __init__(self, name: str, spill_dir: Optional[str]) -> None:
+        self.name = name
+        self.spill_dir = spill_dir
+        self.directory: Optional[str] = None
+        self.paths: List[str] = []
+        self._finalizer: Optional[weakref.finalize] = None
+
+    def next_path(self, suffix: str) -> str:
+        if self.directory is None:
+            if self.spill_dir is not None:
+                os.makedirs(self.spill_dir, exist_ok=True)
+            self.directory = tempfile.mkdtemp(
+                prefix=f"{self.name}-", dir=self.spill_dir
+            )
+            self._finalizer = weakref.finalize(
+                self, shutil.rmtree, self.directory, True
+            )
+        path = os.path.join(self.directory, f"{len(self.paths):06d}{suffix}")
+        self.paths.append(path)
+        return path
+
+    def remove(self) -> None:
+        if self._finalizer is not None:
+            self._finalizer()
+        self._finalizer = None
+        self.directory = None
+        self.paths = []
+
+
+class RecordBuffer:
+    """
+    A growable, preallocated NumPy record array.
+
+    Rows are written into a preallocated structured array whose capacity grows by
+    whole chunks when it runs out (at least doubling), so appends are amortized
+    O(1). ``view()`` returns a zero-copy view of the rows held in memory, which
+    makes per-field analysis a slice instead of a loop over Python objects.
+
+    When ``memory_rows`` is set, only that many recent rows are kept in memory.
+    Older rows are spilled in chunks of ``chunk_size`` rows to ``.npy`` files in
+    ``spill_dir`` (a temporary directory by default) and read back memory-mapped.
+    Indexing, iteration, ``column()`` and ``to_numpy()`` cover spilled and
+    in-memory rows alike, so readers see one sequence either way.
+
+    Views are only valid until the next append that grows or spills the buffer;
+    take a copy if a view must outlive further recording.
+
+    Attributes:
+    -----------
+    dtype : numpy.dtype
+        The structured dtype of a row.
+    chunk_size : int
+        The minimum number of rows added when the buffer grows, and the number
+        of rows per spilled file. Capped at ``memory_rows``.
+    memory_rows : int or None
+        The maximum number of rows kept in memory, or None for no limit.
+
+    Methods:
+    --------
+    append(row)
+        Append one row, given as a tuple in field order.
+    view()
+        Return a zero-copy view of the rows held in memory.
+    column(name)
+        Return one field of all recorded rows.
+    tail(n)
+        Return the last ``n`` rows.
+    take(indices)
+        Return the rows at the given positions.
+    to_numpy()
+        Return all recorded rows as one array.
+    to_pandas()
+        Return the recorded rows as a DataFrame.
+    restore(rows)
+        Replace the contents with previously saved rows.
+    """
+
+    def __init__(
+        self,
+        dtype: Any,
+        chunk_size: int = 4096,
+        memory_rows: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+        name: str = "records",
+    ) -> None:
+        """
+        Initialize an empty buffer.
+
+        Parameters:
+        -----------
+        dtype : numpy dtype-like
+            The structured dtype of a row.
+        chunk_size : int, optional
+            The initial capacity and minimum growth step in rows (default is 4096).
+        memory_rows : int, optional
+            The maximum number of rows kept in memory (default is no limit).
+        spill_dir : str, optional
+            The directory spilled chunks are written under (default is the
+            system temporary directory).
+        name : str, optional
+            A name used as the prefix of the spill directory (default is "records").
+        """
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be at least 1.")
+        if memory_rows is not None and memory_rows < 1:
+            raise ValueError("memory_rows must be at least 1.")
+        self.dtype = np.dtype(dtype)
+        self.chunk_size = min(chunk_size, memory_rows or chunk_size)
+        self.memory_rows = memory_rows
+        self._data = np.empty(self.chunk_size, dtype=self.dtype)
+        self._size = 0
+        self._files = _SpillFiles(name, spill_dir)
+        self._spilled_rows = 0
+
+    def __len__(self) -> int:
+        return self._spilled_rows + self._size
+
+    def __getitem__(self, index: Union[int, slice, str]):
+        if isinstance(index, str):
+            return self.column(index)
+        if isinstance(index, slice):
+            return self._slice(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("record index out of range")
+        if index >= self._spilled_rows:
+            return self._data[index - self._spilled_rows]
+        return self._load(index // self.chunk_size)[index % self.chunk_size]
+
+    def __iter__(self) -> Iterator:
+        chunks = (self._load(i) for i in range(len(self._files.paths)))
+        return chain.from_iterable(chain(chunks, (self.view(),)))
+
+    @property
+    def spilled_rows(self) -> int:
+        """The number of rows written to disk."""
+        return self._spilled_rows
+
+    def append(self, row: tuple) -> None:
+        """
+        Append one row.
+
+        Parameters:
+        -----------
+        row : tuple
+            The field values of the row, in dtype field order.
+        """
+        if self._size == len(self._data):
+            self._reserve(self._size + 1)
+        self._data[self._size] = row
+        self._size += 1
+        if self.memory_rows is not None and self._size > self.memory_rows:
+            self._spill()
+
+    def extend(self, rows: np.ndarray) -> None:
+        """
+        Append several rows at once.
+
+        Parameters:
+        -----------
+        rows : numpy.ndarray
+            A structured array with the buffer's dtype.
+        """
+        n = len(rows)
+        if self._size + n > len(self._data):
+            self._reserve(self._size + n)
+        self._data[self._size : self._size + n] = rows
+        self._size += n
+        if self.memory_rows is not None and self._size > self.memory_rows:
+            self._spill()
+
+    def view(self) -> np.ndarray:
+        """Return a zero-copy view of the rows held in memory."""
+        return self._data[: self._size]
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Return one field of all recorded rows.
+
+        The result is a zero-copy view unless rows have been spilled to disk.
+        """
+        if not self._spilled_rows:
+            return self._data[name][: self._size]
+        return np.concatenate(
+            [self._load(i)[name] for i in range(len(self._files.paths))]
+            + [self._data[name][: self._size]]
+        )
+
+    def tail(self, n: int) -> np.ndarray:
+        """Return the last ``n`` rows (a zero-copy view if they are in memory)."""
+        if n <= self._size:
+            return self._data[self._size - n : self._size]
+        return self._slice(slice(max(len(self) - n, 0), len(self)))
+
+    def take(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Return the rows at the given positions, in the order given.
+
+        Only the spilled chunks that hold one of the rows are read from disk.
+
+        Parameters:
+        -----------
+        indices : numpy.ndarray
+            Integer row positions.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        spilled = self._spilled_rows
+        if not spilled:
+            return self.view()[indices]
+        indices = np.where(indices < 0, indices + len(self), indices)
+        if indices.size and not (0 <= indices.min() and indices.max() < len(self)):
+            raise IndexError("record index out of range")
+        rows = np.empty(len(indices), dtype=self.dtype)
+        in_memory = indices >= spilled
+        rows[in_memory] = self._data[indices[in_memory] - spilled]
+        on_disk = np.flatnonzero(~in_memory)
+        chunk_of = indices[on_disk] // self.chunk_size
+        order = np.argsort(chunk_of, kind="stable")
+        chunks, starts = np.unique(chunk_of[order], return_index=True)
+        groups = np.split(on_disk[order], starts[1:])
+        for chunk, positions in zip(chunks.tolist(), groups):
+            rows[positions] = self._load(chunk)[indices[positions] % self.chunk_size]
+        return rows
+
+    def to_numpy(self) -> np.ndarray:
+        """
+        Return all recorded rows as one array.
+
+        The result is a zero-copy view unless rows have been spilled to disk.
+        """
+        if not self._spilled_rows:
+            return self.view()
+        return self._slice(slice(0, len(self)))
+
+    def to_pandas(self) -> pd.DataFrame:
+        """Return the recorded scalar fields as a DataFrame."""
+        data = self.to_numpy()
+        columns: Dict[str, np.ndarray] = {
+            name: data[name]
+            for name in self.dtype.names
+            if self.dtype.fields[name][0].shape == ()
+        }
+        return pd.DataFrame(columns)
+
+    def clear(self) -> None:
+        """Drop all recorded rows, including spilled ones."""
+        self._size = 0
+        self._spilled_rows = 0
+        self._files.remove()
+
+    def restore(self, rows: np.ndarray) -> None:
+        """
+        Replace the contents with previously saved rows.
+
+        The rows are used as they are, without a copy, so a memory-mapped array
+        is read lazily. They are copied into new storage on the first append.
+
+        Parameters:
+        -----------
+        rows : numpy.ndarray
+            A structured array with the buffer's dtype.
+        """
+        if rows.dtype != self.dtype:
+            raise ValueError(f"Expected rows of dtype {self.dtype}, got {rows.dtype}.")
+        self.clear()
+        self._data = rows
+        self._size = len(rows)
+
+    def _slice(self, index: slice) -> np.ndarray:
+        """Gather a slice across spilled chunks and memory."""
+        rows = range(*index.indices(len(self)))
+        if not rows:
+            return self._data[:0]
+        lo = min(rows[0], rows[-1])
+        hi = max(rows[0], rows[-1]) + 1
+        return self._gather(lo, hi)[rows[0] - lo :: rows.step][: len(rows)]
+
+    def _gather(self, start: int, stop: int) -> np.ndarray:
+        """Return rows ``start:stop``, copying only if they were spilled."""
+        spilled = self._spilled_rows
+        if start >= spilled:
+            return self._data[start - spilled : stop - spilled]
+        chunk = self.chunk_size
+        end = min(stop, spilled)
+        parts = []
+        for i in range(start // chunk, (end - 1) // chunk + 1):
+            base = i * chunk
+            parts.append(self._load(i)[max(start - base, 0) : end - base])
+        if stop > spilled:
+            parts.append(self._data[: stop - spilled])
+        return np.concatenate(parts)
+
+    def _load(self, chunk: int) -> np.ndarray:
+        """Memory-map a spilled chunk."""
+        return np.load(self._files.paths[chunk], mmap_mode="r")
+
+    def _spill(self) -> None:
+        """Write the oldest whole chunks to disk until the window fits in memory."""
+        n = 0
+        while self._size - n > self.memory_rows and self._size - n >= self.chunk_size:
+            np.save(
+                self._files.next_path(".npy"),
+                self._data[n : n + self.chunk_size],
+            )
+            n += self.chunk_size
+        if n:
+            self._data[: self._size - n] = self._data[n : self._size]
+            self._size -= n
+            self._spilled_rows += n
+
+    def _reserve(self, capacity: int) -> None:
+        """Grow the storage to hold at least ``capacity`` rows."""
+        new_capacity = max(capacity, len(self._data) * 2, self.chunk_size)
+        remainder = new_capacity % self.chunk_size
+        if remainder:
+            new_capacity += self.chunk_size - remainder
+        data = np.empty(new_capacity, dtype=self.dtype)
+        data[: self._size] = self._data[: self._size]
+        self._data = data
+
+
+class History:
+    """
+    A list-like history of Python objects with an optional in-memory window.
+
+    Behaves like an append-only list. When ``memory_items`` is set, only the most
+    recent items are kept in memory; older items are pickled in chunks of
+    ``chunk_size`` items to files in ``spill_dir`` and loaded back on access.
+    Indexing, slicing and iteration cover spilled and in-memory items alike.
+
+    Attributes:
+    -----------
+    chunk_size : int
+        The number of items per spilled file. Capped at ``memory_items``.
+    memory_items : int or None
+        The maximum number of items kept in memory, or None for no limit.
+    """
+
+    def __init__(
+        self,
+        items: Optional[List[Any]] = None,
+        chunk_size: int = 4096,
+        memory_items: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+        name: str = "history",
+    ) -> None:
+        """
+        Initialize a history.
+
+        Parameters:
+        -----------
+        items : list, optional
+            Initial items.
+        chunk_size : int, optional
+            The number of items per spilled file (default is 4096).
+        memory_items : int, optional
+            The maximum number of items kept in memory (default is no limit).
+        spill_dir : str, optional
+            The directory spilled chunks are written under (default is the
+            system temporary directory).
+        name : str, optional
+            A name used as the prefix of the spill directory (default is "history").
+        """
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be at least 1.")
+        if memory_items is not None and memory_items < 1:
+            raise ValueError("memory_items must be at least 1.")
+        self.chunk_size = min(chunk_size, memory_items or chunk_size)
+        self.memory_items = memory_items
+        self._items: List[Any] = []
+        self._files = _SpillFiles(name, spill_dir)
+        self._spilled_items = 0
+        for item in items or []:
+            self.append(item)
+
+    def __len__(self) -> int:
+        return self._spilled_items + len(self._items)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[Any]:
+        chunks = (self._load(i) for i in range(len(self._files.paths)))
+        return chain(chain.from_iterable(chunks), list(self._items))
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            if not self._spilled_items:
+                return self._items[index]
+            chunks: Dict[int, List[Any]] = {}
+            items = []
+            for i in range(*index.indices(len(self))):
+                if i >= self._spilled_items:
+                    items.append(self._items[i - self._spilled_items])
+                    continue
+                chunk = i // self.chunk_size
+                if chunk not in chunks:
+                    chunks[chunk] = self._load(chunk)
+                items.append(chunks[chunk][i % self.chunk_size])
+            return items
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("history index out of range")
+        if index >= self._spilled_items:
+            return self._items[index - self._spilled_items]
+        return self._load(index // self.chunk_size)[index % self.chunk_size]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (History, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"History(len={len(self)}, in_memory={len(self._items)})"
+
+    @property
+    def spilled_items(self) -> int:
+        """The number of items written to disk."""
+        return self._spilled_items
+
+    def append(self, item: Any) -> None:
+        """Append one item."""
+        self._items.append(item)
+        if self.memory_items is not None and len(self._items) > self.memory_items:
+            self._spill()
+
+    def extend(self, items) -> None:
+        """Append several items."""
+        for item in items:
+            self.append(item)
+
+    def tail(self, n: int) -> List[Any]:
+        """Return the last ``n`` items."""
+        if n <= len(self._items):
+            return self._items[len(self._items) - n :]
+        return self[max(len(self) - n, 0) :]
+
+    def clear(self) -> None:
+        """Drop all items, including spilled ones."""
+        self._items = []
+        self._spilled_items = 0
+        self._files.remove()
+
+    def _load(self, chunk: int) -> List[Any]:
+        """Load a spilled chunk."""
+        with open(self._files.paths[chunk], "rb") as f:
+            return pickle.load(f)
+
+    def _spill(self) -> None:
+        """Write the oldest whole chunks to disk until the window fits in memory."""
+        n = 0
+        items = self._items
+        while len(items) - n > self.memory_items and len(items) - n >= self.chunk_size:
+            with open(self._files.next_path(".pkl"), "wb") as f:
+                pickle.dump(items[n : n + self.chunk_size], f)
+            n += self.chunk_size
+        if n:
+            del items[:n]
+            self._spilled_items += n
@@ -0,0 +1,87 @@
+"""Pre-drawn blocks of random numbers."""
+
+import numpy as np
+
+
+class RandomBuffer:
+    """
+    Serves scalar random draws from blocks generated in one vectorized call.
+
+    Drawing one number at a time from a ``numpy.random.Generator`` costs a
+    Python-to-C round trip per draw. The buffer instead draws a block of
+    uniforms at once and hands them out one by one, refilling when the block is
+    used up. Derived draws (signs, Bernoulli trials, integers) are computed from
+    the uniforms, so one buffer serves every kind of draw an agent needs.
+
+    The first block holds ``initial_size`` uniforms and each refill doubles the
+    block up to ``block_size``, so agents that rarely draw keep a small block
+    while busy agents reach the full one. The block stays a NumPy array and is
+    read in place. The sequence of draws does not depend on the block sizes.
+
+    Attributes:
+    -----------
+    rng : numpy.random.Generator
+        The generator blocks are drawn from.
+    block_size : int
+        The largest number of uniforms drawn per refill.
+    initial_size : int
+        The number of uniforms in the first block.
+
+    Methods:
+    --------
+    random()
+        Return the next uniform draw in [0, 1).
+    bernoulli(p)
+        Return True with probability ``p``.
+    sign()
+        Return 1 or -1 with equal probability.
+    integers(low, high)
+        Return a uniform integer in [low, high).
+    """
+
+    def __init__(
+        self, rng: np.random.Generator, block_size: int = 1024, initial_size: int = 16
+    ) -> None:
+        """
+        Initialize a buffer. The first block is drawn on first use.
+
+        Parameters:
+        -----------
+        rng : numpy.random.Generator
+            The generator to draw blocks from.
+        block_size : int, optional
+            The largest number of uniforms drawn per refill (default is 1024).
+        initial_size : int, optional
+            The number of uniforms in the first block (default is 16, capped at
+            ``block_size``).
+        """
+        if block_size < 1 or initial_size < 1:
+            raise ValueError("block_size and initial_size must be at least 1.")
+        self.rng = rng
+        self.block_size = block_size
+        self.initial_size = min(initial_size, block_size)
+        self._block: np.ndarray = np.empty(0)
+        self._next = 0
+
+    def random(self) -> float:
+        """Return the next uniform draw in [0, 1)."""
+        if self._next == self._block.size:
+            size = self._block.size
+            size = min(2 * size, self.block_size) if size else self.initial_size
+            self._block = self.rng.random(size)
+            self._next = 0
+        value = self._block.item(self._next)
+        self._next += 1
+        return value
+
+    def bernoulli(self, p: float) -> bool:
+        """Return True with probability ``p``."""
+        return self.random() < p
+
+    def sign(self) -> int:
+        """Return 1 or -1 with equal probability."""
+        return 1 if self.random() < 0.5 else -1
+
+    def integers(self, low: int, high: int) -> int:
+        """Return a uniform integer in [low, high)."""
+        return low + int(self.random() * (high - low))
@@ -59,19 +59,13 @@ def price_path(market: Market):
     -------
     None
     """
-    prices = [trade["price"] for trade in market.trade_history]
-    aggressor_side = [trade["aggressor_side"] for trade in market.trade_history]
-    time = [trade["time"] for trade in market.trade_history]
-
-    best_bid = [
-        snapshot["bid"][0]["price"] if snapshot["bid"] else None
-        for snapshot in market.ob_snapshots
-    ]
-    best_ask = [
-        snapshot["ask"][0]["price"] if snapshot["ask"] else None
-        for snapshot in market.ob_snapshots
-    ]
-    ob_time = [snapshot["time"] for snapshot in market.ob_snapshots]
+    prices = market.trades.column("price")
+    aggressor_side = market.trades.column("aggressor_side")
+    time = market.trades.column("time")
+
+    best_bid = market.top_of_book.column("best_bid")
+    best_ask = market.top_of_book.column("best_ask")
+    ob_time = market.top_of_book.column("time")
     plt.figure(figsize=(15, 5))
     plt.plot(ob_time, best_bid, label="Best Bid", color="green")
     plt.plot(ob_time, best_ask, label="Best Ask", color="red")
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+from pymicrostructure.markets.batch import BatchAuction, allocate, clearing_price
+from pymicrostructure.metrics.trader import participants_report
+from pymicrostructure.orders.base import OrderStatus
+from pymicrostructure.orders.limit import LimitOrder
+from pymicrostructure.orders.market import MarketOrder
+from pymicrostructure.traders.base import Trader
+from pymicrostructure.traders.market_maker import DummyMarketMaker
+from pymicrostructure.traders.noise import NoiseTrader
+
+
+def brute_force_volume(bids, asks, price):
+    demand = sum(v for p, v in bids if p >= price)
+    supply = sum(v for p, v in asks if p <= price)
+    return min(demand, supply)
+
+
+def test_clearing_price_maximizes_executed_volume():
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        bid_prices = rng.integers(95, 106, 20).astype(float)
+        ask_prices = rng.integers(95, 106, 20).astype(float)
+        bid_volumes = rng.integers(1, 10, 20)
+        ask_volumes = rng.integers(1, 10, 20)
+        price, volume = clearing_price(
+            bid_prices, bid_volumes, ask_prices, ask_volumes, 100
+        )
+        bids = list(zip(bid_prices, bid_volumes))
+        asks = list(zip(ask_prices, ask_volumes))
+        best = max(brute_force_volume(bids, asks, p) for p in range(95, 106))
+        assert volume == best
+        if volume:
+            assert brute_force_volume(bids, asks, price) == best
+
+
+def test_clearing_price_with_market_orders_and_no_cross():
+    assert np.isnan(clearing_price([99], [5], [101], [5])[0])
+    assert clearing_price([np.inf], [3], [101, 102], [2, 2]) == (102, 3)
+    assert clearing_price([np.inf], [3], [-np.inf], [2], reference=100) == (100, 2)
+
+
+def test_allocate_pro_rata_and_time_priority():
+    prices = np.array([101, 100, 100, 100])
+    volumes = np.array([2, 3, 3, 4])
+    assert allocate(prices, volumes, 7, pro_rata=False).tolist() == [2, 3, 2, 0]
+    pro_rata = allocate(prices, volumes, 7, pro_rata=True)
+    assert pro_rata.tolist() == [2, 2, 1, 2]
+    assert pro_rata.sum() == 7
+    assert (pro_rata <= volumes).all()
+
+
+def test_batch_orders_wait_for_the_auction():
+    market = BatchAuction(interval=10)
+    buyer, seller, late = Trader(market), Trader(market), Trader(market)
+    market.submit_order(LimitOrder(buyer.trader_id, 5, 101))
+    market.submit_order(LimitOrder(seller.trader_id, -3, 99))
+    market.submit_order(MarketOrder(late.trader_id, -4))
+    assert len(market.trades) == 0 and not market.bid_book
+
+    market.clear()
+    trades = market.trades.to_numpy()
+    assert set(trades["price"]) == {market.mark_price}
+    assert trades["volume"].sum() == 5
+    # The market order has price priority; the limit sell rests its remainder.
+    assert buyer.position == 5 and late.position == -4 and seller.position == -1
+    assert not market.bid_book
+    assert market.ask_book.volume_at(99) == -2
+    assert late.inactive_orders[-1].status == OrderStatus.FILLED
+
+
+def test_cancel_queued_order():
+    market = BatchAuction()
+    trader = Trader(market)
+    order = LimitOrder(trader.trader_id, 5, 101)
+    market.submit_order(order)
+    trader.cancel_all_orders()
+    market.clear()
+    assert order.status == OrderStatus.CANCELED
+    assert not market.bid_book and len(market.trades) == 0
+
+
+@pytest.mark.parametrize("allocation", ["pro_rata", "time"])
+def test_batch_auction_runs_with_existing_traders(allocation):
+    market = BatchAuction(seed=1, interval=5, allocation=allocation)
+    DummyMarketMaker(market)
+    for _ in range(10):
+        NoiseTrader(market)
+    market.run(200, progress=False)
+    trades = market.trades.to_numpy()
+    assert len(trades)
+    # Every auction trades at one price, at most once per five ticks.
+    times, first = np.unique(trades["time"], return_index=True)
+    assert len(times) == len(market.clearing_prices) <= 40
+    assert [price for _, price, _ in market.clearing_prices] == list(
+        trades["price"][first]
+    )
+    assert sum(p.position for p in market.participants) == 0
+    assert (
+        market.best_bid is None
+        or market.best_ask is None
+        or (market.best_bid < market.best_ask)
+    )
+    assert participants_report(market.participants).shape[1] == 11
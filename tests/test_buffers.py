@@ -0,0 +1,179 @@
+import gc
+import os
+import tracemalloc
+import numpy as np
+import pytest
+from pymicrostructure.markets.continuous import ContinuousDoubleAuction
+from pymicrostructure.traders.noise import NoiseTrader
+from pymicrostructure.utils.buffers import History, RecordBuffer
+from pymicrostructure.utils.draws import RandomBuffer
+
+
+@pytest.fixture
+def buffer():
+    return RecordBuffer([("time", "i8"), ("price", "f8")], chunk_size=4)
+
+
+def test_append_and_view(buffer):
+    for i in range(10):
+        buffer.append((i, 100.0 + i))
+
+    assert len(buffer) == 10
+    assert buffer.column("time").tolist() == list(range(10))
+    assert buffer["price"][-1] == 109.0
+    assert buffer[3]["time"] == 3
+
+
+def test_growth_is_chunked(buffer):
+    for i in range(5):
+        buffer.append((i, 0.0))
+    assert len(buffer._data) == 8
+    for i in range(4):
+        buffer.append((i, 0.0))
+    assert len(buffer._data) == 16
+
+
+def test_views_are_zero_copy(buffer):
+    buffer.append((1, 1.0))
+    view = buffer.column("price")
+    assert np.shares_memory(view, buffer._data)
+
+
+def test_extend_and_to_pandas(buffer):
+    rows = np.array([(1, 2.0), (2, 3.0)], dtype=buffer.dtype)
+    buffer.extend(rows)
+    buffer.extend(rows)
+
+    df = buffer.to_pandas()
+    assert list(df.columns) == ["time", "price"]
+    assert df["price"].sum() == 10.0
+
+
+def test_clear(buffer):
+    buffer.append((1, 1.0))
+    buffer.clear()
+    assert len(buffer) == 0
+
+
+def test_spill_keeps_window_in_memory(tmp_path):
+    buffer = RecordBuffer(
+        [("time", "i8"), ("price", "f8")], memory_rows=4, spill_dir=str(tmp_path)
+    )
+    for i in range(10):
+        buffer.append((i, 100.0 + i))
+
+    assert len(buffer) == 10
+    assert buffer.spilled_rows == 8
+    assert len(buffer.view()) == 2
+    assert buffer.column("time").tolist() == list(range(10))
+    assert buffer[2]["price"] == 102.0
+    assert buffer[-1]["time"] == 9
+    assert buffer[3:9:2]["time"].tolist() == [3, 5, 7]
+    assert buffer[::-3]["time"].tolist() == [9, 6, 3, 0]
+    assert buffer.tail(3)["time"].tolist() == [7, 8, 9]
+    assert [row["time"] for row in buffer] == list(range(10))
+    assert buffer.to_pandas()["time"].tolist() == list(range(10))
+    assert len(list(tmp_path.rglob("*.npy"))) == 2
+
+    buffer.clear()
+    assert len(buffer) == 0
+    assert not list(tmp_path.rglob("*.npy"))
+
+
+def test_take_loads_only_the_chunks_it_needs(tmp_path, monkeypatch):
+    buffer = RecordBuffer(
+        [("time", "i8"), ("price", "f8")],
+        chunk_size=4,
+        memory_rows=4,
+        spill_dir=str(tmp_path),
+    )
+    for i in range(30):
+        buffer.append((i, 100.0 + i))
+    loads = []
+    load = buffer._load
+    monkeypatch.setattr(
+        buffer, "_load", lambda chunk: loads.append(chunk) or load(chunk)
+    )
+
+    indices = np.array([29, 9, 2, 10, -1, 1])
+    assert buffer.take(indices)["time"].tolist() == [29, 9, 2, 10, 29, 1]
+    assert sorted(loads) == [0, 2]
+    with pytest.raises(IndexError):
+        buffer.take(np.array([30]))
+
+
+def test_spill_directories_are_removed_with_their_buffers(tmp_path):
+    buffer = RecordBuffer(
+        [("time", "i8")], chunk_size=2, memory_rows=2, spill_dir=str(tmp_path)
+    )
+    history = History(chunk_size=2, memory_items=2, spill_dir=str(tmp_path))
+    for i in range(10):
+        buffer.append((i,))
+        history.append(i)
+    assert len(os.listdir(tmp_path)) == 2
+
+    del buffer, history
+    gc.collect()
+    assert os.listdir(tmp_path) == []
+
+
+def test_spilling_market_leaves_no_directories(tmp_path):
+    market = ContinuousDoubleAuction(seed=1, history_window=8, spill_dir=str(tmp_path))
+    for _ in range(3):
+        NoiseTrader(market)
+    market.run(50, progress=False)
+    assert os.listdir(tmp_path)
+
+    del market
+    gc.collect()
+    assert os.listdir(tmp_path) == []
+
+
+def test_history_spills_objects(tmp_path):
+    history = History(memory_items=3, spill_dir=str(tmp_path))
+    history.extend({"time": i} for i in range(8))
+
+    assert len(history) == 8
+    assert history.spilled_items == 6
+    assert history[1] == {"time": 1}
+    assert history[-2:] == [{"time": 6}, {"time": 7}]
+    assert [item["time"] for item in history[::3]] == [0, 3, 6]
+    assert history.tail(4) == [{"time": i} for i in range(4, 8)]
+    assert history == [{"time": i} for i in range(8)]
+    with pytest.raises(IndexError):
+        history[8]
+
+
+def test_random_buffer_draws_blocks():
+    draws = RandomBuffer(np.random.default_rng(3), block_size=8)
+    values = [draws.random() for _ in range(20)]
+
+    assert values == np.random.default_rng(3).random(24)[:20].tolist()
+    assert {draws.sign() for _ in range(50)} == {-1, 1}
+    assert all(2 <= draws.integers(2, 5) < 5 for _ in range(50))
+    assert not draws.bernoulli(0.0)
+
+
+def test_random_buffer_blocks_grow_from_a_small_start():
+    draws = RandomBuffer(np.random.default_rng(3), block_size=64)
+    sizes = []
+    for _ in range(300):
+        draws.random()
+        if draws._next == 1:
+            sizes.append(draws._block.size)
+    assert sizes == [16, 32, 64, 64, 64, 64]
+    assert isinstance(draws._block, np.ndarray)
+    assert isinstance(draws.random(), float)
+
+
+def test_idle_random_buffers_stay_small():
+    rng = np.random.default_rng(0)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    buffers = [RandomBuffer(rng) for _ in range(1000)]
+    for draws in buffers:
+        for _ in range(3):
+            draws.random()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    assert used / len(buffers) < 1024
@@ -0,0 +1,131 @@
+import json
+import os
+import numpy as np
+import pytest
+from pymicrostructure.markets.checkpoint import (
+    MANIFEST,
+    load_array,
+    read_manifest,
+)
+from pymicrostructure.markets.continuous import ContinuousDoubleAuction
+from pymicrostructure.metrics.trader import participants_report
+from pymicrostructure.traders.market_maker import DummyMarketMaker
+from pymicrostructure.traders.noise import NoiseTrader
+
+
+@pytest.fixture
+def finished_market():
+    market = ContinuousDoubleAuction(initial_fair_price=1000, seed=3)
+    DummyMarketMaker(market)
+    for _ in range(3):
+        NoiseTrader(market, submission_rate=0.5)
+    market.run(200, progress=False)
+    return market
+
+
+def test_round_trip(finished_market, tmp_path):
+    path = str(tmp_path / "run")
+    finished_market.save(path)
+    loaded = ContinuousDoubleAuction.load(path)
+
+    np.testing.assert_array_equal(
+        loaded.trades.to_numpy(), finished_market.trades.to_numpy()
+    )
+    assert (
+        loaded.top_of_book.to_numpy().tobytes()
+        == finished_market.top_of_book.to_numpy().tobytes()
+    )
+    assert loaded.ob_snapshots[-1] == finished_market.ob_snapshots[-1]
+    assert len(loaded.events) == len(finished_market.events)
+    assert loaded.news_history == finished_market.news_history
+    assert loaded.current_tick == finished_market.current_tick
+    assert loaded._next_order_id == finished_market._next_order_id
+    assert [repr(order) for order in loaded.bid_ob] == [
+        repr(order) for order in finished_market.bid_ob
+    ]
+    assert [repr(order) for order in loaded.ask_ob] == [
+        repr(order) for order in finished_market.ask_ob
+    ]
+    for original, restored in zip(finished_market.participants, loaded.participants):
+        assert type(restored) is type(original)
+        assert restored.position == original.position
+        assert restored.cash == original.cash
+        assert restored.active_orders.keys() == original.active_orders.keys()
+        np.testing.assert_array_equal(
+            restored.filled_trades.to_numpy(), original.filled_trades.to_numpy()
+        )
+    assert participants_report(loaded.participants).equals(
+        participants_report(finished_market.participants)
+    )
+
+
+def test_loaded_market_can_continue(finished_market, tmp_path):
+    path = str(tmp_path / "run")
+    finished_market.save(path)
+    loaded = ContinuousDoubleAuction.load(path)
+    trades = len(loaded.trades)
+    NoiseTrader(loaded, submission_rate=1)
+    loaded.run(20, progress=False)
+    assert len(loaded.trades) > trades
+    assert (
+        loaded.trades.to_numpy()["time"][trades]
+        > loaded.trades.to_numpy()["time"][trades - 1]
+    )
+
+
+def test_partial_load(finished_market, tmp_path):
+    path = str(tmp_path / "run")
+    finished_market.save(path)
+    loaded = ContinuousDoubleAuction.load(path, parts=("trades",))
+    assert len(loaded.trades) == len(finished_market.trades)
+    assert len(loaded.events) == 0
+    assert not loaded.participants
+    assert not loaded.bid_ob and not loaded.ask_ob
+    with pytest.raises(ValueError):
+        ContinuousDoubleAuction.load(path, parts=("orderbook",))
+
+
+def test_arrays_are_memory_mapped(finished_market, tmp_path):
+    path = str(tmp_path / "run")
+    finished_market.save(path)
+    assert isinstance(load_array(path, "trades"), np.memmap)
+    loaded = ContinuousDoubleAuction.load(path, parts=("trades",))
+    assert isinstance(loaded.trades.to_numpy(), np.memmap)
+    assert not isinstance(
+        ContinuousDoubleAuction.load(path, mmap=False).trades.to_numpy(), np.memmap
+    )
+
+
+def test_newer_versions_are_rejected(finished_market, tmp_path):
+    path = str(tmp_path / "run")
+    finished_market.save(path)
+    manifest = read_manifest(path)
+    manifest["version"] += 1
+    with open(os.path.join(path, MANIFEST), "w") as f:
+        json.dump(manifest, f)
+    with pytest.raises(ValueError):
+        read_manifest(path)
+
+
+def test_book_load_keeps_trader_ids(finished_market, tmp_path):
+    path = str(tmp_path / "run")
+    finished_market.save(path)
+    loaded = ContinuousDoubleAuction.load(path, parts=("book",))
+    assert len(loaded.participants) == len(finished_market.participants)
+    resting = {order.trader_id for order in [*loaded.bid_ob, *loaded.ask_ob]}
+    trader = NoiseTrader(loaded, submission_rate=1)
+    assert trader.trader_id not in resting
+
+
+def test_resumed_run_keeps_random_streams(finished_market, tmp_path):
+    path = str(tmp_path / "run")
+    finished_market.save(path)
+    loaded = ContinuousDoubleAuction.load(path)
+    for original, restored in zip(finished_market.participants, loaded.participants):
+        assert restored.rng.bit_generator.state == original.rng.bit_generator.state
+    assert loaded.seed_sequence.n_children_spawned == (
+        finished_market.seed_sequence.n_children_spawned
+    )
+    assert np.array_equal(
+        NoiseTrader(loaded).rng.random(8), NoiseTrader(finished_market).rng.random(8)
+    )
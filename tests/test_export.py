@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from pymicrostructure.markets.continuous import ContinuousDoubleAuction
+from pymicrostructure.markets.export import (
+    StreamingExporter,
+    iter_export,
+    read_export,
+)
+from pymicrostructure.traders.market_maker import DummyMarketMaker
+from pymicrostructure.traders.noise import NoiseTrader
+
+
+def build_market():
+    market = ContinuousDoubleAuction(initial_fair_price=1000, seed=2)
+    DummyMarketMaker(market)
+    NoiseTrader(market, submission_rate=0.5)
+    return market
+
+
+def test_export_matches_recorded_histories(tmp_path):
+    market = build_market()
+    path = str(tmp_path / "export")
+    StreamingExporter(path, row_group_size=16, format="npy").attach(market)
+    market.run(100, progress=False)
+    market.run(20, progress=False)
+
+    np.testing.assert_array_equal(read_export(path, "trades"), market.trades.to_numpy())
+    assert read_export(path, "events").tobytes() == market.events.to_numpy().tobytes()
+    np.testing.assert_array_equal(
+        read_export(path, "deltas"), market.ob_snapshots.delta_records(0)
+    )
+
+
+def test_chunks_are_full_row_groups_until_the_run_ends(tmp_path):
+    market = build_market()
+    path = str(tmp_path / "export")
+    exporter = StreamingExporter(path, streams=["events"], row_group_size=16)
+    exporter.attach(market)
+    market.run(50, progress=False)
+
+    chunks = list(iter_export(path, "events"))
+    assert all(isinstance(chunk, np.memmap) for chunk in chunks)
+    assert all(len(chunk) == 16 for chunk in chunks[:-1])
+    assert 0 < len(chunks[-1]) <= 16
+    assert sum(len(chunk) for chunk in chunks) == len(market.events)
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        StreamingExporter("unused", streams=["orders"])
+    with pytest.raises(ValueError):
+        StreamingExporter("unused", format="csv")
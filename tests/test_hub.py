@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+from pymicrostructure.markets.events import EventType
+from pymicrostructure.markets.hub import MarketHub
+from pymicrostructure.orders.limit import LimitOrder
+from pymicrostructure.orders.market import MarketOrder
+from pymicrostructure.traders.base import Trader
+from pymicrostructure.traders.market_maker import DummyMarketMaker
+from pymicrostructure.traders.noise import NoiseTrader
+
+
+class Quoter(Trader):
+    def update(self):
+        self.cancel_all_orders()
+        for instrument in self.market.instruments[:-1]:
+            self.market.submit_order(
+                instrument,
+                [
+                    LimitOrder(self.trader_id, 10, 99),
+                    LimitOrder(self.trader_id, -10, 101),
+                ],
+            )
+
+
+class Taker(Trader):
+    def update(self):
+        instruments = self.market.instruments[:-1]
+        instrument = instruments[self.rng.integers(len(instruments))]
+        side = 1 if self.rng.random() < 0.5 else -1
+        self.market.submit_order(instrument, MarketOrder(self.trader_id, side))
+
+
+def build_hub(seed=1):
+    hub = MarketHub(["A", "B", "C", "IDLE"], seed=seed, recording="tick")
+    Quoter(hub)
+    for _ in range(4):
+        Taker(hub)
+    hub.run(50, progress=False)
+    return hub
+
+
+def test_positions_are_kept_per_instrument():
+    hub = build_hub()
+    matrix = hub.position_matrix()
+    assert list(matrix.columns) == ["A", "B", "C", "IDLE"]
+    assert (matrix.sum() == 0).all()
+    for trader in hub.participants:
+        for instrument, position in hub.positions(trader).items():
+            assert matrix.loc[trader.trader_id, instrument] == position
+    for instrument, book in hub.books.items():
+        account = hub.account(0, instrument)
+        assert len(account.filled_trades) == len(account.fills)
+        if instrument != "IDLE":
+            assert len(account.fills) == len(book.trades)
+
+
+def test_clock_and_order_ids_are_shared():
+    hub = build_hub()
+    events = np.concatenate([book.events.to_numpy() for book in hub.books.values()])
+    adds = events[events["code"] == EventType.ADD]
+    assert len(np.unique(adds["order_id"])) == len(adds)
+    assert len(np.unique(adds["time"])) == hub.last_submission_time
+
+
+def test_cancellation_is_routed_to_the_right_book():
+    hub = build_hub()
+    quoter = hub.participants[0]
+    assert quoter.active_orders
+    quoter.cancel_all_orders()
+    assert not quoter.active_orders
+    for book in hub.books.values():
+        assert not any(order.trader_id == 0 for order in book.bid_ob + book.ask_ob)
+
+
+def test_untouched_books_do_no_work():
+    hub = build_hub()
+    idle = hub["IDLE"]
+    assert len(idle.events) == 0
+    assert len(idle.ob_snapshots) == 0
+    assert not idle.participants
+    assert len(hub["A"].ob_snapshots) == 50
+
+
+def test_seeded_hubs_are_reproducible():
+    first, second = build_hub(seed=3), build_hub(seed=3)
+    assert first.position_matrix().equals(second.position_matrix())
+
+
+def test_instrument_names_must_be_unique():
+    with pytest.raises(ValueError):
+        MarketHub(["A", "A"])
+
+
+def test_existing_traders_run_on_instrument_markets():
+    hub = MarketHub(["A", "B"], seed=1)
+    for instrument in hub.instruments:
+        market = hub.market(instrument)
+        assert hub.market(instrument) is market
+        DummyMarketMaker(market)
+        for _ in range(3):
+            NoiseTrader(market)
+    hub.run(100, progress=False)
+
+    assert len(hub["A"].trades) and len(hub["B"].trades)
+    matrix = hub.position_matrix()
+    assert (matrix.sum() == 0).all()
+    for trader in hub.participants:
+        instrument = trader.market.instrument
+        # The trader is its own account, so its position is the instrument's.
+        assert hub.account(trader, instrument) is trader
+        assert trader.position == matrix.loc[trader.trader_id, instrument]
+        assert len(trader.filled_trades) == len(trader.fills)
+    assert any(trader.position for trader in hub.participants)
+    assert hub.participants[0].market.current_tick == 99
+
+
+def test_instrument_market_traders_register_in_bulk():
+    hub = MarketHub(["A", "B"])
+    with hub.deferred_registration():
+        traders = [NoiseTrader(hub.market("A")), NoiseTrader(hub.market("B"))]
+    assert [t.trader_id for t in traders] == [0, 1]
+    assert hub["A"].participants == traders[:1]
+    with pytest.raises(ValueError):
+        hub.register_participants([Trader(MarketHub(["A"]).market("A"))])
@@ -0,0 +1,184 @@
+import random
+import numpy as np
+import pytest
+from pymicrostructure.markets.continuous import ContinuousDoubleAuction
+from pymicrostructure.markets.events import EventType
+from pymicrostructure.orders.limit import LimitOrder
+from pymicrostructure.orders.market import MarketOrder
+from pymicrostructure.traders.base import Trader
+from pymicrostructure.traders.ensemble import ensemble_traders
+from pymicrostructure.traders.noise import NoiseTrader
+
+
+@pytest.fixture
+def market():
+    return ContinuousDoubleAuction(initial_fair_price=100)
+
+
+def test_trader_ids_are_sequential(market):
+    traders = [Trader(market) for _ in range(5)]
+    assert [t.trader_id for t in traders] == list(range(5))
+    assert all(market.get_participant(t.trader_id) is t for t in traders)
+
+
+def test_trader_ids_survive_shuffle(market):
+    traders = [Trader(market) for _ in range(10)]
+    random.shuffle(market.participants)
+    assert all(market.get_participant(t.trader_id) is t for t in traders)
+
+
+def test_register_participants_bulk(market, monkeypatch):
+    first = Trader(market)
+    calls = []
+    bulk = market.register_participants
+    monkeypatch.setattr(
+        market, "register_participants", lambda t: calls.append(t) or bulk(t)
+    )
+    monkeypatch.setattr(
+        market, "register_participant", lambda t: pytest.fail("registered singly")
+    )
+
+    with market.deferred_registration() as pending:
+        population = [NoiseTrader(market) for _ in range(3)]
+        assert pending == population
+        assert all(t.trader_id is None for t in population)
+
+    assert len(calls) == 1
+    assert [t.trader_id for t in population] == [1, 2, 3]
+    assert market.participants == [first] + population
+    assert market.get_participant(2) is population[1]
+
+
+def test_ensemble_traders_register_in_bulk(market, monkeypatch):
+    calls = []
+    bulk = market.register_participants
+    monkeypatch.setattr(
+        market, "register_participants", lambda t: calls.append(t) or bulk(t)
+    )
+    traders = ensemble_traders(
+        NoiseTrader, {"market": [market] * 4, "submission_rate": [0.1, 0.2, 0.3, 0.4]}
+    )
+    assert calls == [traders]
+    assert [t.trader_id for t in traders] == [0, 1, 2, 3]
+    assert [t.submission_rate for t in traders] == [0.1, 0.2, 0.3, 0.4]
+
+
+def test_register_participants_rejects_foreign_traders(market):
+    other_market = ContinuousDoubleAuction(initial_fair_price=100)
+    with pytest.raises(ValueError):
+        market.register_participants([Trader(other_market)])
+    assert market.participants == []
+
+
+def test_unknown_participant(market):
+    with pytest.raises(ValueError):
+        market.get_participant(42)
+    with pytest.raises(ValueError):
+        market.submit_order(LimitOrder(42, 1, 100))
+
+
+def _trade_once(market):
+    maker, taker = Trader(market), Trader(market)
+    market.submit_order(LimitOrder(maker.trader_id, 5, 99))
+    market.submit_order(LimitOrder(maker.trader_id, -5, 101))
+    market.submit_order(LimitOrder(taker.trader_id, -2, 99))
+    maker.cancel_all_orders()
+    return maker, taker
+
+
+def test_unknown_recording_policy():
+    with pytest.raises(ValueError):
+        ContinuousDoubleAuction(recording="sometimes")
+    with pytest.raises(ValueError):
+        ContinuousDoubleAuction(recording="every_k", record_every=0)
+
+
+def test_full_recording(market):
+    _trade_once(market)
+    assert len(market.ob_snapshots) == 3
+    assert len(market.top_of_book) == 3
+    assert [msg[1] for msg in market.msg_history].count("CANCEL") == 2
+    assert len(market.cancellations) == 2
+
+
+def test_every_k_recording():
+    market = ContinuousDoubleAuction(recording="every_k", record_every=2)
+    _trade_once(market)
+    assert market.top_of_book.column("time").tolist() == [2]
+    assert market.ob_snapshots[0]["ask"] == [{"price": 101, "volume": -5}]
+    assert len(market.msg_history) > 0
+
+
+def test_tick_recording():
+    market = ContinuousDoubleAuction(recording="tick")
+    maker = Trader(market)
+    maker.update = lambda: market.submit_order(LimitOrder(maker.trader_id, 1, 99))
+    market.run(3)
+    assert market.top_of_book.column("time").tolist() == [1, 2, 3]
+    assert market.ob_snapshots[-1]["bid"] == [{"price": 99, "volume": 3}]
+
+
+def test_top_recording():
+    market = ContinuousDoubleAuction(recording="top")
+    _trade_once(market)
+    assert len(market.top_of_book) == 3
+    assert len(market.ob_snapshots) == 0
+    assert market.msg_history == []
+    assert market.cancellations == []
+
+
+def test_no_recording_keeps_trades():
+    market = ContinuousDoubleAuction(recording="none")
+    maker, taker = _trade_once(market)
+    assert len(market.top_of_book) == 0
+    assert len(market.ob_snapshots) == 0
+    assert market.msg_history == []
+    assert len(market.trade_history) == 1
+    assert maker.position == 2
+    assert market.mark_price == 100
+
+
+def test_bounded_history_spills_to_disk(tmp_path):
+    market = ContinuousDoubleAuction(history_window=2, spill_dir=str(tmp_path))
+    _trade_once(market)
+    maker, _ = _trade_once(market)
+
+    assert len(market.trade_history) == 2
+    assert len(market.events) > market.events.spilled_rows > 0
+    assert market.top_of_book.spilled_rows > 0
+    assert market.midprices["time"].tolist() == list(range(1, 7))
+    assert market.ob_snapshots[1]["ask"] == [{"price": 101, "volume": -5}]
+    assert [o.status for o in maker.inactive_orders].count("canceled") == 2
+
+
+def test_event_log_records_typed_events():
+    market = ContinuousDoubleAuction()
+    maker, taker = _trade_once(market)
+    rejected = MarketOrder(taker.trader_id, 1)
+    market.submit_order(rejected)
+
+    events = market.events
+    assert [EventType(code).name for code in events.column("code")] == [
+        "ADD",
+        "ADD",
+        "ADD",
+        "TRADE",
+        "CANCEL",
+        "CANCEL",
+        "ADD",
+        "REJECT",
+    ]
+    trade = events.filter(code=EventType.TRADE)[0]
+    assert (trade["price"], trade["volume"]) == (99, -2)
+    assert trade["trader_id"] == taker.trader_id
+    cancels = events.filter(code=EventType.CANCEL, trader_id=maker.trader_id)
+    assert cancels["volume"].tolist() == [3, -5]
+    assert cancels["time"].tolist() == [3, 3]
+    assert np.isnan(events.filter(code=EventType.REJECT)["price"][0])
+    assert len(events.filter(start=2, end=3)) == 1
+    assert next(events.iter_events(code=EventType.TRADE))[0] is EventType.TRADE
+    assert market.msg_history[3] == (3, "TRADE", "2 @ 99, AGG: -1")
+    assert (
+        market.msg_history[0][2]
+        == f"LMT P: 99 V: +5, ORDER: {events[0]['order_id']}, FROM: {maker.trader_id}"
+    )
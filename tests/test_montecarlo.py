@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pymicrostructure.markets.continuous import ContinuousDoubleAuction
+from pymicrostructure.metrics.trader import final_profit, participants_report
+from pymicrostructure.simulation.montecarlo import MonteCarlo, spawn_seeds
+from pymicrostructure.traders.market_maker import DummyMarketMaker
+from pymicrostructure.traders.noise import NoiseTrader
+
+
+def build_market(seed, submission_rate=0.5):
+    market = ContinuousDoubleAuction(
+        initial_fair_price=1000, recording="none", seed=seed
+    )
+    DummyMarketMaker(market)
+    for _ in range(3):
+        NoiseTrader(
+            market,
+            submission_rate=submission_rate,
+            volume_size=lambda: np.random.randint(1, 10),
+        )
+    return market
+
+
+REDUCTIONS = {
+    "trades": lambda market: len(market.trades),
+    "report": lambda market: participants_report(market.participants),
+    "profit": lambda market: final_profit(market.participants[0]),
+}
+
+
+def test_spawn_seeds_is_reproducible():
+    assert spawn_seeds(4, seed=7) == spawn_seeds(4, seed=7)
+    assert len(set(spawn_seeds(4, seed=7))) == 4
+
+
+def test_results_do_not_depend_on_worker_count():
+    serial = MonteCarlo(build_market, 100, REDUCTIONS, workers=1)
+    parallel = MonteCarlo(build_market, 100, REDUCTIONS, workers=2)
+
+    a = serial.run(n_runs=4, seed=1, progress=False)
+    b = parallel.run(n_runs=4, seed=1, progress=False)
+
+    assert [r["seed"] for r in a] == [r["seed"] for r in b]
+    assert [r["trades"] for r in a] == [r["trades"] for r in b]
+    assert len({r["trades"] for r in a}) > 1
+    pd.testing.assert_frame_equal(
+        MonteCarlo.collect(a, "report"), MonteCarlo.collect(b, "report")
+    )
+
+
+def test_parameter_sets_and_collect():
+    runner = MonteCarlo(build_market, 50, REDUCTIONS, workers=1)
+
+    results = runner.run(
+        seeds=[1, 2], params=[{"submission_rate": 0.1}, {"submission_rate": 1.0}]
+    )
+
+    assert [(r["params"]["submission_rate"], r["seed"]) for r in results] == [
+        (0.1, 1),
+        (0.1, 2),
+        (1.0, 1),
+        (1.0, 2),
+    ]
+    profits = MonteCarlo.collect(results, "profit")
+    assert profits.index.tolist() == [0, 1, 2, 3]
+    assert "market" not in results[0]
+
+
+def test_run_requires_seeds_or_count():
+    with pytest.raises(ValueError):
+        MonteCarlo(build_market, 10, REDUCTIONS).run()
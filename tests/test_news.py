@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from pymicrostructure.markets.continuous import ContinuousDoubleAuction
+from pymicrostructure.markets.news import (
+    BernoulliNews,
+    HawkesNews,
+    NewsHistory,
+    PoissonNews,
+    RegimeSwitchingNews,
+)
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+
+def test_bernoulli_news_rate(rng):
+    news = BernoulliNews(arrival_rate=0.2, good_prob=1.0).generate(50_000, rng)
+
+    assert set(np.unique(news)) == {0, 1}
+    assert news.mean() == pytest.approx(0.2, abs=0.01)
+
+
+def test_poisson_news_nets_good_and_bad_items(rng):
+    news = PoissonNews(rate=2.0, good_prob=0.75).generate(50_000, rng)
+
+    assert news.mean() == pytest.approx(1.0, abs=0.05)
+    assert news.max() > 1
+
+
+def test_hawkes_news_clusters(rng):
+    news = HawkesNews(baseline=0.05, excitation=0.8, decay=1.0).generate(200_000, rng)
+    active = news != 0
+
+    # Stationary rate is baseline / (1 - excitation)
+    assert np.abs(news).sum() / len(news) == pytest.approx(0.25, rel=0.2)
+    assert active[1:][active[:-1]].mean() > 2 * active.mean()
+    with pytest.raises(ValueError):
+        HawkesNews(excitation=1.0)
+
+
+def test_regime_switching_news_keeps_regime_between_calls(rng):
+    process = RegimeSwitchingNews(arrival_rates=(0.0, 1.0), switch_prob=0.001)
+    first = process.generate(5000, rng)
+    regime = process.regime
+    second = process.generate(10, rng)
+
+    assert set(np.unique(first)) <= {-1, 0, 1}
+    assert 0 < np.count_nonzero(first) < 5000
+    if regime == 1:
+        assert np.count_nonzero(second[:1]) == 1
+
+
+def test_news_history_reveals_values_and_window_sums():
+    history = NewsHistory([0])
+    history.extend([1, -1, 1, 1])
+
+    assert history == [0]
+    assert history.pending == 4
+    for _ in range(3):
+        history.advance()
+
+    assert history == [0, 1, -1, 1]
+    assert history[-1] == 1
+    assert history[1:3] == [1, -1]
+    assert history.window_sum(2) == 0
+    assert history.window_mean(3) == sum(list(history)[-3:]) / 3
+    assert history.window_sum(10) == 1
+
+
+def test_market_generates_news_for_the_run():
+    market = ContinuousDoubleAuction(seed=4, news_process=PoissonNews(rate=0.5))
+    market.run(100, progress=False)
+    market.run(50, progress=False)
+
+    assert len(market.news_history) == 151
+    assert market.news_history.pending == 0
+    assert market.news_history.window_sum(150) == sum(market.news_history)
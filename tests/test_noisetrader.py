@@ -10,7 +10,9 @@ from pymicrostructure.traders.noise import (
 
 @pytest.fixture
 def mock_market():
-    return Mock(ContinuousDoubleAuction(100))
+    market = Mock(ContinuousDoubleAuction(100))
+    market.spawn_rng.side_effect = lambda: np.random.default_rng(0)
+    return market
 
 
 @pytest.fixture
@@ -37,6 +39,17 @@ def test_noise_trader_custom_initialization(mock_market):
     assert trader.volume_size == custom_volume
 
 
+def test_seeded_traders_are_reproducible():
+    def sides(seed):
+        market = ContinuousDoubleAuction(100, seed=seed)
+        traders = [NoiseTrader(market) for _ in range(2)]
+        return [[trader.draws.sign() for _ in range(20)] for trader in traders]
+
+    first, second = sides(5)
+    assert sides(5) == [first, second]
+    assert first != second
+
+
 def test_get_volume_constant(noise_trader):
     assert noise_trader._get_volume() == 1
 
@@ -49,11 +62,11 @@ def test_get_volume_callable(mock_market):
     assert trader._get_volume() == 5
 
 
-@patch("numpy.random.rand")
-def test_update_submits_order(mock_rand, noise_trader):
-    mock_rand.return_value = 0.5  # Ensure order submission
-    with patch("random.choice", return_value=1):
-        noise_trader.update()
+def test_update_submits_order(noise_trader):
+    draws = noise_trader.draws
+    with patch.object(draws, "random", return_value=0.5):  # Ensure order submission
+        with patch.object(draws, "sign", return_value=1):
+            noise_trader.update()
 
     noise_trader.market.submit_order.assert_called_once()
     submitted_order = noise_trader.market.submit_order.call_args[0][0]
@@ -62,10 +75,10 @@ def test_update_submits_order(mock_rand, noise_trader):
     assert submitted_order.volume == 1 or submitted_order.volume == -1
 
 
-@patch("numpy.random.rand")
-def test_update_no_submission(mock_rand, noise_trader):
-    mock_rand.return_value = 1.0  # Ensure no order submission
-    noise_trader.update()
+def test_update_no_submission(noise_trader):
+    # Ensure no order submission
+    with patch.object(noise_trader.draws, "random", return_value=1.0):
+        noise_trader.update()
     noise_trader.market.submit_order.assert_not_called()
 
 
@@ -76,26 +89,25 @@ def test_update_zero_volume(mock_market):
     mock_market.submit_order.assert_not_called()
 
 
-@patch("numpy.random.rand")
-def test_update_custom_volume(mock_rand, mock_market):
-    mock_rand.return_value = 0.5  # Ensure order submission
+def test_update_custom_volume(mock_market):
     trader = NoiseTrader(market=mock_market, volume_size=lambda: 10)
 
-    with patch("random.choice", return_value=-1):
-        trader.update()
+    with patch.object(trader.draws, "random", return_value=0.5):
+        with patch.object(trader.draws, "sign", return_value=-1):
+            trader.update()
 
     mock_market.submit_order.assert_called_once()
     submitted_order = mock_market.submit_order.call_args[0][0]
     assert submitted_order.volume == -10
 
 
-@patch("numpy.random.rand")
-def test_update_multiple_calls(mock_rand, noise_trader):
+def test_update_multiple_calls(noise_trader):
     noise_trader.submission_rate = 0.5
-    mock_rand.side_effect = [0.5, 0.9, 0.3]
-
-    for _ in range(3):
-        noise_trader.update()
+    draws = noise_trader.draws
+    with patch.object(draws, "random", side_effect=[0.5, 0.9, 0.3]):
+        with patch.object(draws, "sign", return_value=1):
+            for _ in range(3):
+                noise_trader.update()
 
     assert noise_trader.market.submit_order.call_count == 1
 
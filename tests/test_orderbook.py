@@ -0,0 +1,460 @@
+import numpy as np
+import pytest
+from pymicrostructure.markets.book import BookSide, PriceLevel
+from pymicrostructure.markets.continuous import ContinuousDoubleAuction
+from pymicrostructure.markets.events import EventType
+from pymicrostructure.markets.tape import TradeTape
+from pymicrostructure.orders.limit import LimitOrder
+from pymicrostructure.orders.market import MarketOrder
+from pymicrostructure.traders.base import Trader
+
+
+@pytest.fixture
+def market():
+    return ContinuousDoubleAuction(initial_fair_price=100)
+
+
+@pytest.fixture
+def traders(market):
+    return Trader(market), Trader(market)
+
+
+def test_price_level_fifo():
+    level = PriceLevel(100)
+    first, second = LimitOrder(0, 5, 100), LimitOrder(1, 3, 100)
+    level.append(first)
+    level.append(second)
+
+    assert level.volume == 8
+    assert level.front() is first
+    assert level.popleft() is first
+    assert level.volume == 3
+    assert len(level) == 1
+
+
+def test_bid_side_orders_levels_best_first():
+    book = BookSide(1)
+    for price in [99, 101, 100, 101]:
+        book.add(LimitOrder(0, 1, price))
+
+    assert book.best_price == 101
+    assert [level.price for level in book.levels()] == [101, 100, 99]
+    assert [order.price for order in book] == [101, 101, 100, 99]
+    assert len(book) == 4
+
+
+def test_ask_side_orders_levels_best_first():
+    book = BookSide(-1)
+    for price in [102, 100, 101]:
+        book.add(LimitOrder(0, -1, price))
+
+    assert book.best_price == 100
+    assert [level.price for level in book.levels()] == [100, 101, 102]
+
+
+def test_pop_front_removes_empty_level():
+    book = BookSide(1)
+    book.add(LimitOrder(0, 1, 101))
+    book.add(LimitOrder(0, 1, 100))
+
+    book.pop_front()
+    assert book.best_price == 100
+    book.pop_front()
+    assert book.best_price is None
+    assert not book
+
+
+def test_remove_order_from_middle_of_level():
+    book = BookSide(-1)
+    orders = [LimitOrder(0, -2, 100) for _ in range(3)]
+    for order in orders:
+        book.add(order)
+
+    book.remove(orders[1])
+    assert list(book) == [orders[0], orders[2]]
+    assert book.best_level.volume == -4
+
+
+def test_invalid_side():
+    with pytest.raises(ValueError):
+        BookSide(0)
+
+
+def test_match_respects_price_time_priority(market, traders):
+    maker, taker = traders
+    early = LimitOrder(maker.trader_id, -5, 101)
+    late = LimitOrder(maker.trader_id, -5, 101)
+    better = LimitOrder(maker.trader_id, -5, 100)
+    market.submit_order(early)
+    market.submit_order(late)
+    market.submit_order(better)
+
+    market.submit_order(LimitOrder(taker.trader_id, 8, 101))
+
+    assert [t["price"] for t in market.trade_history] == [100, 101]
+    assert [t["volume"] for t in market.trade_history] == [5, 3]
+    assert early.status == "partial"
+    assert late.status == "active"
+    assert market.ask_ob == [early, late]
+    assert market.best_ask == 101
+    assert taker.position == 8
+
+
+def test_market_order_remainder_is_cancelled(market, traders):
+    maker, taker = traders
+    market.submit_order(LimitOrder(maker.trader_id, 3, 99))
+    order = MarketOrder(taker.trader_id, -5)
+
+    market.submit_order(order)
+
+    assert order.status == "canceled"
+    assert order in market.cancellations
+    cancel = market.events.filter(code=EventType.CANCEL)
+    assert (cancel["order_id"].tolist(), cancel["volume"].tolist()) == (
+        [order.id],
+        [-2],
+    )
+    assert market.bid_ob == []
+    assert taker.position == -3
+
+
+def test_fills_index_the_trade_tape(market, traders):
+    maker, taker = traders
+    market.submit_order(LimitOrder(maker.trader_id, -5, 100))
+    market.submit_order(LimitOrder(maker.trader_id, -5, 101))
+    market.submit_order(LimitOrder(taker.trader_id, 8, 101))
+
+    assert taker.fills["trade"].tolist() == [0, 1]
+    assert maker.fills["side"].tolist() == [-1, -1]
+    assert maker.filled_trades[-1] == {
+        "price": 101,
+        "volume": -3,
+        "aggressor_side": 1,
+        "time": 3,
+    }
+    assert [t["volume"] for t in taker.filled_trades] == [5, 3]
+    assert taker.filled_trades.to_numpy()["price"].tolist() == [100, 101]
+    assert taker.cash == -803
+    assert maker.cash == 803
+
+
+def test_fills_start_small_and_grow(market, traders):
+    maker, taker = traders
+    assert maker.fills._data.nbytes <= 64 * maker.fills.dtype.itemsize
+    for _ in range(100):
+        market.submit_order(LimitOrder(maker.trader_id, -1, 100))
+        market.submit_order(LimitOrder(taker.trader_id, 1, 100))
+    assert len(taker.fills) == 100
+    assert taker.fills["trade"].tolist() == list(range(100))
+
+
+def test_snapshot_levels_sorted(market, traders):
+    maker, _ = traders
+    market.submit_order(
+        [
+            LimitOrder(maker.trader_id, 1, 98),
+            LimitOrder(maker.trader_id, 2, 99),
+            LimitOrder(maker.trader_id, -4, 102),
+        ]
+    )
+
+    snapshot = market.ob_snapshots[-1]
+    assert snapshot["bid"] == [{"price": 99, "volume": 2}, {"price": 98, "volume": 1}]
+    assert snapshot["ask"] == [{"price": 102, "volume": -4}]
+    assert market.midprice == 100.5
+
+
+def test_cancel_order_by_id_unlinks_order(market, traders):
+    maker, _ = traders
+    keep = LimitOrder(maker.trader_id, 2, 99)
+    cancel = LimitOrder(maker.trader_id, 3, 99)
+    market.submit_order([keep, cancel])
+
+    maker.cancel_order_by_id(cancel.id)
+
+    assert cancel.status == "canceled"
+    assert market.bid_ob == [keep]
+    assert market.bid_book.best_level.volume == 2
+    assert list(maker.active_orders) == [keep.id]
+    assert maker.inactive_orders == [cancel]
+    assert market.cancellations == [cancel]
+
+
+def test_cancel_orders_by_side(market, traders):
+    maker, _ = traders
+    bid = LimitOrder(maker.trader_id, 2, 99)
+    ask = LimitOrder(maker.trader_id, -2, 101)
+    market.submit_order([bid, ask])
+
+    maker.cancel_orders_by_side("sell")
+
+    assert market.ask_ob == []
+    assert market.bid_ob == [bid]
+    with pytest.raises(ValueError):
+        maker.cancel_orders_by_side("up")
+
+
+def test_cancel_all_orders_skips_filled_orders(market, traders):
+    maker, taker = traders
+    filled = LimitOrder(maker.trader_id, -2, 101)
+    resting = LimitOrder(maker.trader_id, -2, 102)
+    market.submit_order([filled, resting])
+    market.submit_order(MarketOrder(taker.trader_id, 2))
+
+    assert filled.status == "filled"
+    assert list(maker.active_orders.values()) == [resting]
+
+    maker.cancel_all_orders()
+
+    assert market.ask_ob == []
+    assert market.cancellations == [resting]
+    assert filled.status == "filled"
+
+
+def test_snapshot_tracks_remaining_volume(market, traders):
+    maker, taker = traders
+    market.submit_order(LimitOrder(maker.trader_id, -5, 101))
+    market.submit_order(MarketOrder(taker.trader_id, 2))
+
+    assert market.ob_snapshots[0]["ask"] == [{"price": 101, "volume": -5}]
+    assert market.ob_snapshots[1]["ask"] == [{"price": 101, "volume": -3}]
+
+
+def test_snapshots_rebuilt_from_keyframes(traders):
+    market = ContinuousDoubleAuction(initial_fair_price=100, keyframe_interval=3)
+    maker = Trader(market)
+    for price in range(90, 100):
+        market.submit_order(LimitOrder(maker.trader_id, 1, price))
+    maker.cancel_order_by_id(next(iter(maker.active_orders)))
+    market.save_ob_state()
+
+    snapshots = list(market.ob_snapshots)
+    assert len(snapshots) == 11
+    assert [level["price"] for level in snapshots[4]["bid"]] == [94, 93, 92, 91, 90]
+    assert [level["price"] for level in snapshots[-1]["bid"]][-1] == 91
+    assert market.ob_snapshots[7] == snapshots[7]
+    assert market.ob_snapshots[-1] == snapshots[-1]
+    assert market.ob_snapshots[1::4] == snapshots[1::4]
+    with pytest.raises(IndexError):
+        market.ob_snapshots[11]
+
+
+def test_top_of_book_history(market, traders):
+    maker, _ = traders
+    market.submit_order(LimitOrder(maker.trader_id, 2, 99))
+    market.submit_order(
+        [LimitOrder(maker.trader_id, 1, 98), LimitOrder(maker.trader_id, -4, 102)]
+    )
+
+    history = market.top_of_book
+    assert history.column("time").tolist() == [1, 2]
+    assert np.isnan(history.column("spread")[0])
+    assert history.column("spread")[1] == 3
+    assert history.column("midprice")[1] == 100.5
+    assert history.column("bid_depth").tolist() == [2, 3]
+    assert history.column("ask_depth").tolist() == [0, -4]
+    assert history.column("bid_prices")[1][:2].tolist() == [99, 98]
+    assert np.isnan(history.column("ask_prices")[1][1])
+    assert market.midprices["mark_price"].tolist() == [0, 100.5]
+
+
+def test_trade_tape_columns(market, traders):
+    maker, taker = traders
+    ask = LimitOrder(maker.trader_id, -5, 101)
+    market.submit_order(ask)
+    bid = LimitOrder(taker.trader_id, 3, 102)
+    market.submit_order(bid)
+
+    row = market.trades[0]
+    assert row["price"] == 101 and row["volume"] == 3
+    assert row["aggressor_side"] == 1
+    assert (row["buyer_id"], row["seller_id"]) == (taker.trader_id, maker.trader_id)
+    assert (row["buy_order_id"], row["sell_order_id"]) == (bid.id, ask.id)
+    assert market.get_recent_trades(5)["time"].tolist() == [2]
+    assert np.shares_memory(market.get_recent_trades(1), market.trades.view())
+    assert market.trade_history == [
+        {"price": 101, "volume": 3, "aggressor_side": 1, "time": 2}
+    ]
+    assert market.trade_history[-1]["price"] == 101
+    assert list(market.trades.to_pandas().columns)[:4] == [
+        "time",
+        "price",
+        "volume",
+        "aggressor_side",
+    ]
+
+
+def test_order_flow_windows(market, traders):
+    maker, taker = traders
+    market.submit_order(LimitOrder(maker.trader_id, -30, 101))
+    for volume in [10, 5, 7]:
+        market.submit_order(MarketOrder(taker.trader_id, volume))
+    market.submit_order(LimitOrder(maker.trader_id, 4, 99))
+    market.submit_order(MarketOrder(taker.trader_id, -4))
+
+    assert market.order_flow(1) == (-4, 4)
+    assert market.order_flow(3) == (8, 16)
+    assert market.order_flow(100) == (18, 26)
+    assert market.order_flow(0) == (0, 0)
+
+
+def test_order_flow_reads_each_spilled_chunk_once(tmp_path, monkeypatch):
+    tape = TradeTape(chunk_size=8, memory_rows=8, spill_dir=str(tmp_path))
+    rng = np.random.default_rng(0)
+    volumes = rng.integers(1, 5, 100)
+    sides = rng.choice([-1, 1], 100)
+    for i, (volume, side) in enumerate(zip(volumes, sides)):
+        tape.record(i, 100, int(volume), int(side), 0, 1)
+    assert tape.spilled_rows >= 88
+
+    loads = []
+    load = tape._load
+    monkeypatch.setattr(tape, "_load", lambda chunk: loads.append(chunk) or load(chunk))
+    for _ in range(3):
+        for window in range(1, 100):
+            assert tape.order_flow(window) == (
+                float((volumes * sides)[-window:].sum()),
+                float(volumes[-window:].sum()),
+            )
+    # A fixed window reads its chunk once, however often it is queried.
+    loads.clear()
+    for _ in range(10):
+        tape.order_flow(60)
+    assert len(loads) <= 1
+    assert len(tape._flow_cache) <= TradeTape.FLOW_CACHE_CHUNKS
+
+
+def test_add_many_merges_new_levels():
+    book = BookSide(-1)
+    book.add(LimitOrder(0, -1, 103))
+    orders = [LimitOrder(0, -1, price) for price in [101, 105, 101, 102]]
+    book.add_many(orders)
+
+    assert [level.price for level in book.levels()] == [101, 102, 103, 105]
+    assert list(book.level(101)) == [orders[0], orders[2]]
+    assert book.volume == -5
+
+
+def test_batch_keeps_priority_within_batch(market, traders):
+    maker, taker = traders
+    first = LimitOrder(maker.trader_id, -2, 101)
+    second = LimitOrder(taker.trader_id, -2, 101)
+    buy = LimitOrder(taker.trader_id, 3, 102)
+    market.submit_orders([first, second, buy])
+
+    assert len(market.top_of_book) == 1
+    assert market.trades.column("price").tolist() == [101, 101]
+    assert market.trades.column("aggressor_side").tolist() == [1, 1]
+    assert market.trades.column("sell_order_id").tolist() == [first.id, second.id]
+    assert market.ask_ob == [second]
+
+
+def test_batch_rejection_does_not_drop_rest_of_batch(market, traders):
+    maker, _ = traders
+    market_order = MarketOrder(maker.trader_id, 1)
+    limit = LimitOrder(maker.trader_id, 1, 99)
+    market.submit_orders([market_order, limit])
+
+    assert market_order.status == "rejected"
+    assert market.bid_ob == [limit]
+
+
+def test_market_order_in_batch_does_not_fill_against_later_orders(market, traders):
+    maker, taker = traders
+    market.submit_order(LimitOrder(maker.trader_id, -1, 100))
+    buy = MarketOrder(taker.trader_id, 2)
+    later = LimitOrder(maker.trader_id, -5, 99)
+    market.submit_orders([buy, later])
+
+    assert market.trades.column("price").tolist() == [100]
+    assert buy.status == "canceled" and buy.filled == 1
+    assert market.ask_ob == [later]
+
+
+def test_market_order_in_batch_is_rejected_when_it_executes(market, traders):
+    maker, taker = traders
+    market.submit_order(LimitOrder(maker.trader_id, -1, 100))
+    first, second = MarketOrder(taker.trader_id, 1), MarketOrder(taker.trader_id, 2)
+    market.submit_orders([first, second])
+
+    assert first.status == "filled"
+    assert second.status == "rejected"
+    reject = market.events.filter(code=EventType.REJECT)
+    assert reject["order_id"].tolist() == [second.id]
+    assert len(market.events.filter(code=EventType.CANCEL)) == 0
+
+
+def test_batch_matches_like_sequential_submissions():
+    rng = np.random.default_rng(7)
+    batched = ContinuousDoubleAuction(initial_fair_price=100)
+    sequential = ContinuousDoubleAuction(initial_fair_price=100)
+    for market in (batched, sequential):
+        Trader(market), Trader(market)
+
+    def random_orders():
+        orders = []
+        for _ in range(12):
+            trader_id = int(rng.integers(2))
+            volume = int(rng.integers(1, 4)) * (1 if rng.random() < 0.5 else -1)
+            if rng.random() < 0.2:
+                orders.append(MarketOrder(trader_id, volume))
+            else:
+                orders.append(LimitOrder(trader_id, volume, int(rng.integers(97, 104))))
+        return orders
+
+    for _ in range(20):
+        orders = random_orders()
+        copies = [
+            (
+                MarketOrder(o.trader_id, o.volume)
+                if isinstance(o, MarketOrder)
+                else LimitOrder(o.trader_id, o.volume, o.price)
+            )
+            for o in orders
+        ]
+        batched.submit_orders(orders)
+        for order in copies:
+            sequential.submit_orders([order])
+        assert [o.status for o in orders] == [o.status for o in copies]
+
+    fields = ["price", "volume", "aggressor_side", "buy_order_id", "sell_order_id"]
+    assert len(batched.trades) > 0
+    assert (
+        batched.trades.to_numpy()[fields] == sequential.trades.to_numpy()[fields]
+    ).all()
+    assert [o.id for o in batched.bid_ob] == [o.id for o in sequential.bid_ob]
+    assert [o.id for o in batched.ask_ob] == [o.id for o in sequential.ask_ob]
+
+
+def test_submit_order_arrays(market, traders):
+    maker, taker = traders
+    orders = market.submit_order_arrays(
+        [maker.trader_id, maker.trader_id, taker.trader_id],
+        np.array([-3, 2, 1]),
+        np.array([101.0, 99.0, np.nan]),
+    )
+
+    assert [type(order) for order in orders] == [LimitOrder, LimitOrder, MarketOrder]
+    assert market.trades.column("price").tolist() == [101]
+    assert market.best_bid == 99
+    assert taker.position == 1
+
+
+def test_market_order_sweeps_levels_without_resting(market, traders):
+    maker, taker = traders
+    market.submit_order(
+        [LimitOrder(maker.trader_id, -2, 101), LimitOrder(maker.trader_id, -3, 102)]
+    )
+    market.bid_book.changed_prices.clear()
+    order = MarketOrder(taker.trader_id, 4)
+
+    market.submit_order(order)
+
+    assert market.trades.column("price").tolist() == [101, 102]
+    assert market.trades.column("buy_order_id").tolist() == [order.id, order.id]
+    assert order.status == "filled"
+    assert order.id not in market._order_index
+    assert market.ask_book.best_level.volume == -1
+    assert not market.bid_book.changed_prices
+    assert taker.inactive_orders == [order]
+    assert order.id not in taker.active_orders
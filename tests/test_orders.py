@@ -0,0 +1,46 @@
+import pytest
+from pymicrostructure.markets.continuous import ContinuousDoubleAuction
+from pymicrostructure.orders.base import OrderStatus
+from pymicrostructure.orders.limit import LimitOrder
+from pymicrostructure.orders.market import MarketOrder
+from pymicrostructure.traders.base import Trader
+
+
+def test_orders_are_slotted():
+    order = LimitOrder(0, -3, 101)
+    assert not hasattr(order, "__dict__")
+    with pytest.raises(AttributeError):
+        order.note = "x"
+    assert order.side == -1
+    assert order.status == OrderStatus.CREATED
+
+
+def test_status_compares_with_names():
+    assert OrderStatus.FILLED == "filled"
+    assert OrderStatus.PARTIAL != "filled"
+    assert OrderStatus.CANCELED == 4
+    assert str(OrderStatus.REJECTED) == "rejected"
+
+
+def test_limit_price_is_integer_ticks():
+    assert type(LimitOrder(0, 1, 100.0).price) is int
+    with pytest.raises(ValueError):
+        LimitOrder(0, 1, 100.5)
+    assert MarketOrder(0, 1).price is None
+
+
+def test_order_ids_are_allocated_per_market():
+    first, second = ContinuousDoubleAuction(), ContinuousDoubleAuction()
+    orders = []
+    for market in (first, second):
+        trader = Trader(market)
+        batch = [
+            LimitOrder(trader.trader_id, 1, 99),
+            LimitOrder(trader.trader_id, 1, 98),
+        ]
+        market.submit_order(batch)
+        orders.append(batch)
+
+    assert [o.id for o in orders[0]] == [0, 1]
+    assert [o.id for o in orders[1]] == [0, 1]
+    assert LimitOrder(0, 1, 99).id is None
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+from pymicrostructure.markets.hub import MarketHub
+from pymicrostructure.orders.limit import LimitOrder
+from pymicrostructure.orders.market import MarketOrder
+from pymicrostructure.simulation.parallel import PartitionedHub, partition
+from pymicrostructure.traders.base import Trader
+
+INSTRUMENTS = ["A", "B", "C", "D"]
+
+
+class Quoter(Trader):
+    def update(self):
+        self.cancel_all_orders()
+        for instrument in self.market.instruments:
+            self.market.submit_order(
+                instrument,
+                [
+                    LimitOrder(self.trader_id, 10, 99),
+                    LimitOrder(self.trader_id, -10, 101),
+                ],
+            )
+
+
+class Taker(Trader):
+    def update(self):
+        self.seen = dict(self.market.reference_prices)
+        instruments = self.market.instruments
+        instrument = instruments[self.rng.integers(len(instruments))]
+        side = 1 if self.rng.random() < 0.5 else -1
+        self.market.submit_order(instrument, MarketOrder(self.trader_id, side))
+
+
+def build_hub(instruments, seed):
+    hub = MarketHub(instruments, seed=seed, recording="none")
+    Quoter(hub)
+    for _ in range(3):
+        Taker(hub)
+    return hub
+
+
+REDUCTIONS = {
+    "trades": lambda hub: sum(len(book.trades) for book in hub.books.values()),
+    "positions": lambda hub: hub.position_matrix(),
+    "seen": lambda hub: hub.participants[1].seen,
+}
+
+
+def test_partition():
+    assert partition(INSTRUMENTS, 2) == [["A", "B"], ["C", "D"]]
+    assert partition(INSTRUMENTS, 3) == [["A"], ["B", "C"], ["D"]]
+
+
+def test_partitions_run_in_parallel_and_exchange_prices():
+    runner = PartitionedHub(
+        build_hub,
+        INSTRUMENTS,
+        REDUCTIONS,
+        workers=2,
+        sync_every=5,
+        collect_positions=True,
+    )
+    results = runner.run(40, seed=1, progress=False)
+
+    assert [result["instruments"] for result in results] == [["A", "B"], ["C", "D"]]
+    assert all(result["trades"] > 0 for result in results)
+    for result in results:
+        assert (result["positions"].sum() == 0).all()
+        # Traders see the prices of the other partition at the barriers.
+        assert set(result["seen"]) == set(INSTRUMENTS)
+    assert runner.reference_prices.notna().all()
+    assert [list(positions.columns) for positions in runner.positions] == [
+        ["A", "B"],
+        ["C", "D"],
+    ]
+
+
+def test_runs_are_reproducible():
+    runner = PartitionedHub(build_hub, INSTRUMENTS, REDUCTIONS, workers=2)
+    first = runner.run(20, seed=3, progress=False)
+    second = runner.run(20, seed=3, progress=False)
+    assert [r["trades"] for r in first] == [r["trades"] for r in second]
+
+
+def test_worker_errors_are_raised():
+    def broken(instruments, seed):
+        raise KeyError("boom")
+
+    runner = PartitionedHub(broken, INSTRUMENTS, workers=2)
+    with pytest.raises(RuntimeError, match="boom"):
+        runner.run(5, progress=False)
@@ -0,0 +1,57 @@
+import time
+from pymicrostructure.markets.continuous import ContinuousDoubleAuction
+from pymicrostructure.markets.profiling import PHASES, PhaseTimer, StackSampler
+from pymicrostructure.traders.market_maker import DummyMarketMaker
+from pymicrostructure.traders.noise import NoiseTrader
+
+
+def build_market(seed=1):
+    market = ContinuousDoubleAuction(seed=seed)
+    DummyMarketMaker(market)
+    for _ in range(5):
+        NoiseTrader(market)
+    return market
+
+
+def test_phase_timer_charges_every_phase():
+    market = build_market()
+    timer = PhaseTimer().attach(market)
+    start = time.perf_counter_ns()
+    market.run(100, progress=False)
+    elapsed = time.perf_counter_ns() - start
+
+    report = timer.report()
+    assert list(report.index) == list(PHASES)
+    assert (report["calls"] > 0).all()
+    assert report.loc["update", "calls"] == 600
+    # Exclusive times never exceed the run.
+    assert 0 < timer.total_ns <= elapsed
+    assert abs(report["share"].sum() - 1) < 1e-9
+
+
+def test_detached_timer_leaves_plain_methods_and_same_results():
+    timed = build_market()
+    timer = PhaseTimer().attach(timed)
+    timer.detach()
+    assert "submit_orders" not in vars(timed)
+    assert "record" not in vars(timed.events)
+    assert all("update" not in vars(p) for p in timed.participants)
+
+    plain = build_market()
+    timed.run(50, progress=False)
+    plain.run(50, progress=False)
+    assert (timed.trades.to_numpy() == plain.trades.to_numpy()).all()
+    assert timer.total_ns == 0
+
+
+def test_stack_sampler_writes_collapsed_stacks(tmp_path):
+    market = build_market()
+    with StackSampler(interval=0.001) as sampler:
+        market.run(300, progress=False)
+    assert sampler.samples > 0
+    path = tmp_path / "run.collapsed"
+    sampler.write(str(path))
+    lines = path.read_text().splitlines()
+    assert len(lines) == len(sampler.stacks)
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == sampler.samples
+    assert any("ContinuousDoubleAuction.run" in line for line in lines)
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+from pymicrostructure.markets.continuous import ContinuousDoubleAuction
+from pymicrostructure.markets.events import EventType
+from pymicrostructure.markets.export import StreamingExporter, read_export
+from pymicrostructure.markets.replay import Replay
+from pymicrostructure.orders.limit import LimitOrder
+from pymicrostructure.orders.market import MarketOrder
+from pymicrostructure.traders.base import Trader
+from pymicrostructure.traders.market_maker import DummyMarketMaker
+from pymicrostructure.traders.noise import NoiseTrader
+
+
+@pytest.fixture
+def recorded_market():
+    market = ContinuousDoubleAuction(initial_fair_price=1000, seed=6)
+    DummyMarketMaker(market)
+    for _ in range(3):
+        NoiseTrader(market, submission_rate=0.5)
+    market.run(300, progress=False)
+    return market
+
+
+def test_replay_rederives_trades_and_positions(recorded_market):
+    market = Replay(recorded_market.events, initial_fair_price=1000).run()
+    np.testing.assert_array_equal(
+        market.trades.to_numpy(), recorded_market.trades.to_numpy()
+    )
+    for original, replayed in zip(recorded_market.participants, market.participants):
+        assert replayed.trader_id == original.trader_id
+        assert replayed.position == original.position
+        assert replayed.cash == original.cash
+    assert market.ob_snapshots[-1] == recorded_market.ob_snapshots[-1]
+
+
+def test_replay_can_stop_at_any_time(recorded_market):
+    replay = Replay(recorded_market.msg_history, initial_fair_price=1000)
+    time = 200
+    market = replay.replay_until(time)
+    assert replay.time == time
+    assert not replay.done
+    expected = next(s for s in recorded_market.ob_snapshots if s["time"] == time)
+    assert market.ob_snapshots[-1] == expected
+    assert len(market.trades) == np.sum(recorded_market.trades.column("time") <= time)
+    replay.run()
+    assert replay.done
+    assert len(replay.market.trades) == len(recorded_market.trades)
+
+
+def test_replay_with_another_recording_policy(recorded_market):
+    market = Replay(
+        recorded_market.events,
+        initial_fair_price=1000,
+        recording="every_k",
+        record_every=10,
+    ).run()
+    assert len(market.ob_snapshots) < len(recorded_market.ob_snapshots)
+    assert all(snapshot["time"] % 10 == 0 for snapshot in market.ob_snapshots)
+
+
+def test_replay_from_exported_events(tmp_path):
+    market = ContinuousDoubleAuction(initial_fair_price=1000, seed=6)
+    DummyMarketMaker(market)
+    NoiseTrader(market, submission_rate=0.5)
+    path = str(tmp_path / "export")
+    StreamingExporter(path, streams=["events"], format="npy").attach(market)
+    market.run(100, progress=False)
+    replayed = Replay(read_export(path, "events"), initial_fair_price=1000).run()
+    assert len(replayed.trades) == len(market.trades)
+
+
+def test_replay_detects_mismatched_trades(recorded_market):
+    events = recorded_market.events.to_numpy().copy()
+    trades = np.flatnonzero(events["code"] == EventType.TRADE)
+    events["price"][trades[5]] += 1
+    with pytest.raises(ValueError):
+        Replay(events, initial_fair_price=1000).run()
+    Replay(events, initial_fair_price=1000, verify=False).run()
+
+
+def test_replay_rederives_closed_market_orders():
+    market = ContinuousDoubleAuction(initial_fair_price=100)
+    maker, taker = Trader(market), Trader(market)
+    market.submit_order(LimitOrder(maker.trader_id, -1, 100))
+    market.submit_orders(
+        [
+            MarketOrder(taker.trader_id, 2),
+            MarketOrder(taker.trader_id, 1),
+            LimitOrder(maker.trader_id, -3, 101),
+        ]
+    )
+    market.cancel_order(maker.active_orders[market._next_order_id - 1])
+    codes = [EventType(code).name for code in market.events.column("code")]
+    assert codes[-3:] == ["CANCEL", "REJECT", "CANCEL"]
+
+    replayed = Replay(market.events, initial_fair_price=100).run()
+    np.testing.assert_array_equal(replayed.trades.to_numpy(), market.trades.to_numpy())
+    assert len(replayed.events) == len(market.events)
+    assert not replayed.ask_ob
@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+from pymicrostructure.markets.continuous import ContinuousDoubleAuction
+from pymicrostructure.markets.scheduler import (
+    BernoulliArrivals,
+    EveryTick,
+    OnEvent,
+    Periodic,
+    PoissonArrivals,
+    Scheduler,
+)
+from pymicrostructure.orders.limit import LimitOrder
+from pymicrostructure.traders.base import Trader
+from pymicrostructure.traders.noise import NoiseTrader
+
+
+class CountingTrader(Trader):
+    def __init__(self, market, arrival=None):
+        super().__init__(market)
+        if arrival is not None:
+            self.arrival = arrival
+        self.wakes = []
+
+    def update(self):
+        self.wakes.append(self.market.current_tick)
+
+
+def run_ticks(scheduler, ticks):
+    return [list(scheduler.advance()) for _ in range(ticks)]
+
+
+def test_every_tick_agents_are_shuffled_each_tick():
+    scheduler = Scheduler()
+    for agent in range(5):
+        scheduler.add(agent, EveryTick())
+    scheduler.add(0, EveryTick())
+
+    ticks = run_ticks(scheduler, 50)
+
+    assert len(scheduler) == 5
+    assert all(sorted(due) == list(range(5)) for due in ticks)
+    assert len({tuple(due) for due in ticks}) > 1
+
+
+def test_periodic_and_mixed_agents():
+    scheduler = Scheduler()
+    scheduler.add("slow", Periodic(3, offset=1))
+    scheduler.add("fast", EveryTick())
+
+    ticks = run_ticks(scheduler, 8)
+
+    assert [t for t, due in enumerate(ticks) if "slow" in due] == [1, 4, 7]
+    assert all("fast" in due for due in ticks)
+
+
+def test_bernoulli_arrivals_only_wake_acting_agents():
+    scheduler = Scheduler(np.random.default_rng(0))
+    scheduler.add("rare", BernoulliArrivals(0.01))
+    scheduler.add("never", BernoulliArrivals(0))
+
+    wakes = sum(len(due) for due in run_ticks(scheduler, 20000))
+
+    assert 150 < wakes < 250
+
+
+def test_poisson_arrivals_can_fire_several_times_per_tick():
+    scheduler = Scheduler(np.random.default_rng(0))
+    scheduler.add("busy", PoissonArrivals(3.0))
+
+    ticks = run_ticks(scheduler, 2000)
+
+    assert 5700 < sum(len(due) for due in ticks) < 6300
+    assert max(len(due) for due in ticks) > 1
+
+
+def test_on_event_rejects_unknown_events():
+    with pytest.raises(ValueError):
+        OnEvent("news")
+
+
+def test_market_wakes_listeners_after_a_trade():
+    market = ContinuousDoubleAuction(initial_fair_price=100)
+    maker = Trader(market)
+    listener = CountingTrader(market, OnEvent("trade"))
+    market.submit_order(LimitOrder(maker.trader_id, -5, 100))
+    maker.update = lambda: (
+        market.submit_order(LimitOrder(maker.trader_id, 1, 100))
+        if market.current_tick == 2
+        else None
+    )
+
+    market.run(5)
+
+    assert listener.wakes == [3]
+
+
+def test_event_driven_noise_trader_is_woken_only_to_trade():
+    market = ContinuousDoubleAuction(initial_fair_price=100, seed=1)
+    market.submit_order(LimitOrder(CountingTrader(market).trader_id, -1000, 101))
+    noise = NoiseTrader(market, submission_rate=0.01, event_driven=True)
+    calls = []
+    update = noise.update
+    noise.update = lambda: (calls.append(1), update())
+
+    market.run(3000)
+
+    assert len(calls) == len(noise.inactive_orders)
+    assert 10 < len(calls) < 60
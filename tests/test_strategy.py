@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import Mock
 import numpy as np
+from pymicrostructure.markets.news import NewsHistory
 from pymicrostructure.traders.base import Trader
 
 # Import the strategies you want to test
@@ -36,20 +37,12 @@ class TestFairPriceStrategies:
 
     def test_order_flow_sign_fair_price(self, mock_trader):
         strategy = OrderFlowSignFairPrice(window=3, aggressiveness=2)
-        mock_trader.market.get_recent_trades.return_value = [
-            {"volume": 10, "aggressor_side": 1},
-            {"volume": 5, "aggressor_side": -1},
-            {"volume": 7, "aggressor_side": 1},
-        ]
+        mock_trader.market.order_flow.return_value = (12, 22)
         assert strategy(mock_trader) == 102
 
     def test_order_flow_magnitude_fair_price(self, mock_trader):
         strategy = OrderFlowMagnitudeFairPrice(window=3, aggressiveness=2)
-        mock_trader.market.get_recent_trades.return_value = [
-            {"volume": 10, "aggressor_side": 1},
-            {"volume": 5, "aggressor_side": -1},
-            {"volume": 7, "aggressor_side": 1},
-        ]
+        mock_trader.market.order_flow.return_value = (12, 22)
         assert strategy(mock_trader) == 103
 
     def test_news_impact_fair_price(self, mock_trader):
@@ -59,7 +52,7 @@ class TestFairPriceStrategies:
 
     def test_news_impact_exponential_fair_price(self, mock_trader):
         strategy = NewsImpactExponentialFairPrice(window=3, agressiveness=1)
-        mock_trader.market.news_history = [0.1, 0.2, 0.3]
+        mock_trader.market.news_history = NewsHistory([-1, 1, 0, 1])
         mock_trader.market.current_tick = 3
         assert strategy(mock_trader) == 101
 
@@ -98,18 +91,14 @@ class TestSpreadStrategies:
         strategy = OrderFlowImbalanceSpread(
             window=3, aggressiveness=2, min_halfspread=1
         )
-        mock_trader.market.get_recent_trades.return_value = [
-            {"volume": 10, "aggressor_side": 1},
-            {"volume": 5, "aggressor_side": -1},
-            {"volume": 7, "aggressor_side": 1},
-        ]
+        mock_trader.market.order_flow.return_value = (12, 22)
         assert strategy(mock_trader) == (-1, 1)
 
 
 # Additional test cases
 def test_order_flow_sign_fair_price_no_trades(mock_trader):
     strategy = OrderFlowSignFairPrice(window=3, aggressiveness=2)
-    mock_trader.market.get_recent_trades.return_value = []
+    mock_trader.market.order_flow.return_value = (0, 0)
     assert strategy(mock_trader) == 100  # No change in fair price
 
 